@@ -3,19 +3,24 @@ import pandas as pd
 from datetime import datetime, date
 import io
 import json
-import tempfile
 import os
+import time
 
 # Import các modules
 from database import ProjectDatabase
+from query_cache import CachedProjectDatabase
+from email_outbox import start_email_outbox
+from data_import import IMPORT_TARGETS, import_file, map_columns, read_chunks
+from portfolio_export import EXPORT_FORMATS, PortfolioExporter
 from dmaic_tools import DMAICTools  # ← THÊM MỚI
 from collaboration import render_collaboration_tab, initialize_collaboration  # ← COLLABORATION
 from gantt_chart import (
     create_gantt_chart, create_dmaic_gantt, 
     get_project_progress, get_phase_summary, 
-    check_overdue_tasks
+    check_overdue_tasks, gantt_page_count, GANTT_PAGE_SIZE
 )
-from export_pdf import create_project_pdf
+from report_service import ReportService
+from search_index import SEARCH_ENTITY_LABELS
 from dashboard import (
     create_status_chart, create_category_chart, 
     create_department_chart, create_budget_chart,
@@ -54,12 +59,41 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Khởi tạo database
+# Khởi tạo database (dùng chung cho mọi session, không tạo lại mỗi lần rerun)
+# Các truy vấn get_* được cache, tự làm mới khi có thao tác ghi tương ứng
+@st.cache_resource
 def init_db():
-    return ProjectDatabase()
+    return CachedProjectDatabase(ProjectDatabase())
 
 db = init_db()
 
+@st.cache_resource
+def init_email_outbox():
+    """Worker gửi email nền: một pool cho cả process, trang không phải chờ mail server"""
+    return start_email_outbox(ProjectDatabase())
+
+email_outbox = init_email_outbox()
+
+@st.cache_resource
+def init_portfolio_exporter():
+    """Export toàn bộ dữ liệu chạy nền; file đã tạo được dùng lại tới khi dữ liệu thay đổi"""
+    return PortfolioExporter(ProjectDatabase())
+
+portfolio_exporter = init_portfolio_exporter()
+
+@st.cache_resource
+def init_report_service():
+    """Hàng đợi tạo PDF: font đăng ký một lần, PDF của dự án không đổi được lấy từ cache"""
+    return ReportService(ProjectDatabase()).start()
+
+report_service = init_report_service()
+
+# Cột ngày trong các bảng hiển thị (dữ liệu là datetime64, chỉ hiện ngày)
+DATE_DISPLAY_COLUMNS = {
+    'Ngày bắt đầu': st.column_config.DateColumn(format="DD/MM/YYYY"),
+    'Ngày kết thúc': st.column_config.DateColumn(format="DD/MM/YYYY"),
+}
+
 # Danh mục dự án Lean
 LEAN_CATEGORIES = [
     "(1) An toàn người bệnh",
@@ -94,6 +128,7 @@ def render_sidebar():
                 "🏠 Trang chủ",
                 "➕ Thêm dự án mới",
                 "📝 Quản lý dự án",
+                "🔎 Tìm kiếm",
                 "📊 Dashboard & Thống kê",
                 "🏢 Quản lý Phòng/Ban",
                 "📤 Import/Export",
@@ -111,7 +146,7 @@ def render_home():
     st.markdown('<h1 class="main-header">🏥 HỆ THỐNG QUẢN LÝ DỰ ÁN LEAN SIX SIGMA</h1>', unsafe_allow_html=True)
     
     # Thống kê tổng quan
-    stats = db.get_statistics()
+    stats = db.get_rollup_statistics()
     metrics = create_metrics_cards(stats)
     
     col1, col2, col3, col4 = st.columns(4)
@@ -145,18 +180,19 @@ def render_home():
     # Danh sách dự án gần đây
     st.subheader("📋 Dự án gần đây")
     
-    projects = db.get_all_projects()
+    # Chỉ lấy 10 dự án mới nhất và các cột cần hiển thị
+    recent_projects, _ = db.list_projects(
+        columns=['project_code', 'project_name', 'methodology', 'department',
+                 'category', 'status', 'start_date', 'end_date'],
+        limit=10
+    )
     
-    if not projects.empty:
-        # Hiển thị top 10 dự án mới nhất
-        recent_projects = projects.head(10)
-        
-        display_df = recent_projects[['project_code', 'project_name', 'methodology', 'department', 
-                                       'category', 'status', 'start_date', 'end_date']]
+    if not recent_projects.empty:
+        display_df = recent_projects
         display_df.columns = ['Mã dự án', 'Tên dự án', 'Phương pháp', 'Phòng/Ban', 
                               'Danh mục', 'Trạng thái', 'Ngày bắt đầu', 'Ngày kết thúc']
         
-        st.dataframe(display_df, use_container_width=True)
+        st.dataframe(display_df, use_container_width=True, column_config=DATE_DISPLAY_COLUMNS)
     else:
         st.info("Chưa có dự án nào. Hãy thêm dự án mới!")
 
@@ -235,79 +271,134 @@ def render_add_project():
 def render_manage_projects():
     st.header("📝 Quản lý Dự án")
     
-    projects = db.get_all_projects()
-    
-    if projects.empty:
-        st.warning("Chưa có dự án nào. Hãy thêm dự án mới!")
-        return
-    
     # Chọn dự án
-    project_options = {f"{row['project_code']} - {row['project_name']}": row['id'] 
-                       for _, row in projects.iterrows()}
+    project_id = render_project_picker()
+    
+    if project_id is not None:
+        # Chỉ panel đang chọn được render (st.tabs chạy tất cả tab mỗi lần rerun)
+        panel = st.radio(
+            "Mục",
+            list(PROJECT_PANELS.keys()),
+            horizontal=True,
+            key="project_panel",
+            label_visibility="collapsed"
+        )
+        
+        render_project_panel(project_id, panel)
+
+PROJECT_PAGE_SIZE = 50
+
+def render_project_picker():
+    """
+    Ô tìm kiếm + danh sách dự án phân trang (không tải toàn bộ bảng projects)
+    Trả về project_id đang chọn hoặc None
+    """
+    search = st.text_input("🔍 Tìm dự án (mã hoặc tên)", key="project_search")
+    
+    # Đổi từ khóa -> quay về trang đầu; cursors là chồng cursor của các trang đã xem
+    if st.session_state.get('project_picker_search') != search:
+        st.session_state['project_picker_search'] = search
+        st.session_state['project_picker_cursors'] = [None]
+    cursors = st.session_state.setdefault('project_picker_cursors', [None])
+    
+    filters = {'search': search}
+    page, next_cursor = db.list_projects(
+        filters,
+        columns=['id', 'project_code', 'project_name'],
+        limit=PROJECT_PAGE_SIZE,
+        cursor=cursors[-1]
+    )
     
-    selected_project_name = st.selectbox(
+    if page.empty:
+        if search:
+            st.info("Không tìm thấy dự án phù hợp.")
+        else:
+            st.warning("Chưa có dự án nào. Hãy thêm dự án mới!")
+        return None
+    
+    project_options = dict(zip(page['id'], page['project_code'] + " - " + page['project_name']))
+    project_id = st.selectbox(
         "Chọn dự án để quản lý:",
-        options=list(project_options.keys())
+        options=list(project_options.keys()),
+        format_func=project_options.get
     )
     
-    if selected_project_name:
-        project_id = project_options[selected_project_name]
-        project = db.get_project(project_id)
-        
-        if project:
-            # ← TABS MỚI: Thêm DMAIC Tracking
-            tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
-                "📄 Thông tin", 
-                "👥 Thành viên", 
-                "🤝 Stakeholders",
-                "📅 Kế hoạch (Gantt)",
-                "🔄 DMAIC Tracking",  # Tab 5 - DMAIC
-                "💬 Cộng tác",  # Tab 6 - COLLABORATION (NEW!)
-                "✍️ Ký tên",  # Tab 7 (was tab6)
-                "📤 Xuất báo cáo"  # Tab 8 (was tab7)
-            ])
-            
-            # Tab 1: Thông tin dự án
-            with tab1:
-                render_project_info(project_id, project)
-            
-            # Tab 2: Thành viên
-            with tab2:
-                render_team_members(project_id)
-            
-            # Tab 3: Stakeholders
-            with tab3:
-                render_stakeholders(project_id)
-            
-            # Tab 4: Kế hoạch Gantt
-            with tab4:
-                render_gantt_plan(project_id)
-            
-            # Tab 5: DMAIC TRACKING
-            with tab5:
-                render_dmaic_tracking(project_id, project)
-            
-            # Tab 6: CỘNG TÁC (NEW!)
-            with tab6:
-                current_user = st.session_state.get('user_name', 'Current User')
-                render_collaboration_tab(
-                    project_id=project_id,
-                    project=project,
-                    database=db,
-                    current_user=current_user
-                )
-            
-            # Tab 7: Ký tên (was tab6)
-            with tab7:
-                render_signoffs(project_id)
-            
-            # Tab 8: Xuất báo cáo (was tab7)
-            with tab8:
-                render_export_report(project_id, project)
+    col1, col2, col3 = st.columns([1, 3, 1])
+    with col1:
+        if st.button("◀ Trang trước", disabled=len(cursors) == 1, key="project_page_prev"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Trang {len(cursors)} · {db.count_projects(filters)} dự án")
+    with col3:
+        if st.button("Trang sau ▶", disabled=next_cursor is None, key="project_page_next"):
+            cursors.append(next_cursor)
+            st.rerun()
+    
+    return project_id
+
+def render_collaboration_panel(project_id, bundle):
+    current_user = st.session_state.get('user_name', 'Current User')
+    render_collaboration_tab(
+        project_id=project_id,
+        project=bundle.project,
+        database=db,
+        current_user=current_user,
+        bundle=bundle
+    )
 
+# Panel -> (bundle sections cần tải, hàm render)
+PROJECT_PANELS = {
+    "📄 Thông tin": ((), lambda pid, b: render_project_info(pid, b.project)),
+    "👥 Thành viên": (('team_members',), lambda pid, b: render_team_members(pid, b.team_members)),
+    "🤝 Stakeholders": (('stakeholders',), lambda pid, b: render_stakeholders(pid, b.stakeholders)),
+    "📅 Kế hoạch (Gantt)": (('tasks',), lambda pid, b: render_gantt_plan(pid, b)),
+    "🔄 DMAIC Tracking": (('dmaic',), lambda pid, b: render_dmaic_tracking(pid, b)),
+    "💬 Cộng tác": (('comments', 'activities', 'meetings', 'action_items', 'team_members'),
+                   render_collaboration_panel),
+    "✍️ Ký tên": (('signoffs',), lambda pid, b: render_signoffs(pid, b.signoffs)),
+    "📁 Tài liệu": ((), lambda pid, b: render_documents(pid)),
+    "📤 Xuất báo cáo": (('team_members', 'stakeholders', 'tasks', 'signoffs'),
+                       lambda pid, b: render_export_report(pid, b)),
+}
+
+def debug_enabled():
+    """Bật thông tin debug (thời gian render panel): secrets `debug = true` hoặc LSS_DEBUG=1"""
+    value = os.environ.get('LSS_DEBUG')
+    if not value:
+        try:
+            value = st.secrets.get('debug', False)
+        except Exception:
+            value = False
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+@st.fragment
+def render_project_panel(project_id, panel):
+    """
+    Render một panel của dự án: chỉ tải dữ liệu và vẽ biểu đồ của panel đó
+    Tương tác trong panel chỉ chạy lại fragment này, không chạy lại cả trang
+    """
+    sections, renderer = PROJECT_PANELS[panel]
+    started = time.perf_counter()
+
+    bundle = db.get_project_bundle(project_id, sections=sections)
+    if bundle.project is None:
+        st.warning("Không tìm thấy dự án.")
+        return
+
+    renderer(project_id, bundle)
+
+    # Thời gian render từng panel (để đo hiệu quả tải lười)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    st.session_state.setdefault('panel_timings', {})[panel] = round(elapsed_ms, 1)
+    if debug_enabled():
+        st.caption(f"⏱️ {panel}: {elapsed_ms:.0f} ms")
 # ← FUNCTION MỚI: Render DMAIC Tracking
-def render_dmaic_tracking(project_id, project):
+def render_dmaic_tracking(project_id, bundle):
     """Render DMAIC methodology tracking interface"""
+    project = bundle.project
     methodology = project.get('methodology', 'DMAIC')
     
     # Hiển thị methodology badge
@@ -321,7 +412,7 @@ def render_dmaic_tracking(project_id, project):
     
     if methodology == 'DMAIC':
         # Render DMAIC tools
-        dmaic_tools = DMAICTools(db)
+        dmaic_tools = DMAICTools(db, bundle)
         dmaic_tools.render_dmaic_tracker(project_id, project)
     
     elif methodology == 'PDCA':
@@ -444,10 +535,9 @@ def render_project_info(project_id, project):
         **Cập nhật lần cuối:** {pd.to_datetime(project.get('updated_at')).strftime('%d/%m/%Y %H:%M') if project.get('updated_at') else 'N/A'}
         """)
 
-def render_team_members(project_id):
+def render_team_members(project_id, members):
     st.subheader("Danh sách Thành viên")
     
-    members = db.get_team_members(project_id)
     
     # Hiển thị danh sách
     if not members.empty:
@@ -508,10 +598,9 @@ def render_team_members(project_id):
                 st.success("✅ Đã thêm thành viên!")
                 st.rerun()
 
-def render_stakeholders(project_id):
+def render_stakeholders(project_id, stakeholders):
     st.subheader("Danh sách Stakeholders")
     
-    stakeholders = db.get_stakeholders(project_id)
     
     # Hiển thị danh sách
     if not stakeholders.empty:
@@ -573,12 +662,11 @@ def render_stakeholders(project_id):
                 st.success("✅ Đã thêm stakeholder!")
                 st.rerun()
 
-def render_gantt_plan(project_id):
+def render_gantt_plan(project_id, bundle):
     st.subheader("📅 Kế hoạch Chi tiết - Gantt Chart")
     
     # ← LẤY METHODOLOGY TỪ PROJECT
-    project = db.get_project(project_id)
-    methodology = project.get('methodology', 'DMAIC') if project else 'DMAIC'
+    methodology = bundle.methodology
     
     # ← DEFINE PHASES CHO TỪNG METHODOLOGY
     METHODOLOGY_PHASES = {
@@ -597,7 +685,7 @@ def render_gantt_plan(project_id):
     }
     st.info(f"{methodology_icons.get(methodology, '⚪')} **Phương pháp:** {methodology} ({len(phases)} phases)")
     
-    tasks = db.get_tasks(project_id)
+    tasks = bundle.tasks
     
     # Hiển thị Gantt Chart
     if not tasks.empty:
@@ -609,10 +697,19 @@ def render_gantt_plan(project_id):
         chart_type = st.radio("Chọn kiểu hiển thị:", 
             ["Gantt Chart cơ bản", "DMAIC Gantt"], horizontal=True)
         
+        # Nhiều task: vẽ từng trang để biểu đồ không quá nặng
+        page = None
+        if len(tasks) > GANTT_PAGE_SIZE:
+            page_count = gantt_page_count(tasks)
+            page = st.number_input(
+                f"Trang biểu đồ (mỗi trang {GANTT_PAGE_SIZE} công việc)",
+                min_value=1, max_value=page_count, value=1, step=1
+            ) - 1
+        
         if chart_type == "DMAIC Gantt" and methodology == 'DMAIC':
-            fig = create_dmaic_gantt(tasks)
+            fig = create_dmaic_gantt(tasks, page=page)
         else:
-            fig = create_gantt_chart(tasks)
+            fig = create_gantt_chart(tasks, page=page)
         
         if fig:
             st.plotly_chart(fig, use_container_width=True)
@@ -638,7 +735,7 @@ def render_gantt_plan(project_id):
         display_tasks.columns = ['Phase', 'Công việc', 'Ngày bắt đầu', 'Ngày kết thúc',
                                   'Người phụ trách', 'Trạng thái', 'Tiến độ (%)']
         
-        st.dataframe(display_tasks, use_container_width=True)
+        st.dataframe(display_tasks, use_container_width=True, column_config=DATE_DISPLAY_COLUMNS)
         
     else:
         st.info("Chưa có kế hoạch chi tiết.")
@@ -690,10 +787,9 @@ def render_gantt_plan(project_id):
                 st.success("✅ Đã thêm công việc!")
                 st.rerun()
 
-def render_signoffs(project_id):
+def render_signoffs(project_id, signoffs):
     st.subheader("✍️ Bảng Ký tên")
     
-    signoffs = db.get_signoffs(project_id)
     
     # Hiển thị danh sách
     if not signoffs.empty:
@@ -704,7 +800,7 @@ def render_signoffs(project_id):
                 with col1:
                     st.write(f"**Vai trò:** {sign.get('role', 'N/A')}")
                     st.write(f"**Người ký:** {sign.get('name', 'Chưa ký')}")
-                    st.write(f"**Ngày ký:** {sign.get('date', 'N/A')}")
+                    st.write(f"**Ngày ký:** {sign['date'].strftime('%d/%m/%Y') if pd.notna(sign.get('date')) else 'N/A'}")
                     st.write(f"**Ghi chú:** {sign.get('notes', 'N/A')}")
                 
                 with col2:
@@ -749,50 +845,136 @@ def render_signoffs(project_id):
                 st.success("✅ Đã thêm!")
                 st.rerun()
 
-def render_export_report(project_id, project):
+def render_documents(project_id):
+    st.subheader("📁 Tài liệu dự án")
+    
+    # Chỉ tải metadata; nội dung file chỉ đọc từ blob store khi bấm tải về
+    documents = db.get_documents(project_id)
+    opened = st.session_state.setdefault('opened_documents', set())
+    
+    if not documents.empty:
+        for _, document in documents.iterrows():
+            size_kb = (document['file_size'] or 0) / 1024
+            with st.expander(f"📄 {document['document_name']} (v{document['version'] or 1}, {size_kb:,.0f} KB)"):
+                col1, col2 = st.columns([3, 1])
+                
+                with col1:
+                    st.write(f"**Loại:** {document.get('document_type') or 'N/A'}")
+                    st.write(f"**Người tải lên:** {document.get('uploaded_by') or 'N/A'}")
+                    tags = document.get('tags')
+                    if isinstance(tags, list) and tags:
+                        st.write(f"**Tags:** {', '.join(map(str, tags))}")
+                    if document.get('description'):
+                        st.write(document['description'])
+                
+                with col2:
+                    if document['id'] in opened or st.button("📥 Tải về", key=f"open_doc_{document['id']}"):
+                        opened.add(document['id'])
+                        try:
+                            with db.open_document_content(document['id']) as stream:
+                                content = stream.read()
+                            st.download_button(
+                                "💾 Lưu file",
+                                data=content,
+                                file_name=document['document_name'],
+                                mime=document.get('mime_type') or "application/octet-stream",
+                                key=f"save_doc_{document['id']}"
+                            )
+                        except KeyError:
+                            st.error("Không tìm thấy nội dung file.")
+                    
+                    if st.button("🗑️ Xóa", key=f"del_doc_{document['id']}"):
+                        db.delete_document(document['id'])
+                        opened.discard(document['id'])
+                        st.success("✅ Đã xóa!")
+                        st.rerun()
+    else:
+        st.info("Chưa có tài liệu nào.")
+    
+    # Form tải tài liệu lên
+    st.markdown("---")
+    st.subheader("➕ Thêm tài liệu")
+    
+    with st.form(f"add_document_{project_id}", clear_on_submit=True):
+        uploaded = st.file_uploader("File *")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            document_type = st.text_input("Loại tài liệu", placeholder="VD: A3, SOP, FMEA...")
+        
+        with col2:
+            tags = st.text_input("Tags (cách nhau bởi dấu phẩy)")
+        
+        description = st.text_area("Mô tả")
+        submitted = st.form_submit_button("💾 Tải lên", type="primary")
+        
+        if submitted:
+            if uploaded is None:
+                st.error("⚠️ Vui lòng chọn file!")
+            else:
+                document_data = {
+                    'project_id': project_id,
+                    'document_name': uploaded.name,
+                    'document_type': document_type,
+                    'mime_type': uploaded.type,
+                    'uploaded_by': st.session_state.get('user_name', 'Current User'),
+                    'tags': [tag.strip() for tag in tags.split(',') if tag.strip()],
+                    'description': description
+                }
+                
+                db.add_document(document_data, content=uploaded)
+                st.success("✅ Đã tải lên!")
+                st.rerun()
+
+def render_report_status(project_id):
+    """State of the project's PDF report; polls while it is being rendered"""
+    job = report_service.job(project_id)
+    if job is None:
+        return
+    
+    polling = job.status in ('queued', 'running')
+    
+    @st.fragment(run_every=1.0 if polling else None)
+    def status():
+        if polling and job.status not in ('queued', 'running'):
+            st.rerun()  # finished: render the result once, without polling
+        if job.status in ('queued', 'running'):
+            st.info("⏳ Đang tạo file PDF..." if job.status == 'running' else "⏳ Đang chờ tạo file PDF...")
+            return
+        if job.status == 'failed':
+            st.error(f"❌ Lỗi: {job.error}")
+            return
+        
+        st.download_button(
+            label="⬇️ Tải xuống PDF",
+            data=job.pdf,
+            file_name=job.file_name,
+            mime="application/pdf"
+        )
+        st.success("✅ Đã tạo file PDF!" if not job.cached else "✅ Báo cáo không thay đổi, dùng lại file đã tạo")
+    
+    status()
+
+def render_export_report(project_id, bundle):
     st.subheader("📤 Xuất Báo cáo")
     
+    project = bundle.project
+    team_members = bundle.team_members
+    stakeholders = bundle.stakeholders
+    tasks = bundle.tasks
+    signoffs = bundle.signoffs
+    
     col1, col2, col3 = st.columns(3)
     
-    # Xuất PDF
+    # Xuất PDF (tạo nền, PDF của dữ liệu không đổi được lấy từ cache)
     with col1:
         if st.button("📄 Xuất PDF", type="primary"):
-            with st.spinner("Đang tạo file PDF..."):
-                try:
-                    # Lấy dữ liệu
-                    team_members = db.get_team_members(project_id)
-                    stakeholders = db.get_stakeholders(project_id)
-                    tasks = db.get_tasks(project_id)
-                    signoffs = db.get_signoffs(project_id)
-                    
-                    # Tạo file PDF trong thư mục tạm
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                        output_path = tmp_file.name
-                    
-                    create_project_pdf(project, team_members, stakeholders, 
-                                       tasks, signoffs, output_path)
-                    
-                    # Đọc file và tạo download button
-                    with open(output_path, 'rb') as f:
-                        pdf_bytes = f.read()
-                    
-                    # Xóa file tạm
-                    try:
-                        os.remove(output_path)
-                    except:
-                        pass
-                    
-                    st.download_button(
-                        label="⬇️ Tải xuống PDF",
-                        data=pdf_bytes,
-                        file_name=f"Project_{project['project_code']}.pdf",
-                        mime="application/pdf"
-                    )
-                    
-                    st.success("✅ Đã tạo file PDF!")
-                    
-                except Exception as e:
-                    st.error(f"❌ Lỗi: {str(e)}")
+            try:
+                report_service.submit(project_id, bundle)
+            except Exception as e:
+                st.error(f"❌ Lỗi: {str(e)}")
+        
+        render_report_status(project_id)
     
     # Xuất Excel
     with col2:
@@ -807,22 +989,18 @@ def render_export_report(project_id, project):
                     project_df.to_excel(writer, sheet_name='Thông tin dự án', index=False)
                     
                     # Sheet 2: Thành viên
-                    team_members = db.get_team_members(project_id)
                     if not team_members.empty:
                         team_members.to_excel(writer, sheet_name='Thành viên', index=False)
                     
                     # Sheet 3: Stakeholders
-                    stakeholders = db.get_stakeholders(project_id)
                     if not stakeholders.empty:
                         stakeholders.to_excel(writer, sheet_name='Stakeholders', index=False)
                     
                     # Sheet 4: Kế hoạch
-                    tasks = db.get_tasks(project_id)
                     if not tasks.empty:
                         tasks.to_excel(writer, sheet_name='Kế hoạch', index=False)
                     
                     # Sheet 5: Ký tên
-                    signoffs = db.get_signoffs(project_id)
                     if not signoffs.empty:
                         signoffs.to_excel(writer, sheet_name='Ký tên', index=False)
                 
@@ -844,8 +1022,6 @@ def render_export_report(project_id, project):
     with col3:
         if st.button("📋 Xuất CSV", type="primary"):
             try:
-                tasks = db.get_tasks(project_id)
-                
                 if not tasks.empty:
                     csv = tasks.to_csv(index=False)
                     
@@ -863,12 +1039,42 @@ def render_export_report(project_id, project):
             except Exception as e:
                 st.error(f"❌ Lỗi: {str(e)}")
 
+# ==================== TÌM KIẾM ====================
+def render_search():
+    st.header("🔎 Tìm kiếm")
+    st.caption("Tìm trong dự án, bình luận, biên bản họp, tài liệu và nhật ký hoạt động — gõ có dấu hay không dấu đều được")
+    
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        query = st.text_input("Từ khóa", placeholder="VD: giam thoi gian cho kham")
+    with col2:
+        entity_types = st.multiselect(
+            "Tìm trong",
+            list(SEARCH_ENTITY_LABELS),
+            format_func=SEARCH_ENTITY_LABELS.get
+        )
+    
+    if not query:
+        return
+    
+    results = db.search(query, entity_types=entity_types or None, limit=50)
+    if results.empty:
+        st.info("Không tìm thấy kết quả phù hợp.")
+        return
+    
+    st.write(f"**{len(results)}** kết quả")
+    for _, row in results.iterrows():
+        label = SEARCH_ENTITY_LABELS.get(row['entity_type'], row['entity_type'])
+        project = f"{row['project_code']} - {row['project_name']}" if row['entity_type'] != 'project' and row['project_code'] else ""
+        st.markdown(f"**[{label}] {row['title'] or '(không tiêu đề)'}**  \n{project}")
+        if row['snippet']:
+            st.caption(row['snippet'])
+
 # ==================== DASHBOARD ====================
 def render_dashboard():
     st.header("📊 Dashboard & Thống kê")
     
-    stats = db.get_statistics()
-    projects = db.get_all_projects()
+    stats = db.get_rollup_statistics()
     
     if stats['total_projects'] == 0:
         st.warning("Chưa có dữ liệu để hiển thị dashboard.")
@@ -927,10 +1133,9 @@ def render_dashboard():
                     st.plotly_chart(fig, use_container_width=True)
             
             elif chart_type == "Heatmap":
-                if not projects.empty:
-                    fig = create_heatmap(projects)
-                    if fig:
-                        st.plotly_chart(fig, use_container_width=True)
+                fig = create_heatmap(stats['by_month'])
+                if fig:
+                    st.plotly_chart(fig, use_container_width=True)
         
         chart_idx += 1
     
@@ -991,6 +1196,41 @@ def render_departments():
                     st.error("❌ Phòng/ban đã tồn tại!")
 
 # ==================== IMPORT/EXPORT ====================
+def render_portfolio_export_status(fmt):
+    """Progress of the background export; polls while it runs"""
+    job = portfolio_exporter.job(fmt)
+    if job is None or (job.status == 'done' and not os.path.exists(job.path)):
+        return
+    
+    polling = job.status == 'running'
+    
+    @st.fragment(run_every=1.0 if polling else None)
+    def status():
+        if polling and job.status != 'running':
+            st.rerun()  # finished: render the result once, without polling
+        if job.status == 'running':
+            st.progress(job.progress, text=(
+                f"Đang xuất {job.current_table or '...'}: {job.rows_written:,}/{job.total_rows:,} dòng"
+            ))
+            return
+        if job.status == 'failed':
+            st.error(f"❌ Lỗi export: {job.error}")
+            return
+        
+        if job.cached:
+            st.success("✅ Dữ liệu chưa thay đổi từ lần export trước, dùng lại file đã tạo")
+        else:
+            st.success(f"✅ Đã xuất {job.rows_written:,} dòng trong {job.seconds:.1f}s")
+        with open(job.path, 'rb') as f:
+            st.download_button(
+                label="⬇️ Tải xuống",
+                data=f,
+                file_name=job.file_name,
+                mime=EXPORT_FORMATS[job.fmt][1]
+            )
+    
+    status()
+
 def render_import_export():
     st.header("📤 Import/Export Dữ liệu")
     
@@ -999,6 +1239,16 @@ def render_import_export():
     with tab1:
         st.subheader("Import dữ liệu từ Excel/CSV")
         
+        target = st.selectbox(
+            "Loại dữ liệu",
+            list(IMPORT_TARGETS),
+            format_func=lambda key: IMPORT_TARGETS[key]['label']
+        )
+        st.caption(
+            "Dự án được nhận diện theo mã dự án; task theo mã dự án + phase + tên task; "
+            "thành viên theo mã dự án + họ tên. Cột có thể đặt tên tiếng Việt (VD: Mã dự án, Ngày bắt đầu)."
+        )
+        
         uploaded_file = st.file_uploader(
             "Chọn file Excel hoặc CSV",
             type=['xlsx', 'xls', 'csv']
@@ -1006,71 +1256,96 @@ def render_import_export():
         
         if uploaded_file:
             try:
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
+                # Only the first rows are read for the preview
+                chunks = read_chunks(uploaded_file, uploaded_file.name, target, chunk_rows=10)
+                preview = next(chunks, None)
+                chunks.close()
+                uploaded_file.seek(0)
+                
+                if preview is None:
+                    st.warning("File không có dữ liệu")
                 else:
-                    df = pd.read_excel(uploaded_file)
+                    st.write("Xem trước dữ liệu:")
+                    st.dataframe(preview, use_container_width=True)
+                    
+                    mapping = map_columns(preview.columns, target)
+                    st.caption("Cột được import: " + (
+                        ", ".join(f"{header} → {column}" for header, column in mapping.items()) or "không có"
+                    ))
                 
-                st.write("Xem trước dữ liệu:")
-                st.dataframe(df.head(), use_container_width=True)
+                col1, col2 = st.columns(2)
+                with col1:
+                    upsert = st.checkbox("Cập nhật bản ghi đã có", value=True)
+                with col2:
+                    dry_run = st.checkbox("Chỉ kiểm tra, không ghi dữ liệu")
                 
-                if st.button("✅ Import dữ liệu", type="primary"):
-                    # TODO: Implement import logic
-                    st.success("Chức năng đang phát triển!")
+                if preview is not None and st.button("✅ Import dữ liệu", type="primary"):
+                    progress = st.progress(0.0, text="Đang import...")
+                    report = import_file(
+                        db, uploaded_file, uploaded_file.name, target, upsert=upsert, dry_run=dry_run,
+                        progress=lambda rows: progress.progress(
+                            min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0),
+                            text=f"Đã xử lý {rows:,} dòng..."
+                        )
+                    )
+                    progress.progress(1.0, text=f"Đã xử lý {report.rows:,} dòng trong {report.seconds:.1f}s")
+                    db.cache.clear()
+                    
+                    col1, col2, col3, col4 = st.columns(4)
+                    col1.metric("Số dòng", f"{report.rows:,}")
+                    col2.metric("Thêm mới", f"{report.inserted:,}")
+                    col3.metric("Cập nhật", f"{report.updated:,}")
+                    col4.metric("Dòng lỗi", f"{report.invalid:,}")
+                    
+                    if report.dry_run:
+                        st.info(f"Chế độ kiểm tra: {report.rows - report.invalid:,} dòng hợp lệ, chưa ghi dữ liệu")
+                    elif report.invalid == 0:
+                        st.success("✅ Import thành công!")
+                    else:
+                        st.warning(f"⚠️ {report.invalid:,} dòng lỗi không được import")
+                    if report.skipped:
+                        st.caption(f"{report.skipped:,} dòng bỏ qua (đã có hoặc trùng trong file)")
+                    if report.ignored_columns:
+                        st.caption("Cột bỏ qua: " + ", ".join(report.ignored_columns))
                     
+                    if report.error_count:
+                        errors = report.errors_frame()
+                        if report.error_count > len(errors):
+                            st.caption(f"Hiển thị {len(errors):,}/{report.error_count:,} lỗi đầu tiên")
+                        st.dataframe(errors, use_container_width=True, hide_index=True)
+                        st.download_button(
+                            label="⬇️ Tải danh sách lỗi (CSV)",
+                            data=errors.to_csv(index=False).encode('utf-8-sig'),
+                            file_name=f"Import_errors_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                            mime="text/csv"
+                        )
+                    
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
             except Exception as e:
                 st.error(f"❌ Lỗi đọc file: {str(e)}")
     
     with tab2:
         st.subheader("Export toàn bộ dữ liệu")
+        st.caption(
+            "Tất cả dự án và dữ liệu liên quan (thành viên, kế hoạch, DMAIC, biên bản họp, tài liệu...). "
+            "File được tạo nền và dùng lại cho tới khi dữ liệu thay đổi."
+        )
         
-        col1, col2 = st.columns(2)
+        fmt = st.radio(
+            "Định dạng",
+            list(EXPORT_FORMATS),
+            format_func=lambda key: EXPORT_FORMATS[key][0],
+            horizontal=True
+        )
         
-        with col1:
-            if st.button("📊 Export tất cả dự án (Excel)", type="primary"):
-                try:
-                    projects = db.get_all_projects()
-                    
-                    if not projects.empty:
-                        output = io.BytesIO()
-                        projects.to_excel(output, index=False, engine='xlsxwriter')
-                        excel_bytes = output.getvalue()
-                        
-                        st.download_button(
-                            label="⬇️ Tải xuống",
-                            data=excel_bytes,
-                            file_name=f"All_Projects_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
-                        
-                        st.success("✅ Đã tạo file!")
-                    else:
-                        st.warning("Không có dữ liệu để export")
-                        
-                except Exception as e:
-                    st.error(f"❌ Lỗi: {str(e)}")
+        if st.button("📦 Tạo file export", type="primary"):
+            try:
+                portfolio_exporter.start(fmt)
+            except Exception as e:
+                st.error(f"❌ Lỗi: {str(e)}")
         
-        with col2:
-            if st.button("📋 Export tất cả dự án (CSV)", type="primary"):
-                try:
-                    projects = db.get_all_projects()
-                    
-                    if not projects.empty:
-                        csv = projects.to_csv(index=False)
-                        
-                        st.download_button(
-                            label="⬇️ Tải xuống",
-                            data=csv,
-                            file_name=f"All_Projects_{datetime.now().strftime('%Y%m%d')}.csv",
-                            mime="text/csv"
-                        )
-                        
-                        st.success("✅ Đã tạo file!")
-                    else:
-                        st.warning("Không có dữ liệu để export")
-                        
-                except Exception as e:
-                    st.error(f"❌ Lỗi: {str(e)}")
+        render_portfolio_export_status(fmt)
 
 # ==================== HƯỚNG DẪN SỬ DỤNG ====================
 def render_user_guide():
@@ -1181,6 +1456,9 @@ def main():
     elif selected_menu == "📝 Quản lý dự án":
         render_manage_projects()
     
+    elif selected_menu == "🔎 Tìm kiếm":
+        render_search()
+    
     elif selected_menu == "📊 Dashboard & Thống kê":
         render_dashboard()
     
@@ -0,0 +1,76 @@
+"""
+Benchmark ghi task: add_task() từng dòng (1 transaction/dòng) vs bulk_add_tasks()
+Đo thêm upsert (ghi lại cùng kế hoạch -> cập nhật theo phase + tên task)
+Chạy: python bench_bulk_insert.py [connection_string] [số_task ...]   (mặc định: SQLite tạm, 1000 10000 100000)
+  Vòng add_task() từng dòng chỉ chạy tới LOOP_LIMIT dòng (chậm), trên PostgreSQL lô lớn dùng COPY
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from database import ProjectDatabase
+
+PHASES = ['Define', 'Measure', 'Analyze', 'Improve', 'Control']
+LOOP_LIMIT = 10000
+
+
+def make_tasks(count):
+    start = date(2024, 1, 1)
+    return [{
+        'phase': PHASES[i % 5],
+        'task_name': f"Công việc {i}",
+        'start_date': start + timedelta(days=i % 200),
+        'end_date': start + timedelta(days=i % 200 + 10),
+        'responsible': f"Người {i % 12}",
+        'status': 'Đang thực hiện',
+        'progress': i % 101
+    } for i in range(count)]
+
+
+def timed(action):
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def run(db, sizes):
+    print(f"{'tasks':>7}  {'method':<24} {'seconds':>9} {'rows/s':>10}")
+    for run_index, size in enumerate(sizes):
+        rows = make_tasks(size)
+        results = []
+
+        if size <= LOOP_LIMIT:
+            project_id = db.add_project({'project_code': f'BENCH-LOOP-{run_index}', 'project_name': 'Benchmark'})
+            results.append(('add_task() per row', timed(
+                lambda: [db.add_task(dict(row, project_id=project_id)) for row in rows]
+            )))
+
+        project_id = db.add_project({'project_code': f'BENCH-BULK-{run_index}', 'project_name': 'Benchmark'})
+        results.append(('bulk_add_tasks() insert', timed(lambda: db.bulk_add_tasks(project_id, rows))))
+        for row in rows:
+            row['progress'] = 100
+        results.append(('bulk_add_tasks() upsert', timed(lambda: db.bulk_add_tasks(project_id, rows))))
+
+        for name, seconds in results:
+            print(f"{size:>7}  {name:<24} {seconds:>9.2f} {size / seconds:>10.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    connection_string = args.pop(0) if args and not args[0].isdigit() else None
+    sizes = [int(arg) for arg in args] or [1000, 10000, 100000]
+
+    path = None
+    if connection_string is None:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        connection_string = f"sqlite:///{path}"
+    try:
+        run(ProjectDatabase(connection_string), sizes)
+    finally:
+        if path:
+            os.remove(path)
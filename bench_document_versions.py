@@ -0,0 +1,72 @@
+"""
+Benchmark lưu phiên bản tài liệu: một file (mặc định 5 MB) sửa nhiều lần (mặc định 30)
+So sánh dung lượng 30 bản đầy đủ với các đoạn (chunk) thực sự được lưu, thời gian ghi
+mỗi phiên bản và thời gian dựng lại phiên bản
+Chạy: python bench_document_versions.py [connection_string] [MB] [số_phiên_bản]   (mặc định: SQLite tạm)
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from blob_store import LocalBlobStore
+from database import ProjectDatabase
+
+
+def edit(content, rng):
+    """A few bytes changed and a short paragraph inserted"""
+    at = rng.randrange(len(content) - 1000)
+    content = content[:at] + rng.randbytes(20) + content[at + 20:]
+    at = rng.randrange(len(content))
+    return content[:at] + rng.randbytes(rng.randrange(50, 500)) + content[at:]
+
+
+def run(db, size_mb, versions):
+    rng = random.Random(42)
+    content = rng.randbytes(size_mb * 1024 * 1024)
+    project_id = db.add_project({'project_code': f'BENCH-DOC-{time.time_ns()}', 'project_name': 'Benchmark'})
+    document_id = db.add_document({'project_id': project_id, 'document_name': 'A3.pdf'}, content=content)
+
+    started = time.perf_counter()
+    for number in range(1, versions + 1):
+        db.add_document_version({'document_id': document_id, 'version_number': number}, content=content)
+        content = edit(content, rng)
+    write_seconds = time.perf_counter() - started
+
+    report = db.get_document_storage(document_id)
+    started = time.perf_counter()
+    for _ in db.iter_document_content(document_id, 1):
+        pass
+    oldest_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{versions} phiên bản x {size_mb} MB")
+    print(f"  bản đầy đủ:        {report['logical_bytes'] / 1e6:>8.1f} MB")
+    print(f"  đã lưu (chunk):    {report['stored_bytes'] / 1e6:>8.1f} MB  (tiết kiệm {report['saved_ratio']:.0%})")
+    print(f"  chunk:             {report['unique_chunks']:>8} / {report['chunks']} tham chiếu")
+    print(f"  ghi 1 phiên bản:   {write_seconds / versions * 1000:>8.0f} ms")
+    print(f"  dựng bản mới nhất: {report['reconstruct_ms']:>8.0f} ms")
+    print(f"  dựng bản cũ nhất:  {oldest_ms:>8.0f} ms")
+    db.delete_project(project_id)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    connection_string = args.pop(0) if args and not args[0].isdigit() else None
+    size_mb = int(args[0]) if args else 5
+    versions = int(args[1]) if len(args) > 1 else 30
+
+    path = None
+    if connection_string is None:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        connection_string = f"sqlite:///{path}"
+    directory = tempfile.mkdtemp()
+    try:
+        run(ProjectDatabase(connection_string, blob_store=LocalBlobStore(directory)), size_mb, versions)
+    finally:
+        shutil.rmtree(directory)
+        if path:
+            os.remove(path)
@@ -0,0 +1,94 @@
+"""
+Benchmark Gantt chart: renderer cũ (1 trace/task, iterrows) vs renderer vector hóa
+So sánh số trace, kích thước JSON của figure và thời gian tạo
+Chạy: python bench_gantt.py [số_task ...]   (mặc định: 100 500 2000)
+"""
+
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from gantt_chart import create_gantt_chart, create_dmaic_gantt, STATUS_COLORS, GANTT_PAGE_SIZE
+
+PHASES = ['Define', 'Measure', 'Analyze', 'Improve', 'Control']
+STATUSES = list(STATUS_COLORS)
+
+
+def make_tasks(count):
+    start = date(2024, 1, 1)
+    return pd.DataFrame({
+        'task_name': [f"Công việc {i}" for i in range(count)],
+        'phase': [PHASES[i % 5] for i in range(count)],
+        'status': [STATUSES[i % 4] for i in range(count)],
+        'progress': [(i * 7) % 101 for i in range(count)],
+        'responsible': [f"Người {i % 12}" for i in range(count)],
+        'start_date': [(start + timedelta(days=i % 200)).isoformat() for i in range(count)],
+        'end_date': [(start + timedelta(days=i % 200 + 5 + i % 20)).isoformat() for i in range(count)],
+    })
+
+
+def legacy_gantt(tasks_df):
+    """Renderer trước đây: một go.Bar + hovertemplate f-string cho mỗi task"""
+    df = tasks_df.copy()
+    df['start_date'] = pd.to_datetime(df['start_date'])
+    df['end_date'] = pd.to_datetime(df['end_date'])
+    df['duration'] = (df['end_date'] - df['start_date']).dt.days
+    df['color'] = df['status'].map(STATUS_COLORS).fillna('lightgray')
+    
+    fig = go.Figure()
+    for _, row in df.iterrows():
+        fig.add_trace(go.Bar(
+            name=row['task_name'],
+            x=[row['duration']],
+            y=[row['task_name']],
+            orientation='h',
+            marker=dict(color=row['color']),
+            base=row['start_date'],
+            text=f"{row['progress']}%",
+            textposition='inside',
+            hovertemplate=(
+                f"<b>{row['task_name']}</b><br>" +
+                f"Phase: {row['phase']}<br>" +
+                f"Start: {row['start_date'].strftime('%Y-%m-%d')}<br>" +
+                f"End: {row['end_date'].strftime('%Y-%m-%d')}<br>" +
+                f"Status: {row['status']}<br>" +
+                f"Progress: {row['progress']}%<br>" +
+                f"Responsible: {row.get('responsible', 'N/A')}<br>" +
+                "<extra></extra>"
+            )
+        ))
+    fig.update_layout(height=max(400, len(df) * 40), showlegend=False, xaxis=dict(type='date'))
+    return fig
+
+
+def measure(builder, tasks_df):
+    started = time.perf_counter()
+    fig = builder(tasks_df)
+    payload = fig.to_json()
+    elapsed = time.perf_counter() - started
+    return len(fig.data), len(payload), elapsed
+
+
+RENDERERS = {
+    'legacy (1 trace/task)': legacy_gantt,
+    'vectorized': create_gantt_chart,
+    'vectorized DMAIC': create_dmaic_gantt,
+    f'vectorized, page of {GANTT_PAGE_SIZE}': lambda df: create_gantt_chart(df, page=0),
+}
+
+
+def run(sizes):
+    print(f"{'tasks':>6}  {'renderer':<28} {'traces':>7} {'JSON (KB)':>10} {'build+json (ms)':>16}")
+    for size in sizes:
+        tasks = make_tasks(size)
+        for name, builder in RENDERERS.items():
+            traces, payload, elapsed = measure(builder, tasks)
+            print(f"{size:>6}  {name:<28} {traces:>7} {payload / 1024:>10.1f} {elapsed * 1000:>16.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [100, 500, 2000])
@@ -0,0 +1,369 @@
+"""
+Blob Store Module
+Lưu nội dung file tài liệu ngoài database, định danh bằng mã SHA-256 của nội dung
+Hai file giống nhau chỉ được lưu một lần; database chỉ giữ metadata và mã băm
+Mặc định lưu trên ổ đĩa local, hoặc trên S3 / dịch vụ tương thích S3 (MinIO, ...)
+"""
+
+import abc
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+from typing import Iterator, Optional, Tuple
+
+import streamlit as st
+
+# Bytes read / written per step: memory use does not depend on the file size
+BLOB_CHUNK_SIZE = 1024 * 1024
+DEFAULT_BLOB_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_blobs')
+
+# Store settings: secrets [blob_store] keys, overridden by env vars
+BLOB_ENV_VARS = {
+    'backend': 'LSS_BLOB_BACKEND',
+    'directory': 'LSS_BLOB_DIRECTORY',
+    'bucket': 'LSS_BLOB_BUCKET',
+    'prefix': 'LSS_BLOB_PREFIX',
+    'endpoint_url': 'LSS_BLOB_ENDPOINT_URL',
+}
+
+_KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def _check_key(key):
+    if not isinstance(key, str) or not _KEY_PATTERN.match(key):
+        raise ValueError(f"Invalid blob key: {key!r}")
+    return key
+
+
+def iter_chunks(data, chunk_size=BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+    """Chunks of bytes, a file object (read()) or an iterable of chunks"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data)
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+    elif hasattr(data, 'read'):
+        while True:
+            chunk = data.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        for chunk in data:
+            if chunk:
+                yield bytes(chunk)
+
+
+class ChunkStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks (one chunk in memory at a time)"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self):
+        close = getattr(self._chunks, 'close', None)
+        if close is not None:
+            close()  # releases the file / HTTP body held by a generator
+        super().close()
+
+
+def hash_content(data) -> Tuple[str, int]:
+    """(sha256 hex, size) of bytes / a file object / an iterable of chunks"""
+    digest, size = hashlib.sha256(), 0
+    for chunk in iter_chunks(data):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class BlobStore(abc.ABC):
+    """
+    Content-addressed storage: put() returns the SHA-256 of the content, which
+    is the key for open_chunks() / read() / delete()
+    Subclasses implement exists, size, modified, touch, _save, open_chunks and delete
+    Reusing a stored blob touches it: blobs modified recently are never collected
+    (a row about to refer to them may not be committed yet)
+    """
+
+    def put(self, data) -> Tuple[str, int]:
+        """
+        Store content (bytes, file object or iterable of chunks)
+        Content already in the store is not written again
+
+        Returns:
+            (key, size in bytes)
+        """
+        # Spool to a temp file while hashing: the key is only known at the end
+        digest, size = hashlib.sha256(), 0
+        with tempfile.TemporaryFile() as spool:
+            for chunk in iter_chunks(data):
+                digest.update(chunk)
+                spool.write(chunk)
+                size += len(chunk)
+            key = digest.hexdigest()
+            if not self.touch(key):
+                spool.seek(0)
+                self._save(key, spool, size)
+        return key, size
+
+    def open(self, key) -> io.BufferedReader:
+        """Content as a read-only binary file object"""
+        return io.BufferedReader(ChunkStream(self.open_chunks(key)), BLOB_CHUNK_SIZE)
+
+    def read(self, key) -> bytes:
+        """Whole content in memory (small files only; use open / open_chunks otherwise)"""
+        return b''.join(self.open_chunks(key))
+
+    @abc.abstractmethod
+    def exists(self, key) -> bool:
+        """True if the blob is stored"""
+
+    @abc.abstractmethod
+    def size(self, key) -> Optional[int]:
+        """Size in bytes, None if the blob doesn't exist"""
+
+    @abc.abstractmethod
+    def modified(self, key) -> Optional[float]:
+        """Last write / touch time (epoch seconds), None if the blob doesn't exist"""
+
+    @abc.abstractmethod
+    def touch(self, key) -> bool:
+        """Mark the blob as just used; False if it doesn't exist"""
+
+    @abc.abstractmethod
+    def _save(self, key, fileobj, size):
+        """Store `size` bytes read from `fileobj` under `key` (called by put)"""
+
+    @abc.abstractmethod
+    def open_chunks(self, key, chunk_size=BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+        """Content as an iterator of byte chunks (KeyError if missing)"""
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """Remove the blob (no error if it doesn't exist)"""
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files <directory>/ab/cd/<sha256>, written atomically"""
+
+    def __init__(self, directory: str = DEFAULT_BLOB_DIRECTORY):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        _check_key(key)
+        return os.path.join(self.directory, key[:2], key[2:4], key)
+
+    def exists(self, key) -> bool:
+        return os.path.exists(self._path(key))
+
+    def size(self, key) -> Optional[int]:
+        path = self._path(key)
+        return os.path.getsize(path) if os.path.exists(path) else None
+
+    def modified(self, key) -> Optional[float]:
+        try:
+            return os.path.getmtime(self._path(key))
+        except FileNotFoundError:
+            return None
+
+    def touch(self, key) -> bool:
+        try:
+            os.utime(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _save(self, key, fileobj, size):
+        fd, partial = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in iter_chunks(fileobj):
+                    out.write(chunk)
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(partial, path)
+        except Exception:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+    def put(self, data) -> Tuple[str, int]:
+        # Write straight into the store directory while hashing (no spool), then rename under the key
+        digest, size = hashlib.sha256(), 0
+        fd, partial = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in iter_chunks(data):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            key = digest.hexdigest()
+            path = self._path(key)
+            if self.touch(key):
+                os.remove(partial)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(partial, path)
+            return key, size
+        except Exception:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+    def open_chunks(self, key, chunk_size=BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            raise KeyError(key)
+        with open(path, 'rb') as f:
+            yield from iter_chunks(f, chunk_size)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobStore(BlobStore):
+    """
+    Blobs as objects <prefix><sha256> in an S3 bucket
+    `client` is a boto3 S3 client, or any object with the same head_object /
+    upload_fileobj / get_object / delete_object methods (MinIO, a local stand-in)
+    """
+
+    def __init__(self, client, bucket: str, prefix: str = ''):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _object_key(self, key):
+        return f"{self.prefix}{_check_key(key)}"
+
+    @staticmethod
+    def _missing(error):
+        code = str(getattr(error, 'response', {}).get('Error', {}).get('Code', ''))
+        return isinstance(error, KeyError) or code in ('404', 'NoSuchKey', 'NotFound')
+
+    def exists(self, key) -> bool:
+        return self.size(key) is not None
+
+    def size(self, key) -> Optional[int]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))['ContentLength']
+        except Exception as e:
+            if self._missing(e):
+                return None
+            raise
+
+    def modified(self, key) -> Optional[float]:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except Exception as e:
+            if self._missing(e):
+                return None
+            raise
+        return head['LastModified'].timestamp()
+
+    def touch(self, key) -> bool:
+        # In-place copy: S3 has no way to only update LastModified
+        object_key = self._object_key(key)
+        try:
+            self.client.copy_object(Bucket=self.bucket, Key=object_key,
+                                    CopySource={'Bucket': self.bucket, 'Key': object_key},
+                                    MetadataDirective='REPLACE')
+            return True
+        except Exception as e:
+            if self._missing(e):
+                return False
+            raise
+
+    def _save(self, key, fileobj, size):
+        self.client.upload_fileobj(fileobj, self.bucket, self._object_key(key))
+
+    def open_chunks(self, key, chunk_size=BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))['Body']
+        except Exception as e:
+            if self._missing(e):
+                raise KeyError(key)
+            raise
+        try:
+            yield from iter_chunks(body, chunk_size)
+        finally:
+            body.close()
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+
+# ==================== CONFIGURATION ====================
+
+_STORES = {}
+_STORE_LOCK = threading.Lock()
+
+
+def get_blob_store_config(overrides=None):
+    """
+    Blob store settings
+    Priority: overrides > environment variables > Streamlit secrets > defaults
+    """
+    config = {'backend': 'local', 'directory': DEFAULT_BLOB_DIRECTORY, 'prefix': ''}
+
+    try:
+        config.update(dict(st.secrets["blob_store"]))
+    except Exception:
+        pass
+
+    for key, env_var in BLOB_ENV_VARS.items():
+        if os.environ.get(env_var):
+            config[key] = os.environ[env_var]
+
+    config.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    return config
+
+
+def create_blob_store(config) -> BlobStore:
+    """Build the store described by a get_blob_store_config() dict"""
+    if config['backend'] == 'local':
+        return LocalBlobStore(config['directory'])
+    if config['backend'] == 's3':
+        import boto3
+
+        client = boto3.client(
+            's3',
+            endpoint_url=config.get('endpoint_url'),
+            aws_access_key_id=config.get('access_key_id'),
+            aws_secret_access_key=config.get('secret_access_key'),
+            region_name=config.get('region'),
+        )
+        return S3BlobStore(client, config['bucket'], config.get('prefix', ''))
+    raise ValueError(f"Unknown blob store backend: {config['backend']}")
+
+
+def get_blob_store(overrides=None) -> BlobStore:
+    """Process-wide store for the configured backend"""
+    config = get_blob_store_config(overrides)
+    key = tuple(sorted((k, str(v)) for k, v in config.items()))
+    with _STORE_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = create_blob_store(config)
+        return store
@@ -0,0 +1,27 @@
+"""
+Script gửi email nhắc nhở các task sắp đến hạn (7, 3, 1 ngày)
+Danh sách nhắc nhở được lấy bằng một truy vấn duy nhất
+Chạy: python check_deadlines.py [--dry-run] [connection_string]
+  --dry-run: chỉ báo số nhắc nhở và thời gian truy vấn, không gửi email
+"""
+
+import sys
+
+from collaboration import check_deadlines_and_notify
+from database import ProjectDatabase
+
+def check(connection_string=None, dry_run=False):
+    db = ProjectDatabase(connection_string)
+
+    print("🔄 Đang kiểm tra deadline...")
+    report = check_deadlines_and_notify(db, dry_run=dry_run)
+
+    if dry_run:
+        print(f"✅ {report['reminders']} nhắc nhở (truy vấn {report['query_seconds'] * 1000:.1f} ms), chưa gửi")
+    else:
+        print(f"✅ {report['reminders']} nhắc nhở ({report['suppressed']} đã gửi trước đó), "
+              f"đã gửi {report['sent']} email tổng hợp trong {report['seconds']:.2f}s")
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != '--dry-run']
+    check(args[0] if args else None, dry_run='--dry-run' in sys.argv[1:])
@@ -4,12 +4,14 @@ Combines all collaboration features into one cohesive interface
 FIXED: Removed limit parameter from get_activities call
 """
 
+import time
 import streamlit as st
 from datetime import datetime
 from typing import Optional
 
 # Import collaboration modules
 from notification_service import NotificationService, get_notification_service
+from notification_digest import deadline_notifications, record_notifications, send_digests
 from activity_tracker import ActivityTracker
 from comments_manager import CommentsManager, render_comment_section
 from meeting_manager import MeetingManager, render_meeting_minutes_section
@@ -20,14 +22,16 @@ class CollaborationHub:
     Main collaboration hub that integrates all features
     """
     
-    def __init__(self, database):
+    def __init__(self, database, bundle=None):
         """
         Initialize collaboration hub
         
         Args:
             database: ProjectDatabase instance
+            bundle: ProjectBundle preloaded by the project page (optional)
         """
         self.db = database
+        self.bundle = bundle
         
         # Initialize services
         self.notification_service = get_notification_service()
@@ -35,11 +39,13 @@ class CollaborationHub:
         self.comments_manager = CommentsManager(
             database,
             self.notification_service,
-            self.activity_tracker
+            self.activity_tracker,
+            bundle=bundle
         )
         self.meeting_manager = MeetingManager(
             database,
-            self.activity_tracker
+            self.activity_tracker,
+            bundle=bundle
         )
     
     def render(self, project_id: int, project: dict, current_user: str):
@@ -86,7 +92,10 @@ class CollaborationHub:
         st.write("### 📋 Nhật ký Hoạt động")
         
         # Get activities - FIXED: Removed limit parameter
-        activities = self.db.get_activities(project_id)
+        if self.bundle is not None and self.bundle.matches(project_id, 'activities'):
+            activities = self.bundle.activities
+        else:
+            activities = self.db.get_activities(project_id)
         
         # Convert to list if DataFrame
         if hasattr(activities, 'to_dict'):
@@ -112,8 +121,11 @@ class CollaborationHub:
         # Filter activities
         filtered = activities
         if search:
-            filtered = [a for a in filtered 
-                       if search.lower() in str(a).lower()]
+            # Full-text index (diacritics ignored, best matches first) over the whole log,
+            # then keep the matches among the activities shown
+            matches = self.db.search(search, project_id=project_id, entity_types=['activity'], limit=500)
+            rank = {entity_id: i for i, entity_id in enumerate(matches['entity_id'])}
+            filtered = sorted((a for a in filtered if a.get('id') in rank), key=lambda a: rank[a['id']])
         
         if filter_type != "All":
             filtered = [a for a in filtered 
@@ -138,7 +150,9 @@ class CollaborationHub:
                 
                 # Parse timestamp
                 try:
-                    dt = datetime.fromisoformat(formatted['timestamp'])
+                    dt = formatted['timestamp']
+                    if not isinstance(dt, datetime):
+                        dt = datetime.fromisoformat(dt)
                     time_str = dt.strftime("%d/%m/%Y %H:%M")
                 except:
                     time_str = formatted['timestamp']
@@ -214,7 +228,8 @@ class CollaborationHub:
 # ==================== HELPER FUNCTIONS ====================
 
 def render_collaboration_tab(project_id: int, project: dict, 
-                            database, current_user: str = "Current User"):
+                            database, current_user: str = "Current User",
+                            bundle=None):
     """
     Main function to render collaboration tab in app
     
@@ -223,9 +238,10 @@ def render_collaboration_tab(project_id: int, project: dict,
         project: Project dict
         database: ProjectDatabase instance
         current_user: Current user name
+        bundle: ProjectBundle preloaded by the project page (optional)
     """
     # Initialize collaboration hub
-    hub = CollaborationHub(database)
+    hub = CollaborationHub(database, bundle)
     
     # Render interface
     hub.render(project_id, project, current_user)
@@ -347,79 +363,43 @@ def setup_notification_scheduler(database):
         return None
 
 
-def check_deadlines_and_notify(database):
+def check_deadlines_and_notify(database, dry_run=False, days=None):
     """
-    Check all tasks for upcoming deadlines and send reminders
+    Send reminders for tasks due in 7, 3 or 1 days
+    The whole batch comes from one query (ProjectDatabase.get_deadline_reminders);
+    each reminder is recorded once and every person gets one digest email
     
     Args:
         database: ProjectDatabase instance
+        dry_run: Only build the batch and report its size, send nothing
+        days: Days before the deadline (default: collaboration config 'deadline_reminders')
+    
+    Returns:
+        Dict with batch size, recorded / suppressed reminders, digests sent and seconds taken
     """
+    report = {'dry_run': dry_run, 'reminders': 0, 'recorded': 0, 'suppressed': 0, 'sent': 0,
+              'query_seconds': 0.0, 'seconds': 0.0}
+    started = time.perf_counter()
     try:
-        from datetime import date, timedelta
-        from notification_service import send_notification
+        if days is None:
+            days = get_collaboration_config().get('deadline_reminders', [7, 3, 1])
         
-        # Get all projects
-        all_projects = database.get_all_projects()
+        batch = database.get_deadline_reminders(days)
+        report['reminders'] = len(batch)
+        report['query_seconds'] = time.perf_counter() - started
         
-        for project in all_projects:
-            project_id = project.get('id')
-            project_name = project.get('project_name', 'Unknown')
-            
-            # Get tasks for project
-            tasks = database.get_tasks(project_id)
-            
-            if tasks.empty:
-                continue
-            
-            # Check each task
-            for _, task in tasks.iterrows():
-                if task.get('status') == 'Hoàn thành':
-                    continue  # Skip completed tasks
-                
-                deadline = task.get('end_date')
-                if not deadline:
-                    continue
-                
-                try:
-                    deadline_date = datetime.fromisoformat(str(deadline)).date()
-                except:
-                    continue
-                
-                today = date.today()
-                days_until_deadline = (deadline_date - today).days
-                
-                # Send reminder for 7, 3, or 1 day before
-                if days_until_deadline in [7, 3, 1]:
-                    # Get responsible person's email
-                    responsible = task.get('responsible', '')
-                    
-                    # Try to find email from team members
-                    team_members = database.get_team_members(project_id)
-                    email = None
-                    
-                    for member in team_members:
-                        if member.get('name', '').lower() == responsible.lower():
-                            email = member.get('email')
-                            break
-                    
-                    if email:
-                        # Send notification
-                        send_notification(
-                            'task_deadline',
-                            email,
-                            {
-                                'task_name': task.get('task_name', ''),
-                                'project_name': project_name,
-                                'deadline': deadline_date.strftime('%d/%m/%Y'),
-                                'days_left': days_until_deadline,
-                                'progress': task.get('progress', 0),
-                                'owner': responsible,
-                                'url': f"https://your-app-url.com/project/{project_id}"
-                            }
-                        )
+        if not dry_run:
+            report.update(record_notifications(database, deadline_notifications(batch)))
+            report['sent'] = send_digests(database)['sent']
     
     except Exception as e:
         print(f"Error checking deadlines: {e}")
+    
+    report['seconds'] = time.perf_counter() - started
+    print(f"Deadline reminders{' (dry run)' if dry_run else ''}: "
+          f"{report['reminders']} in batch, {report['suppressed']} already sent, "
+          f"{report['sent']} digests, {report['seconds']:.3f}s")
+    return report
 
 
 # ==================== CONFIGURATION ====================
@@ -14,7 +14,8 @@ class CommentsManager:
     Manage comments and @mentions for projects
     """
     
-    def __init__(self, database, notification_service=None, activity_tracker=None):
+    def __init__(self, database, notification_service=None, activity_tracker=None,
+                 bundle=None):
         """
         Initialize comments manager
         
@@ -22,10 +23,15 @@ class CommentsManager:
             database: ProjectDatabase instance
             notification_service: NotificationService instance (optional)
             activity_tracker: ActivityTracker instance (optional)
+            bundle: ProjectBundle preloaded by the project page (optional)
         """
         self.db = database
         self.notification_service = notification_service
         self.activity_tracker = activity_tracker
+        self.bundle = bundle
+    
+    def _has_bundle(self, project_id: int, section: str) -> bool:
+        return self.bundle is not None and self.bundle.matches(project_id, section)
     
     def add_comment(self, project_id: int, user_name: str, 
                    comment_text: str, user_email: str = None) -> bool:
@@ -51,7 +57,7 @@ class CommentsManager:
                 'user_name': user_name,
                 'user_email': user_email,
                 'comment_text': comment_text,
-                'mentions': ','.join(mentions) if mentions else None,
+                'mentions': mentions or None,
                 'created_at': datetime.now().isoformat()
             }
             
@@ -87,7 +93,10 @@ class CommentsManager:
             List of comment dicts
         """
         try:
-            comments = self.db.get_comments(project_id)
+            if self._has_bundle(project_id, 'comments'):
+                comments = self.bundle.comments
+            else:
+                comments = self.db.get_comments(project_id)
             # Convert DataFrame to list of dicts
             if comments is not None and hasattr(comments, 'to_dict'):
                 if not comments.empty:
@@ -250,7 +259,10 @@ class CommentsManager:
         """
         try:
             # FIXED: Properly handle DataFrame from get_team_members
-            team_members_df = self.db.get_team_members(project_id)
+            if self._has_bundle(project_id, 'team_members'):
+                team_members_df = self.bundle.team_members
+            else:
+                team_members_df = self.db.get_team_members(project_id)
             
             # Convert DataFrame to list of dicts if needed
             if team_members_df is not None and hasattr(team_members_df, 'to_dict'):
@@ -357,7 +369,7 @@ def render_single_comment(comment: Dict, current_user: str,
     
     # Parse timestamp
     try:
-        dt = datetime.fromisoformat(timestamp)
+        dt = timestamp if isinstance(timestamp, datetime) else datetime.fromisoformat(timestamp)
         time_str = dt.strftime("%d/%m/%Y %H:%M")
     except:
         time_str = timestamp
@@ -131,16 +131,16 @@ def create_sample_data():
     ]
     
     for project_id in project_ids[:3]:  # Thêm cho 3 dự án đầu
-        for name, role, email, phone in members_data:
-            member_data = {
-                'project_id': project_id,
+        db.bulk_add_team_members(project_id, [
+            {
                 'name': name,
                 'role': role,
                 'department': random.choice([d[0] for d in departments]),
                 'email': email,
                 'phone': phone
             }
-            db.add_team_member(member_data)
+            for name, role, email, phone in members_data
+        ])
     
     # 4. Thêm stakeholders
     print("  → Tạo stakeholders...")
@@ -151,16 +151,16 @@ def create_sample_data():
     ]
     
     for project_id in project_ids[:3]:
-        for name, role, impact, engagement in stakeholders_data:
-            stake_data = {
-                'project_id': project_id,
+        db.bulk_add_stakeholders(project_id, [
+            {
                 'name': name,
                 'role': role,
                 'department': random.choice([d[0] for d in departments]),
                 'impact_level': impact,
                 'engagement_level': engagement
             }
-            db.add_stakeholder(stake_data)
+            for name, role, impact, engagement in stakeholders_data
+        ])
     
     # 5. Thêm tasks (Gantt)
     print("  → Tạo kế hoạch...")
@@ -168,7 +168,8 @@ def create_sample_data():
     
     for project_id in project_ids[:3]:
         project = db.get_project(project_id)
-        start_date = datetime.fromisoformat(project['start_date'])
+        start_date = project['start_date']  # Timestamp (datetime64)
+        task_rows = []
         
         for i, phase in enumerate(dmaic_phases):
             phase_start = start_date + timedelta(days=i*30)
@@ -184,8 +185,7 @@ def create_sample_data():
                 task_start = phase_start + timedelta(days=j*10)
                 task_end = task_start + timedelta(days=9)
                 
-                task_data = {
-                    'project_id': project_id,
+                task_rows.append({
                     'phase': phase,
                     'task_name': task_name,
                     'start_date': task_start.date().isoformat(),
@@ -193,8 +193,9 @@ def create_sample_data():
                     'responsible': random.choice([m[0] for m in members_data]),
                     'status': random.choice(["Đang thực hiện", "Hoàn thành", "Chưa bắt đầu"]),
                     'progress': random.randint(0, 100)
-                }
-                db.add_task(task_data)
+                })
+        
+        db.bulk_add_tasks(project_id, task_rows)
     
     # 6. Thêm signoffs
     print("  → Tạo thông tin ký tên...")
@@ -277,23 +277,36 @@ def create_metrics_cards(stats_data):
         'budget_utilization': round(budget_utilization, 1)
     }
 
-def create_heatmap(projects_df):
+def create_heatmap(data):
     """
     Tạo heatmap số lượng dự án theo tháng và năm
+    data: stats_data['by_month'] (start_month, count) hoặc DataFrame dự án (start_date)
     """
-    if projects_df.empty:
+    if data.empty:
         return None
     
     # Chuyển đổi ngày
-    projects_df['start_date'] = pd.to_datetime(projects_df['start_date'])
-    projects_df['year'] = projects_df['start_date'].dt.year
-    projects_df['month'] = projects_df['start_date'].dt.month
+    if 'start_month' in data.columns:
+        months = pd.to_datetime(data['start_month'], format='%Y-%m', errors='coerce')
+        counts = data['count']
+    else:
+        months = pd.to_datetime(data['start_date'], errors='coerce')
+        counts = 1
     
     # Đếm số dự án theo tháng và năm
-    heatmap_data = projects_df.groupby(['year', 'month']).size().reset_index(name='count')
+    heatmap_data = pd.DataFrame({
+        'year': months.dt.year, 'month': months.dt.month, 'count': counts
+    }).dropna(subset=['year'])
+    
+    if heatmap_data.empty:
+        return None
+    
+    heatmap_data = heatmap_data.astype({'year': int, 'month': int})
     
-    # Pivot để tạo ma trận
-    pivot_data = heatmap_data.pivot(index='year', columns='month', values='count').fillna(0)
+    # Pivot để tạo ma trận (đủ 12 tháng)
+    pivot_data = heatmap_data.pivot_table(
+        index='year', columns='month', values='count', aggfunc='sum'
+    ).reindex(columns=range(1, 13)).fillna(0)
     
     fig = go.Figure(data=go.Heatmap(
         z=pivot_data.values,
@@ -0,0 +1,320 @@
+"""
+Data Import Module
+Import dự án, kế hoạch (task) và thành viên từ file Excel/CSV
+File được đọc theo từng khối (chunk) để không phải nạp cả file vào bộ nhớ;
+mỗi khối được kiểm tra bằng phép toán vector, dòng lỗi được báo theo số dòng
+trong file và các dòng hợp lệ được ghi trong một transaction cho mỗi khối
+"""
+
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+from sqlalchemy import String, TypeDecorator, select
+
+from database import Project, ProjectTask, TeamMember, bulk_upsert, rebuild_rollups
+
+# Rows read, validated and written per transaction
+IMPORT_CHUNK_ROWS = 5000
+# Row errors kept in the report (all of them are counted)
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_TARGETS = {
+    'projects': {'model': Project, 'label': 'Dự án', 'required': ('project_code', 'project_name'),
+                 'sheet': 'Thông tin dự án'},
+    'tasks': {'model': ProjectTask, 'label': 'Kế hoạch (task)', 'required': ('project_code', 'task_name'),
+              'sheet': 'Kế hoạch'},
+    'team_members': {'model': TeamMember, 'label': 'Thành viên', 'required': ('project_code', 'name'),
+                     'sheet': 'Thành viên'},
+}
+
+# Vietnamese headers (without diacritics, see _header_key) -> column
+COLUMN_ALIASES = {
+    'ma_du_an': 'project_code', 'ma': 'project_code',
+    'ten_du_an': 'project_name',
+    'khoa_phong': 'department', 'phong_ban': 'department', 'khoa': 'department',
+    'ngay_bat_dau': 'start_date', 'bat_dau': 'start_date',
+    'ngay_ket_thuc': 'end_date', 'ket_thuc': 'end_date', 'deadline': 'end_date',
+    'trang_thai': 'status', 'danh_muc': 'category', 'phuong_phap': 'methodology',
+    'mo_ta': 'description', 'van_de': 'problem_statement', 'muc_tieu': 'goal', 'pham_vi': 'scope',
+    'ngan_sach': 'budget', 'chi_phi_thuc_te': 'actual_cost', 'chi_phi': 'actual_cost',
+    'giai_doan': 'phase', 'cong_viec': 'task_name', 'ten_cong_viec': 'task_name', 'task': 'task_name',
+    'nguoi_phu_trach': 'responsible', 'phu_trach': 'responsible', 'tien_do': 'progress',
+    'ho_ten': 'name', 'ho_va_ten': 'name', 'ten': 'name', 'vai_tro': 'role',
+    'so_dien_thoai': 'phone', 'dien_thoai': 'phone', 'sdt': 'phone',
+}
+
+# Columns never imported (set by the database)
+SKIPPED_COLUMNS = ('id', 'created_at', 'updated_at')
+
+
+@dataclass
+class ImportReport:
+    """Result of import_file()"""
+    target: str
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    error_count: int = 0
+    errors: List[Dict] = field(default_factory=list)
+    columns: Dict[str, str] = field(default_factory=dict)
+    ignored_columns: List[str] = field(default_factory=list)
+    dry_run: bool = False
+    seconds: float = 0.0
+
+    def errors_frame(self) -> pd.DataFrame:
+        """Reported row errors (row = row number in the file, header = 1)"""
+        return pd.DataFrame(self.errors, columns=['row', 'column', 'value', 'error'])
+
+
+# ==================== READING ====================
+
+def _header_key(header) -> str:
+    """'Ngày bắt đầu' -> 'ngay_bat_dau'"""
+    text = unicodedata.normalize('NFD', str(header).strip().lower().replace('đ', 'd'))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return '_'.join(text.replace('/', ' ').replace('-', ' ').replace('_', ' ').split())
+
+
+def map_columns(headers, target: str) -> Dict[str, str]:
+    """File header -> model column for the importable headers of `target`"""
+    table = IMPORT_TARGETS[target]['model'].__table__
+    allowed = (set(table.c.keys()) | {'project_code'}) - set(SKIPPED_COLUMNS)
+    if target != 'projects':
+        allowed.discard('project_id')  # projects are referenced by project_code
+    mapping = {}
+    for header in headers:
+        key = _header_key(header)
+        column = key if key in allowed else COLUMN_ALIASES.get(key)
+        if column in allowed and column not in mapping.values():
+            mapping[header] = column
+    return mapping
+
+
+def _excel_chunks(file, sheet_name, chunk_rows) -> Iterator[pd.DataFrame]:
+    """Stream an .xlsx sheet (openpyxl read-only mode) as DataFrames of chunk_rows rows"""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name in workbook.sheetnames else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [f"column_{i}" if value is None else str(value) for i, value in enumerate(header)]
+
+        batch, numbers = [], []
+        for number, values in enumerate(rows, start=2):
+            if all(value is None or value == '' for value in values):
+                continue
+            batch.append(values[:len(header)])
+            numbers.append(number)
+            if len(batch) == chunk_rows:
+                yield pd.DataFrame(batch, columns=header, index=numbers, dtype=object)
+                batch, numbers = [], []
+        if batch:
+            yield pd.DataFrame(batch, columns=header, index=numbers, dtype=object)
+    finally:
+        workbook.close()
+
+
+def read_chunks(file, file_name: str, target: str, chunk_rows: int = IMPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Read an uploaded file in chunks
+    The index of each chunk is the row number in the file (header = 1)
+    """
+    name = file_name.lower()
+    if name.endswith('.csv'):
+        reader = pd.read_csv(file, dtype=str, keep_default_na=False, chunksize=chunk_rows,
+                             encoding='utf-8-sig', skip_blank_lines=False)
+        for chunk in reader:
+            chunk.index = chunk.index + 2
+            yield chunk[(chunk.apply(lambda column: column.str.strip()) != '').any(axis=1)].astype(object)
+    elif name.endswith('.xlsx'):
+        yield from _excel_chunks(file, IMPORT_TARGETS[target]['sheet'], chunk_rows)
+    else:
+        # .xls cannot be streamed (and holds at most 65 536 rows)
+        frame = pd.read_excel(file, dtype=object)
+        frame.index = frame.index + 2
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+
+
+# ==================== VALIDATION ====================
+
+def _present(series: pd.Series) -> pd.Series:
+    return series.notna() & (series.astype(str).str.strip() != '')
+
+
+def _parse_dates(series: pd.Series) -> pd.Series:
+    """ISO dates, Excel dates or dd/mm/yyyy (NaT when invalid)"""
+    parsed = pd.to_datetime(series, errors='coerce', format='ISO8601')
+    retry = parsed.isna() & series.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(series[retry].astype(str).str.strip(), errors='coerce', format='%d/%m/%Y')
+    return parsed
+
+
+class _ChunkErrors:
+    """Row errors of one chunk"""
+
+    def __init__(self, chunk):
+        self.chunk = chunk
+        self.invalid = pd.Series(False, index=chunk.index)
+        self.errors = []
+
+    def add(self, mask, column, message):
+        mask = mask.fillna(False).astype(bool)
+        if not mask.any():
+            return
+        self.invalid |= mask
+        for row in mask[mask].index:
+            value = self.chunk.at[row, column]
+            self.errors.append({'row': int(row), 'column': column, 'value': value, 'error': message})
+
+
+def validate_chunk(chunk: pd.DataFrame, target: str, project_ids: Dict[str, int] = None):
+    """
+    Check a chunk whose columns are model columns (vectorized, per column)
+
+    Args:
+        project_ids: project_code -> id of the referenced projects (tasks, team members)
+
+    Returns:
+        (valid rows as a DataFrame of model values, list of row errors)
+    """
+    spec = IMPORT_TARGETS[target]
+    table = spec['model'].__table__
+    errors = _ChunkErrors(chunk)
+    values = pd.DataFrame(index=chunk.index)
+
+    for column in chunk.columns:
+        raw = chunk[column]
+        present = _present(raw)
+        text = raw.where(present).astype(object).map(lambda value: str(value).strip(), na_action='ignore')
+
+        if column in spec['required']:
+            errors.add(~present, column, "Thiếu giá trị bắt buộc")
+        if column == 'project_code' and target != 'projects':
+            ids = text.map(project_ids or {})
+            errors.add(present & ids.isna(), column, "Không tìm thấy dự án")
+            values['project_id'] = ids.astype('Int64')
+            continue
+
+        column_type = table.c[column].type
+        if isinstance(column_type, TypeDecorator):
+            column_type = column_type.impl  # IsoDate -> Date
+        python_type = column_type.python_type
+        if issubclass(python_type, date):
+            parsed = _parse_dates(raw.where(present))
+            errors.add(present & parsed.isna(), column, "Ngày không hợp lệ")
+            values[column] = parsed
+        elif python_type in (int, float):
+            numbers = pd.to_numeric(text, errors='coerce')
+            errors.add(present & numbers.isna(), column, "Không phải số")
+            if column == 'progress':
+                errors.add((numbers < 0) | (numbers > 100), column, "Tiến độ phải từ 0 đến 100")
+            elif column in ('budget', 'actual_cost'):
+                errors.add(numbers < 0, column, "Không được âm")
+            if python_type is int:
+                errors.add(numbers.notna() & (numbers % 1 != 0), column, "Phải là số nguyên")
+                numbers = numbers.where(numbers % 1 == 0).astype('Int64')
+            values[column] = numbers
+        else:
+            if isinstance(column_type, String) and column_type.length:
+                errors.add(text.map(len, na_action='ignore') > column_type.length, column,
+                           f"Dài quá {column_type.length} ký tự")
+            values[column] = text
+
+    # Column defaults for empty cells (methodology = DMAIC)
+    for column in values.columns.intersection(table.c.keys()):
+        default = table.c[column].default
+        if default is not None and default.is_scalar:
+            values[column] = values[column].fillna(default.arg)
+
+    return values[~errors.invalid], sorted(errors.errors, key=lambda error: error['row'])
+
+
+def _project_ids(database, codes) -> Dict[str, int]:
+    """project_code -> id for the codes of one chunk (one query)"""
+    codes = sorted({code for code in codes if code})
+    projects = Project.__table__
+    with database.engine.connect() as conn:
+        rows = conn.execute(
+            select(projects.c.project_code, projects.c.id).where(projects.c.project_code.in_(codes))
+        ) if codes else []
+        return {code: project_id for code, project_id in rows}
+
+
+# ==================== IMPORT ====================
+
+def import_file(database, file, file_name: str, target: str, upsert: bool = True, dry_run: bool = False,
+                chunk_rows: int = IMPORT_CHUNK_ROWS, progress: Optional[Callable[[int], None]] = None) -> ImportReport:
+    """
+    Import an Excel/CSV file into projects, project_tasks or team_members
+
+    Rows with errors are reported and left out; the valid rows of each chunk
+    are written in one transaction (existing rows matched by project_code,
+    phase + task name or member name are updated when upsert=True)
+
+    Args:
+        database: ProjectDatabase (or CachedProjectDatabase) instance
+        file: Path or file object (Streamlit upload)
+        file_name: File name (format from the extension)
+        target: 'projects', 'tasks' or 'team_members'
+        upsert: Update existing rows instead of skipping them
+        dry_run: Validate only, write nothing
+        chunk_rows: Rows per chunk / transaction
+        progress: Called with the number of rows processed after each chunk
+
+    Raises:
+        ValueError: Unknown target or required columns missing
+    """
+    if target not in IMPORT_TARGETS:
+        raise ValueError(f"Unknown import target: {target}")
+    spec = IMPORT_TARGETS[target]
+    report = ImportReport(target=target, dry_run=dry_run)
+    started = time.perf_counter()
+
+    try:
+        for chunk in read_chunks(file, file_name, target, chunk_rows):
+            if not report.columns:
+                report.columns = map_columns(chunk.columns, target)
+                report.ignored_columns = [str(header) for header in chunk.columns if header not in report.columns]
+                missing = [column for column in spec['required'] if column not in report.columns.values()]
+                if missing:
+                    raise ValueError(f"Thiếu cột bắt buộc: {', '.join(missing)}")
+
+            chunk = chunk[list(report.columns)].rename(columns=report.columns)
+            project_ids = None
+            if target != 'projects':
+                project_ids = _project_ids(database, chunk['project_code'].dropna().astype(str).str.strip())
+
+            valid, errors = validate_chunk(chunk, target, project_ids)
+            report.rows += len(chunk)
+            report.invalid += len(chunk) - len(valid)
+            report.error_count += len(errors)
+            report.errors.extend(errors[:MAX_REPORTED_ERRORS - len(report.errors)])
+
+            if not dry_run and len(valid):
+                if target == 'projects':
+                    result = database.bulk_add_projects(valid, upsert, refresh_rollups=False)
+                else:
+                    result = bulk_upsert(database.engine, spec['model'], valid, upsert)
+                report.inserted += result['inserted']
+                report.updated += result['updated']
+                report.skipped += result['skipped']
+            if progress:
+                progress(report.rows)
+    finally:
+        if target == 'projects' and (report.inserted or report.updated):
+            rebuild_rollups(database.engine)
+        report.seconds = time.perf_counter() - started
+    return report
+
@@ -1,24 +1,102 @@
 import pandas as pd
-from datetime import datetime
-from sqlalchemy import create_engine, text, Column, Integer, String, Float, Text, ForeignKey, Boolean, JSON
+import atexit
+import hashlib
+import io
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, time as dt_time
+from sqlalchemy import create_engine, text, select, func, bindparam, and_, or_, Column, Integer, String, Float, Text, ForeignKey, Boolean, JSON, Index, UniqueConstraint, Date, DateTime, TypeDecorator, literal_column, inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert, JSONB
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.sql import Select
+from sqlalchemy.orm import sessionmaker, relationship, deferred, undefer
 import streamlit as st
 import json as json_module
+import base64
+
+from blob_store import BLOB_CHUNK_SIZE, ChunkStream, get_blob_store, iter_chunks
+from version_store import store_chunks
+from search_index import SEARCH_SOURCES, query_terms, search_entry, snippet
 
 Base = declarative_base()
 
+# ==================== DATE TYPES ====================
+
+def _to_datetime(value):
+    """datetime from a datetime/date/ISO string ('' and NaT -> None)"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return None if pd.isna(value) else value.to_pydatetime()
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, dt_time())
+    return pd.Timestamp(str(value).strip()).to_pydatetime()
+
+class IsoDate(TypeDecorator):
+    """DATE column that also accepts ISO strings, datetimes and Timestamps on writes"""
+    impl = Date
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        value = _to_datetime(value)
+        return value.date() if value is not None else None
+
+class IsoDateTime(TypeDecorator):
+    """TIMESTAMP column that also accepts ISO strings, dates and Timestamps on writes"""
+    impl = DateTime
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return _to_datetime(value)
+
+def _parse_json(value):
+    """
+    json.loads() for JSON text read back from the database (or left by older versions);
+    parsed objects and non-JSON text are returned as is. Never used on writes
+    """
+    if not isinstance(value, str):
+        return value
+    if not value.strip():
+        return None
+    try:
+        return json_module.loads(value)
+    except ValueError:
+        return value
+
+class JsonDocument(TypeDecorator):
+    """
+    JSON column (JSONB on PostgreSQL)
+    Writes take Python objects: a str is stored as a JSON string ("2024" stays
+    text, not a number); reads return Python objects
+    """
+    impl = JSON
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(JSONB(none_as_null=True))
+        return dialect.type_descriptor(JSON(none_as_null=True))
+
 # ==================== EXISTING MODELS ====================
 
 class Project(Base):
     __tablename__ = 'projects'
+    __table_args__ = (
+        Index('ix_projects_created_at', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_code = Column(String(50), unique=True, nullable=False)
     project_name = Column(Text, nullable=False)
     department = Column(String(200))
-    start_date = Column(String(20))
-    end_date = Column(String(20))
+    start_date = Column(IsoDate)
+    end_date = Column(IsoDate)
     status = Column(String(50))
     category = Column(String(100))
     methodology = Column(String(20), default='DMAIC')  # NEW: DMAIC, PDCA, PDSA
@@ -28,8 +106,8 @@ class Project(Base):
     scope = Column(Text)
     budget = Column(Float)
     actual_cost = Column(Float)
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
     
     # Relationships
     team_members = relationship("TeamMember", back_populates="project", cascade="all, delete-orphan")
@@ -40,12 +118,13 @@ class Project(Base):
     comments = relationship("ProjectComment", back_populates="project", cascade="all, delete-orphan")
     activities = relationship("ActivityLog", back_populates="project", cascade="all, delete-orphan")
     meetings = relationship("MeetingMinute", back_populates="project", cascade="all, delete-orphan")
+    action_items = relationship("ActionItem", back_populates="project", cascade="all, delete-orphan")
 
 class TeamMember(Base):
     __tablename__ = 'team_members'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
     name = Column(Text, nullable=False)
     role = Column(String(100))
     department = Column(String(200))
@@ -58,7 +137,7 @@ class Stakeholder(Base):
     __tablename__ = 'stakeholders'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
     name = Column(Text, nullable=False)
     role = Column(String(100))
     department = Column(String(200))
@@ -67,15 +146,22 @@ class Stakeholder(Base):
     
     project = relationship("Project", back_populates="stakeholders")
 
+# Status of a finished task (no deadline reminders)
+TASK_DONE_STATUS = 'Hoàn thành'
+
 class ProjectTask(Base):
     __tablename__ = 'project_tasks'
+    __table_args__ = (
+        Index('ix_project_tasks_project_start', 'project_id', 'start_date'),
+        Index('ix_project_tasks_end_date', 'end_date'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
     phase = Column(String(50))
     task_name = Column(Text, nullable=False)
-    start_date = Column(String(20))
-    end_date = Column(String(20))
+    start_date = Column(IsoDate)
+    end_date = Column(IsoDate)
     responsible = Column(String(200))
     status = Column(String(50))
     progress = Column(Integer)
@@ -86,11 +172,11 @@ class Signoff(Base):
     __tablename__ = 'signoffs'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
     role = Column(Text, nullable=False)
     name = Column(String(200))
     signature = Column(Text)
-    date = Column(String(20))
+    date = Column(IsoDate)
     notes = Column(Text)
     
     project = relationship("Project", back_populates="signoffs")
@@ -108,10 +194,10 @@ class DMAICDefine(Base):
     __tablename__ = 'dmaic_define'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
     
     # SIPOC
-    sipoc_suppliers = Column(Text)  # JSON array
+    sipoc_suppliers = Column(JsonDocument)  # JSON array
     sipoc_inputs = Column(Text)
     sipoc_process = Column(Text)
     sipoc_outputs = Column(Text)
@@ -124,63 +210,63 @@ class DMAICDefine(Base):
     charter_milestones = Column(Text)
     
     # Voice of Customer
-    voc_data = Column(Text)  # JSON array of VOC entries
+    voc_data = Column(JsonDocument)  # JSON array of VOC entries
     voc_summary = Column(Text)
     
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
 
 class DMAICMeasure(Base):
     __tablename__ = 'dmaic_measure'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
     
     # Data Collection
     data_collection_plan = Column(Text)
     data_sources = Column(Text)
     
     # Baseline Metrics
-    baseline_metrics = Column(Text)  # JSON with metrics
+    baseline_metrics = Column(JsonDocument)  # JSON with metrics
     current_state = Column(Text)
     measurement_system = Column(Text)
     
     # Process Map
-    process_map_data = Column(Text)  # JSON for flowchart
+    process_map_data = Column(JsonDocument)  # JSON for flowchart
     process_map_image = Column(Text)  # Base64 or URL
     
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
 
 class DMAICAnalyze(Base):
     __tablename__ = 'dmaic_analyze'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
     
     # Root Cause Analysis
-    fishbone_categories = Column(Text)  # JSON with categories and causes
-    five_whys_data = Column(Text)  # JSON array
+    fishbone_categories = Column(JsonDocument)  # JSON with categories and causes
+    five_whys_data = Column(JsonDocument)  # JSON array
     
     # Pareto Analysis
-    pareto_data = Column(Text)  # JSON with categories and frequencies
+    pareto_data = Column(JsonDocument)  # JSON with categories and frequencies
     pareto_chart_config = Column(Text)
     
     # Statistical Analysis
-    statistical_data = Column(Text)  # JSON with mean, median, std, etc.
+    statistical_data = Column(JsonDocument)  # JSON with mean, median, std, etc.
     analysis_summary = Column(Text)
     
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
 
 class DMAICImprove(Base):
     __tablename__ = 'dmaic_improve'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
     
     # Solution Brainstorming
-    solutions_brainstormed = Column(Text)  # JSON array
+    solutions_brainstormed = Column(JsonDocument)  # JSON array
     solutions_selected = Column(Text)
     selection_criteria = Column(Text)
     
@@ -190,39 +276,42 @@ class DMAICImprove(Base):
     pilot_test_status = Column(String(50))
     
     # Before/After Comparison
-    before_data = Column(Text)  # JSON
+    before_data = Column(JsonDocument)  # JSON
     after_data = Column(Text)
     comparison_metrics = Column(Text)
     
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
 
 class DMAICControl(Base):
     __tablename__ = 'dmaic_control'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
     
     # Control Plan
-    control_plan = Column(Text)  # JSON with control items
+    control_plan = Column(JsonDocument)  # JSON with control items
     monitoring_frequency = Column(String(50))
     responsible_person = Column(String(200))
     
     # SOPs
-    sop_documents = Column(Text)  # JSON array with SOP details
+    sop_documents = Column(JsonDocument)  # JSON array with SOP details
     sop_training_status = Column(Text)
     
     # Monitoring
-    monitoring_metrics = Column(Text)  # JSON
+    monitoring_metrics = Column(JsonDocument)  # JSON
     sustainability_plan = Column(Text)
     
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
 
 # ==================== NEW MODELS FOR FEATURE 2: PDCA/PDSA ====================
 
 class MethodologyPhase(Base):
     __tablename__ = 'methodology_phases'
+    __table_args__ = (
+        Index('ix_methodology_phases_project_order', 'project_id', 'phase_order'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
@@ -233,21 +322,24 @@ class MethodologyPhase(Base):
     # Generic fields for all methodologies
     phase_description = Column(Text)
     phase_objectives = Column(Text)
-    phase_activities = Column(Text)  # JSON array
+    phase_activities = Column(JsonDocument)  # JSON array
     phase_deliverables = Column(Text)
     phase_status = Column(String(50))  # Not Started, In Progress, Completed
-    phase_completion_date = Column(String(20))
+    phase_completion_date = Column(IsoDate)
     
     # Data storage
-    phase_data = Column(Text)  # JSON for methodology-specific data
+    phase_data = Column(JsonDocument)  # JSON for methodology-specific data
     
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
 
 # ==================== NEW MODELS FOR FEATURE 3: DOCUMENTS ====================
 
 class ProjectDocument(Base):
     __tablename__ = 'project_documents'
+    __table_args__ = (
+        Index('ix_project_documents_project_latest', 'project_id', 'is_latest', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
@@ -256,7 +348,9 @@ class ProjectDocument(Base):
     document_type = Column(String(100))  # A3, PDCA, 5S, Risk, FMEA, etc.
     document_category = Column(String(100))  # Template, Report, SOP, etc.
     file_path = Column(Text)  # For cloud storage
-    file_content = Column(Text)  # For storing small files as base64
+    # Base64 content of older versions (moved to the blob store); never loaded with the row
+    file_content = deferred(Column(Text))
+    content_hash = Column(String(64), index=True)  # SHA-256 key in the blob store
     file_size = Column(Integer)
     mime_type = Column(String(100))
     
@@ -264,11 +358,11 @@ class ProjectDocument(Base):
     version = Column(Integer, default=1)
     is_latest = Column(Boolean, default=True)
     
-    tags = Column(Text)  # JSON array for search
+    tags = Column(JsonDocument)  # JSON array for search
     description = Column(Text)
     
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
     
     project = relationship("Project", back_populates="documents")
     versions = relationship("DocumentVersion", back_populates="document", cascade="all, delete-orphan")
@@ -277,20 +371,94 @@ class DocumentVersion(Base):
     __tablename__ = 'document_versions'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    document_id = Column(Integer, ForeignKey('project_documents.id', ondelete='CASCADE'))
+    document_id = Column(Integer, ForeignKey('project_documents.id', ondelete='CASCADE'), index=True)
     
     version_number = Column(Integer, nullable=False)
-    file_content = Column(Text)
+    file_content = deferred(Column(Text))  # Base64 content of older versions (moved to the blob store)
+    content_hash = Column(String(64), index=True)  # SHA-256 key in the blob store
+    file_size = Column(Integer)
     change_description = Column(Text)
     modified_by = Column(String(200))
-    modified_at = Column(String(30))
+    modified_at = Column(IsoDateTime)
     
     document = relationship("ProjectDocument", back_populates="versions")
+    chunks = relationship("DocumentChunk", cascade="all, delete-orphan", order_by="DocumentChunk.position")
+
+class DocumentChunk(Base):
+    """Content of a document version: its chunks in order, each a blob (see version_store)"""
+    __tablename__ = 'document_chunks'
+    __table_args__ = (
+        Index('ix_document_chunks_version_position', 'version_id', 'position'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    version_id = Column(Integer, ForeignKey('document_versions.id', ondelete='CASCADE'), nullable=False)
+    position = Column(Integer, nullable=False)
+    chunk_hash = Column(String(64), nullable=False, index=True)  # SHA-256 key in the blob store
+    size = Column(Integer, nullable=False)
+
+class DocumentUpload(Base):
+    """Chunked document upload in progress: parts are blobs until it is completed"""
+    __tablename__ = 'document_uploads'
+    __table_args__ = (
+        Index('ix_document_uploads_status_updated', 'status', 'updated_at'),
+    )
+    
+    id = Column(String(32), primary_key=True)  # uuid4 hex, given to the client to resume
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
+    document_data = Column(JsonDocument)  # Metadata of the document created on completion
+    chunk_size = Column(Integer, nullable=False)
+    total_size = Column(Integer)  # None = not known up front
+    expected_sha256 = Column(String(64))
+    status = Column(String(20), default='open')  # open, completed, aborted
+    document_id = Column(Integer)
+    
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
+
+class DocumentUploadPart(Base):
+    __tablename__ = 'document_upload_parts'
+    __table_args__ = (
+        UniqueConstraint('upload_id', 'part_number', name='uq_document_upload_parts_part'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    upload_id = Column(String(32), ForeignKey('document_uploads.id', ondelete='CASCADE'), nullable=False)
+    part_number = Column(Integer, nullable=False)
+    chunk_hash = Column(String(64), nullable=False, index=True)  # SHA-256 key in the blob store
+    size = Column(Integer, nullable=False)
+
+class BlobDeletion(Base):
+    """Blob no row refers to any more, deleted by sweep_blobs() once its grace period is over"""
+    __tablename__ = 'blob_deletions'
+    
+    blob_key = Column(String(64), primary_key=True)
+    queued_at = Column(IsoDateTime)
+
+# Blobs written or reused this recently are kept even when no committed row refers to
+# them: an upload of the same content may be about to commit a row using them
+BLOB_GRACE_PERIOD = timedelta(minutes=15)
+
+# Part size of chunked uploads (every part but the last has exactly this size)
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+UPLOAD_MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Columns get_documents() may return (metadata only: contents are read with open_document_content)
+DOCUMENT_LIST_COLUMNS = (
+    'id', 'project_id', 'document_name', 'document_type', 'document_category', 'mime_type',
+    'file_size', 'version', 'is_latest', 'tags', 'description', 'uploaded_by', 'created_at', 'updated_at'
+)
+DOCUMENT_VERSION_COLUMNS = (
+    'id', 'document_id', 'version_number', 'file_size', 'change_description', 'modified_by', 'modified_at'
+)
 
 # ==================== NEW MODELS FOR FEATURE 4: COLLABORATION ====================
 
 class ProjectComment(Base):
     __tablename__ = 'project_comments'
+    __table_args__ = (
+        Index('ix_project_comments_project_created', 'project_id', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
@@ -303,17 +471,20 @@ class ProjectComment(Base):
     parent_comment_id = Column(Integer, ForeignKey('project_comments.id'))
     
     # Mentions
-    mentions = Column(Text)  # JSON array of mentioned users
+    mentions = Column(JsonDocument)  # JSON array of mentioned users
     
     # Metadata
     is_edited = Column(Boolean, default=False)
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
     
     project = relationship("Project", back_populates="comments")
 
 class ActivityLog(Base):
     __tablename__ = 'activity_log'
+    __table_args__ = (
+        Index('ix_activity_log_project_timestamp', 'project_id', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
@@ -328,12 +499,18 @@ class ActivityLog(Base):
     new_value = Column(Text)
     affected_field = Column(String(100))
     
-    timestamp = Column(String(30))
+    timestamp = Column(IsoDateTime)
     
     project = relationship("Project", back_populates="activities")
 
 class Notification(Base):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        Index('ix_notifications_project', 'project_id'),
+        Index('ix_notifications_recipient_unread', 'recipient_email', 'is_read', 'created_at'),
+        Index('ix_notifications_unsent', 'is_sent', 'recipient_email', 'created_at'),
+        Index('uq_notifications_idempotency_key', 'idempotency_key', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
@@ -347,50 +524,1501 @@ class Notification(Base):
     
     is_read = Column(Boolean, default=False)
     is_sent = Column(Boolean, default=False)
-    sent_at = Column(String(30))
+    sent_at = Column(IsoDateTime)
+    
+    # Same key = same notification (e.g. one reminder per task, deadline and day)
+    idempotency_key = Column(String(200))
     
-    created_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+
+# Rows per INSERT statement of add_notifications() (stays under the bind parameter limits)
+NOTIFICATION_INSERT_CHUNK = 500
+
+class OutboxEmail(Base):
+    """Email waiting to be sent by the background workers (see email_outbox.py)"""
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    project_id = Column(Integer)
+    notification_type = Column(String(50))
+    
+    recipient_email = Column(String(200), nullable=False)
+    subject = Column(String(500))
+    body_html = Column(Text)
+    body_text = Column(Text)
+    
+    status = Column(String(20), default='pending')  # pending, sending, sent, failed
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(IsoDateTime)
+    locked_at = Column(IsoDateTime)
+    last_error = Column(Text)
+    
+    created_at = Column(IsoDateTime)
+    sent_at = Column(IsoDateTime)
 
 class MeetingMinute(Base):
     __tablename__ = 'meeting_minutes'
+    __table_args__ = (
+        Index('ix_meeting_minutes_project_date', 'project_id', 'meeting_date'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'))
     
     meeting_title = Column(String(500), nullable=False)
-    meeting_date = Column(String(20))
+    meeting_date = Column(IsoDate)
     meeting_time = Column(String(20))
     location = Column(String(200))
     
-    attendees = Column(Text)  # JSON array
-    absent = Column(Text)  # JSON array
+    attendees = Column(JsonDocument)  # JSON array
+    absent = Column(JsonDocument)  # JSON array
     
     agenda = Column(Text)
     discussion_notes = Column(Text)
     
-    # Action Items
-    action_items = Column(Text)  # JSON array with {item, assignee, due_date, status}
+    # Action Items (legacy JSON array, moved into the action_items table by migrate_action_items)
+    action_items = Column(JsonDocument)  # JSON array with {item, assignee, due_date, status}
     
     # Decisions
-    decisions = Column(Text)  # JSON array
+    decisions = Column(JsonDocument)  # JSON array
     
     # Next meeting
-    next_meeting_date = Column(String(20))
+    next_meeting_date = Column(IsoDate)
     next_meeting_agenda = Column(Text)
     
     created_by = Column(String(200))
-    created_at = Column(String(30))
-    updated_at = Column(String(30))
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
     
     project = relationship("Project", back_populates="meetings")
 
+# Statuses of an action item that still needs work (others: Completed, Cancelled)
+OPEN_ACTION_STATUSES = ('Open', 'Not Started', 'In Progress')
+
+class ActionItem(Base):
+    __tablename__ = 'action_items'
+    __table_args__ = (
+        Index('ix_action_items_project_status_due', 'project_id', 'status', 'due_date'),
+        Index('ix_action_items_assignee_status_due', 'assigned_to', 'status', 'due_date'),
+        Index('ix_action_items_status_due', 'status', 'due_date'),
+        Index('ix_action_items_meeting', 'meeting_id'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    meeting_id = Column(Integer, ForeignKey('meeting_minutes.id', ondelete='CASCADE'))
+    
+    item_description = Column(Text, nullable=False)
+    assigned_to = Column(String(200))
+    due_date = Column(IsoDate)
+    status = Column(String(50), default='Open')  # Open, Not Started, In Progress, Completed, Cancelled
+    priority = Column(String(20), default='Medium')  # High, Medium, Low
+    notes = Column(Text)
+    
+    created_at = Column(IsoDateTime)
+    updated_at = Column(IsoDateTime)
+    
+    project = relationship("Project", back_populates="action_items")
+
+# ==================== DASHBOARD ROLLUPS ====================
+
+class ProjectRollup(Base):
+    """
+    Project counts and budget sums per (status, category, department, start month)
+    Kept up to date by add_project/update_project/delete_project
+    """
+    __tablename__ = 'project_rollups'
+    __table_args__ = (
+        UniqueConstraint('status', 'category', 'department', 'start_month', name='uq_project_rollups_group'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # '' = không có giá trị (NULL không dùng được trong khóa duy nhất)
+    status = Column(String(50), nullable=False, default='')
+    category = Column(String(100), nullable=False, default='')
+    department = Column(String(200), nullable=False, default='')
+    start_month = Column(String(7), nullable=False, default='')  # YYYY-MM
+    project_count = Column(Integer, nullable=False, default=0)
+    total_budget = Column(Float, nullable=False, default=0)
+    total_cost = Column(Float, nullable=False, default=0)
+
+class SearchDocument(Base):
+    """
+    Full-text search entry of a project, comment, meeting, document or activity
+    (see search_index.py); kept up to date by the write methods
+    PostgreSQL adds a generated tsvector column with a GIN index, SQLite an FTS5 table
+    """
+    __tablename__ = 'search_documents'
+    __table_args__ = (
+        UniqueConstraint('entity_type', 'entity_id', name='uq_search_documents_entity'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), index=True)
+    
+    title = Column(Text)  # Shown in results
+    body = Column(Text)  # Snippets are cut from it
+    title_folded = Column(Text)  # Without diacritics (indexed)
+    body_folded = Column(Text)
+    
+    updated_at = Column(IsoDateTime)
+
+class SchemaMigration(Base):
+    """Data migrations already applied (each one runs once, not on every start)"""
+    __tablename__ = 'schema_migrations'
+    
+    name = Column(String(200), primary_key=True)
+    completed_at = Column(IsoDateTime)
+
+class LegacyValue(Base):
+    """
+    Values of older versions a migration could not convert (e.g. a date '2024-02-30')
+    Kept here for manual review; the migrated column holds NULL for them
+    """
+    __tablename__ = 'legacy_values'
+    __table_args__ = (
+        Index('ix_legacy_values_column', 'table_name', 'column_name'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String(100), nullable=False)
+    column_name = Column(String(100), nullable=False)
+    row_id = Column(String(100), nullable=False)
+    value = Column(Text)
+    recorded_at = Column(IsoDateTime)
+
+class TableVersion(Base):
+    """
+    Write counter of each table, bumped by triggers in the writing transaction
+    (see migrate_table_versions); get_change_fingerprint() reads it
+    """
+    __tablename__ = 'table_versions'
+    
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+# Every JSON column (parsed into Python objects by _read_frame)
+JSON_COLUMNS = {
+    column.name
+    for table in Base.metadata.tables.values()
+    for column in table.columns
+    if isinstance(column.type, JsonDocument)
+}
+
+# Every date/timestamp column: name -> True for DATE, False for TIMESTAMP
+DATE_COLUMNS = {
+    column.name: isinstance(column.type, IsoDate)
+    for table in Base.metadata.tables.values()
+    for column in table.columns
+    if isinstance(column.type, (IsoDate, IsoDateTime))
+}
+
+# ==================== ENGINE REGISTRY ====================
+
+# One engine (and connection pool) per connection string, shared by every
+# Streamlit session in the process
+_ENGINES = {}
+_SCHEMA_READY = set()
+_ENGINE_LOCK = threading.RLock()
+
+# Pool settings: secrets [connections.postgresql] keys, overridden by env vars
+DEFAULT_POOL_CONFIG = {
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_timeout': 30,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+    'statement_timeout_ms': 30000,
+}
+
+POOL_ENV_VARS = {
+    'pool_size': 'LSS_DB_POOL_SIZE',
+    'max_overflow': 'LSS_DB_MAX_OVERFLOW',
+    'pool_timeout': 'LSS_DB_POOL_TIMEOUT',
+    'pool_recycle': 'LSS_DB_POOL_RECYCLE',
+    'pool_pre_ping': 'LSS_DB_POOL_PRE_PING',
+    'statement_timeout_ms': 'LSS_DB_STATEMENT_TIMEOUT_MS',
+}
+
+def _parse_pool_value(key, value):
+    if key == 'pool_pre_ping':
+        if isinstance(value, str):
+            return value.strip().lower() in ('1', 'true', 'yes', 'on')
+        return bool(value)
+    return int(value)
+
+def get_pool_config(overrides=None):
+    """
+    Get connection pool settings
+    Priority: overrides > environment variables > Streamlit secrets > defaults
+    """
+    config = dict(DEFAULT_POOL_CONFIG)
+    
+    try:
+        secrets = st.secrets["connections"]["postgresql"]
+        for key in DEFAULT_POOL_CONFIG:
+            if key in secrets:
+                config[key] = _parse_pool_value(key, secrets[key])
+    except Exception:
+        pass
+    
+    for key, env_var in POOL_ENV_VARS.items():
+        if os.environ.get(env_var):
+            config[key] = _parse_pool_value(key, os.environ[env_var])
+    
+    for key, value in (overrides or {}).items():
+        if key in DEFAULT_POOL_CONFIG and value is not None:
+            config[key] = _parse_pool_value(key, value)
+    
+    return config
+
+def _engine_kwargs(connection_string, pool_config):
+    """Translate pool settings into create_engine() arguments for the dialect"""
+    kwargs = {
+        'pool_pre_ping': pool_config['pool_pre_ping'],
+        'pool_recycle': pool_config['pool_recycle'],
+    }
+    
+    if connection_string.startswith('sqlite'):
+        # SQLite uses a file lock, not a server connection limit
+        return kwargs
+    
+    kwargs.update({
+        'pool_size': pool_config['pool_size'],
+        'max_overflow': pool_config['max_overflow'],
+        'pool_timeout': pool_config['pool_timeout'],
+    })
+    
+    if connection_string.startswith('postgres') and pool_config['statement_timeout_ms']:
+        kwargs['connect_args'] = {
+            'options': f"-c statement_timeout={pool_config['statement_timeout_ms']}"
+        }
+    
+    return kwargs
+
+def get_engine(connection_string, pool_config=None):
+    """
+    Get the process-wide engine for a connection string and pool settings
+    Engines are created on first use and reused on every rerun; different
+    pool_config values get their own engine. Without pool_config, an engine
+    already open for the connection string is reused (migrations, scripts)
+    """
+    with _ENGINE_LOCK:
+        if pool_config is None:
+            for (url, _), engine in _ENGINES.items():
+                if url == connection_string:
+                    return engine
+        config = get_pool_config(pool_config)
+        key = (connection_string, tuple(sorted(config.items())))
+        engine = _ENGINES.get(key)
+        if engine is None:
+            engine = create_engine(connection_string, **_engine_kwargs(connection_string, config))
+            _ENGINES[key] = engine
+        return engine
+
+def ensure_schema(connection_string):
+    """Create all tables once per connection string (not on every rerun)"""
+    if connection_string in _SCHEMA_READY:
+        return
+    with _ENGINE_LOCK:
+        if connection_string not in _SCHEMA_READY:
+            _migrate_schema(connection_string)
+            _SCHEMA_READY.add(connection_string)
+
+def _migrate_schema(connection_string):
+    """Create missing tables, then bring tables of older versions up to date"""
+    Base.metadata.create_all(get_engine(connection_string))
+    migrate_missing_columns(connection_string)
+    migrate_date_columns(connection_string)
+    migrate_json_columns(connection_string)
+    migrate_action_items(get_engine(connection_string))
+    migrate_indexes(connection_string)
+    backfill_rollups(get_engine(connection_string))
+    migrate_search_index(connection_string)
+    migrate_table_versions(connection_string)
+
+def migrate_missing_columns(connection_string):
+    """
+    ADD COLUMN for model columns that tables created by older versions lack
+    (create_all() only creates missing tables)
+    """
+    engine = get_engine(connection_string)
+    inspector = sa_inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    quote = engine.dialect.identifier_preparer.quote
+    
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {col['name'] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or column.primary_key:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+                    ))
+            except Exception as e:
+                print(f"Column migration skipped for {table.name}.{column.name}: {e}")
+
+def _existing_model_columns(engine, names):
+    """(table, column, database type) of model columns named in `names` that exist in the database"""
+    inspector = sa_inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        db_types = {col['name']: col['type'] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in names and column.name in db_types:
+                yield table.name, column.name, db_types[column.name]
+
+# Rows converted per transaction by the date migration
+DATE_MIGRATION_BATCH = 1000
+# Non-ISO formats written by older versions / typed by users (day first)
+LEGACY_DATE_FORMATS = ('%d/%m/%Y', '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S', '%d-%m-%Y', '%d.%m.%Y')
+
+def parse_legacy_date(value):
+    """datetime of a date stored as text (ISO or dd/mm/yyyy); None if it can't be read"""
+    value = str(value).strip()
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+    except ValueError:
+        pass
+    for date_format in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+def _completed_migrations(engine):
+    with engine.connect() as conn:
+        return set(conn.scalars(select(SchemaMigration.name)))
+
+def _mark_migrated(conn, name):
+    conn.execute(SchemaMigration.__table__.insert(), {'name': name, 'completed_at': datetime.now()})
+
+def _convert_date_rows(conn, table, column, is_date, rows):
+    """
+    (row id, converted value) of (row id, text) rows; text that can't be read is
+    copied to legacy_values (once) and converted to None
+    """
+    converted, unreadable = [], []
+    for row_id, value in rows:
+        parsed = parse_legacy_date(value) if value is not None and str(value).strip() else None
+        if parsed is None and value is not None and str(value).strip():
+            unreadable.append((str(row_id), str(value)))
+        converted.append((row_id, parsed.date() if is_date and parsed is not None else parsed))
+    
+    if unreadable:
+        legacy = LegacyValue.__table__
+        recorded = set(conn.execute(
+            select(legacy.c.row_id, legacy.c.value)
+            .where(legacy.c.table_name == table, legacy.c.column_name == column,
+                   legacy.c.row_id.in_([row_id for row_id, _ in unreadable]))
+        ).tuples())
+        now = datetime.now()
+        new_rows = [
+            {'table_name': table, 'column_name': column, 'row_id': row_id, 'value': value, 'recorded_at': now}
+            for row_id, value in unreadable if (row_id, value) not in recorded
+        ]
+        if new_rows:
+            conn.execute(legacy.insert(), new_rows)
+            print(f"Date migration: {len(new_rows)} unreadable value(s) of {table}.{column} kept in legacy_values")
+    return converted
+
+def migrate_date_columns(connection_string):
+    """
+    Convert date/timestamp columns written as text by older versions (once per column)
+    ISO and dd/mm/yyyy text is converted; anything else is copied to legacy_values
+    PostgreSQL: typed shadow column filled in batches, then swapped in (online)
+    SQLite: stored text rewritten in batches to the format SQLAlchemy reads back
+    """
+    engine = get_engine(connection_string)
+    completed = _completed_migrations(engine)
+    
+    for table, column, db_type in _existing_model_columns(engine, DATE_COLUMNS):
+        name = f"dates:{table}.{column}"
+        if name in completed:
+            continue
+        is_date = DATE_COLUMNS[column]
+        try:
+            if engine.dialect.name == 'postgresql':
+                if isinstance(db_type, (String, Text)):
+                    _convert_text_column_postgresql(engine, table, column, is_date)
+            elif engine.dialect.name == 'sqlite':
+                _normalize_text_column_sqlite(engine, table, column, is_date)
+            with engine.begin() as conn:
+                _mark_migrated(conn, name)
+        except Exception as e:
+            print(f"Date migration of {table}.{column} interrupted (resumed on the next start): {e}")
+
+def _primary_key(table):
+    return list(Base.metadata.tables[table].primary_key.columns)[0].name
+
+def _convert_text_column_postgresql(engine, table, column, is_date):
+    """
+    Online conversion: ADD COLUMN <column>__typed, backfill it in batches (a trigger
+    clears it when the text value changes meanwhile), then a short locked
+    transaction converts the rows changed since, drops the text column and renames
+    the typed one. Interrupted runs resume where they stopped
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    key = _primary_key(table)
+    typed = f"{column}__typed"
+    trigger = f"lss_{table}_{column}_sync"[:63]
+    t, c, k, tc, tr = quote(table), quote(column), quote(key), quote(typed), quote(trigger)
+    
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        conn.execute(text(f"ALTER TABLE {t} ADD COLUMN IF NOT EXISTS {tc} {'DATE' if is_date else 'TIMESTAMP'}"))
+        conn.execute(text(
+            f"CREATE OR REPLACE FUNCTION {tr}() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP = 'INSERT' OR NEW.{c} IS DISTINCT FROM OLD.{c} THEN NEW.{tc} := NULL; END IF; "
+            f"RETURN NEW; END; $$ LANGUAGE plpgsql"
+        ))
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {tr} ON {t}"))
+        conn.execute(text(f"CREATE TRIGGER {tr} BEFORE INSERT OR UPDATE ON {t} FOR EACH ROW EXECUTE FUNCTION {tr}()"))
+    
+    pending = f"SELECT {k}, {c} FROM {t} WHERE {tc} IS NULL AND NULLIF(btrim({c}), '') IS NOT NULL"
+    update = text(f"UPDATE {t} SET {tc} = :value WHERE {k} = :id")
+    last_id = None
+    while True:
+        with engine.begin() as conn:
+            after = f" AND {k} > :last_id" if last_id is not None else ""
+            rows = conn.execute(text(f"{pending}{after} ORDER BY {k} LIMIT :limit"),
+                                {'last_id': last_id, 'limit': DATE_MIGRATION_BATCH}).all()
+            values = [{'id': row_id, 'value': value}
+                      for row_id, value in _convert_date_rows(conn, table, column, is_date, rows)
+                      if value is not None]
+            if values:
+                conn.execute(update, values)
+        if len(rows) < DATE_MIGRATION_BATCH:
+            break
+        last_id = rows[-1][0]
+    
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        conn.execute(text(f"LOCK TABLE {t} IN ACCESS EXCLUSIVE MODE"))
+        rows = conn.execute(text(pending)).all()  # inserted / changed during the backfill
+        values = [{'id': row_id, 'value': value}
+                  for row_id, value in _convert_date_rows(conn, table, column, is_date, rows)
+                  if value is not None]
+        if values:
+            conn.execute(update, values)
+        conn.execute(text(f"DROP TRIGGER {tr} ON {t}"))
+        conn.execute(text(f"DROP FUNCTION {tr}()"))
+        conn.execute(text(f"ALTER TABLE {t} DROP COLUMN {c}"))
+        conn.execute(text(f"ALTER TABLE {t} RENAME COLUMN {tc} TO {c}"))
+
+def _normalize_text_column_sqlite(engine, table, column, is_date):
+    """Rewrite stored text as 'YYYY-MM-DD' / 'YYYY-MM-DD HH:MM:SS', batch by batch"""
+    quote = engine.dialect.identifier_preparer.quote
+    key = _primary_key(table)
+    t, c, k = quote(table), quote(column), quote(key)
+    last_id = None
+    while True:
+        with engine.begin() as conn:
+            after = f" AND {k} > :last_id" if last_id is not None else ""
+            rows = conn.execute(
+                text(f"SELECT {k}, {c} FROM {t} WHERE {c} IS NOT NULL{after} ORDER BY {k} LIMIT :limit"),
+                {'last_id': last_id, 'limit': DATE_MIGRATION_BATCH}
+            ).all()
+            stored = dict(rows)
+            updates = []
+            for row_id, value in _convert_date_rows(conn, table, column, is_date, rows):
+                if value is not None:
+                    value = value.isoformat() if is_date else str(value)
+                if value != stored[row_id]:
+                    updates.append({'id': row_id, 'value': value})
+            if updates:
+                conn.execute(text(f"UPDATE {t} SET {c} = :value WHERE {k} = :id"), updates)
+        if len(rows) < DATE_MIGRATION_BATCH:
+            break
+        last_id = rows[-1][0]
+
+# GIN indexes (PostgreSQL only) for containment queries on JSON columns
+JSON_GIN_INDEXES = {
+    'ix_project_documents_tags_gin': ('project_documents', 'tags'),
+    'ix_project_comments_mentions_gin': ('project_comments', 'mentions'),
+}
+
+def migrate_json_columns(connection_string):
+    """
+    Convert JSON columns created as text by older versions
+    PostgreSQL: ALTER COLUMN ... TYPE JSONB (text that isn't valid JSON is kept
+    as a JSON string), then build the GIN indexes
+    SQLite: store invalid JSON text as JSON strings so reads can parse every value
+    """
+    engine = get_engine(connection_string)
+    quote = engine.dialect.identifier_preparer.quote
+    
+    for table, column, db_type in _existing_model_columns(engine, JSON_COLUMNS):
+        t, c = quote(table), quote(column)
+        try:
+            with engine.begin() as conn:
+                if engine.dialect.name == 'postgresql':
+                    if not isinstance(db_type, (String, Text)):
+                        continue
+                    conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+                    conn.execute(text(
+                        "CREATE OR REPLACE FUNCTION pg_temp.lss_try_jsonb(value text) RETURNS jsonb AS $$ "
+                        "BEGIN RETURN NULLIF(btrim(value), '')::jsonb; "
+                        "EXCEPTION WHEN others THEN RETURN to_jsonb(value); END; "
+                        "$$ LANGUAGE plpgsql IMMUTABLE"
+                    ))
+                    conn.execute(text(
+                        f"ALTER TABLE {t} ALTER COLUMN {c} TYPE JSONB USING pg_temp.lss_try_jsonb({c})"
+                    ))
+                elif engine.dialect.name == 'sqlite':
+                    conn.execute(text(f"UPDATE {t} SET {c} = NULL WHERE TRIM({c}) = ''"))
+                    conn.execute(text(
+                        f"UPDATE {t} SET {c} = json_quote({c}) WHERE {c} IS NOT NULL AND NOT json_valid({c})"
+                    ))
+        except Exception as e:
+            print(f"JSON migration skipped for {table}.{column}: {e}")
+    
+    if engine.dialect.name == 'postgresql':
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            for name, (table, column) in JSON_GIN_INDEXES.items():
+                try:
+                    conn.execute(text(
+                        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(name)} "
+                        f"ON {quote(table)} USING gin ({quote(column)} jsonb_path_ops)"
+                    ))
+                except Exception as e:
+                    print(f"GIN index {name} skipped: {e}")
+
+def _action_item_row(meeting_id, project_id, item, now):
+    """action_items row from a meeting form item / legacy JSON element ({description, owner, due_date, status})"""
+    if not isinstance(item, dict):
+        item = {'description': item}
+    description = item.get('description') or item.get('item')
+    if description is None or not str(description).strip():
+        return None
+    due_date = pd.to_datetime(item.get('due_date') or None, errors='coerce')
+    return {
+        'project_id': project_id,
+        'meeting_id': meeting_id,
+        'item_description': str(description),
+        'assigned_to': item.get('owner') or item.get('assignee') or item.get('assigned_to'),
+        'due_date': None if pd.isna(due_date) else due_date.date(),
+        'status': item.get('status') or 'Open',
+        'priority': item.get('priority') or 'Medium',
+        'notes': item.get('notes'),
+        'created_at': now,
+        'updated_at': now,
+    }
+
+def migrate_action_items(engine):
+    """
+    Move the action items of older versions (JSON arrays in
+    meeting_minutes.action_items) into the action_items table
+    Each meeting's array is cleared in the same transaction, so this runs once
+    """
+    meetings = MeetingMinute.__table__
+    try:
+        with engine.begin() as conn:
+            legacy = conn.execute(
+                select(meetings.c.id, meetings.c.project_id, meetings.c.action_items)
+                .where(meetings.c.action_items.isnot(None), meetings.c.project_id.isnot(None))
+            ).all()
+            if not legacy:
+                return
+            now = datetime.now()
+            rows = [
+                row
+                for meeting_id, project_id, items in legacy
+                for item in (items if isinstance(items, list) else [items])
+                for row in [_action_item_row(meeting_id, project_id, item, now)]
+                if row is not None
+            ]
+            if rows:
+                conn.execute(ActionItem.__table__.insert(), rows)
+            conn.execute(
+                meetings.update()
+                .where(meetings.c.id.in_([meeting_id for meeting_id, _, _ in legacy]))
+                .values(action_items=None)
+            )
+    except Exception as e:
+        print(f"Action item migration skipped: {e}")
+
+def migrate_table_versions(connection_string):
+    """
+    Write counters behind get_change_fingerprint(), for the exported tables only
+    SQLite: row-level UPDATE / DELETE triggers bump table_versions (inserts show
+    in the row count and max id, so bulk inserts pay nothing extra)
+    PostgreSQL: no triggers (a shared counter row would serialize writers), the
+    fingerprint reads the row count and transaction ids instead
+    Triggers of older versions on the other tables are dropped
+    """
+    from portfolio_export import EXPORT_TABLES  # portfolio_export imports this module
+    
+    engine = get_engine(connection_string)
+    quote = engine.dialect.identifier_preparer.quote
+    versions = TableVersion.__table__
+    exported = [name for name, _, _ in EXPORT_TABLES]
+    try:
+        with engine.begin() as conn:
+            if engine.dialect.name == 'postgresql':
+                conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+                present = conn.scalars(text(
+                    "SELECT c.relname FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid "
+                    "WHERE t.tgname = 'lss_table_version'"
+                )).all()
+                for name in present:
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS lss_table_version ON {quote(name)}"))
+                conn.execute(text("DROP FUNCTION IF EXISTS lss_bump_table_version()"))
+                conn.execute(versions.delete())
+            elif engine.dialect.name == 'sqlite':
+                for table in Base.metadata.sorted_tables:
+                    for event in ('insert', 'update', 'delete'):
+                        if table.name not in exported or event == 'insert':
+                            conn.execute(text(
+                                f"DROP TRIGGER IF EXISTS {quote(f'{table.name}_version_{event}')}"
+                            ))
+                conn.execute(versions.delete().where(versions.c.table_name.not_in(exported)))
+                known = set(conn.scalars(select(versions.c.table_name)))
+                missing = [{'table_name': name, 'version': 0} for name in exported if name not in known]
+                if missing:
+                    conn.execute(versions.insert(), missing)
+                for name in exported:
+                    for event in ('UPDATE', 'DELETE'):
+                        conn.execute(text(
+                            f"CREATE TRIGGER IF NOT EXISTS {quote(f'{name}_version_{event.lower()}')} "
+                            f"AFTER {event} ON {quote(name)} BEGIN "
+                            f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{name}'; END"
+                        ))
+    except Exception as e:
+        print(f"Table version triggers skipped: {e}")
+
+def migrate_indexes(connection_string):
+    """
+    Add declared indexes that are missing from an existing database
+    create_all() only creates indexes together with new tables; this builds
+    them on tables created by older versions (CONCURRENTLY on PostgreSQL so
+    writes are not blocked)
+    """
+    engine = get_engine(connection_string)
+    quote = engine.dialect.identifier_preparer.quote
+    concurrently = 'CONCURRENTLY ' if engine.dialect.name == 'postgresql' else ''
+    
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                columns = ', '.join(quote(column.name) for column in index.columns)
+                unique = 'UNIQUE ' if index.unique else ''
+                conn.execute(text(
+                    f"CREATE {unique}INDEX {concurrently}IF NOT EXISTS {quote(index.name)} "
+                    f"ON {quote(table.name)} ({columns})"
+                ))
+
+def dispose_engines():
+    """Close all pooled connections (called automatically on shutdown)"""
+    with _ENGINE_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+        _SCHEMA_READY.clear()
+        _SEARCH_BACKENDS.clear()
+
+def get_pool_statistics():
+    """Get pool statistics of every engine in the process (for monitoring)"""
+    stats = {}
+    with _ENGINE_LOCK:
+        for (_, config), engine in _ENGINES.items():
+            name = engine.url.render_as_string(hide_password=True)
+            if name in stats:  # same database, other pool settings
+                name = f"{name} {dict(config)}"
+            stats[name] = _pool_status(engine)
+    return stats
+
+def _pool_status(engine):
+    pool = engine.pool
+    stats = {'pool_class': type(pool).__name__, 'status': pool.status()}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
+
+atexit.register(dispose_engines)
+
+# ==================== PROJECT BUNDLE ====================
+
+DMAIC_PHASE_TABLES = {
+    'define': 'dmaic_define',
+    'measure': 'dmaic_measure',
+    'analyze': 'dmaic_analyze',
+    'improve': 'dmaic_improve',
+    'control': 'dmaic_control',
+}
+
+# Child data of the project page: section -> query (dmaic loads the 5 phase tables)
+BUNDLE_SECTIONS = {
+    'team_members': "SELECT * FROM team_members WHERE project_id = :id",
+    'stakeholders': "SELECT * FROM stakeholders WHERE project_id = :id",
+    'tasks': "SELECT * FROM project_tasks WHERE project_id = :id ORDER BY start_date",
+    'signoffs': "SELECT * FROM signoffs WHERE project_id = :id",
+    'dmaic': None,
+    'comments': "SELECT * FROM project_comments WHERE project_id = :id ORDER BY created_at DESC",
+    'activities': "SELECT * FROM activity_log WHERE project_id = :id ORDER BY timestamp DESC LIMIT 50",
+    'meetings': "SELECT * FROM meeting_minutes WHERE project_id = :id ORDER BY meeting_date DESC",
+    'action_items': """
+        SELECT a.*, m.meeting_title, m.meeting_date
+        FROM action_items a LEFT JOIN meeting_minutes m ON m.id = a.meeting_id
+        WHERE a.project_id = :id
+        ORDER BY (a.due_date IS NULL), a.due_date, a.id
+    """,
+}
+
+# Columns returned per section: model table + columns joined in by the query
+BUNDLE_SECTION_COLUMNS = {
+    'team_members': ('team_members', ()),
+    'stakeholders': ('stakeholders', ()),
+    'tasks': ('project_tasks', ()),
+    'signoffs': ('signoffs', ()),
+    'comments': ('project_comments', ()),
+    'activities': ('activity_log', ()),
+    'meetings': ('meeting_minutes', ()),
+    'action_items': ('action_items', ('meeting_title', 'meeting_date')),
+}
+
+def _bundle_parts(sections):
+    """Queries of a bundle: result name -> (SELECT, column names), the project first"""
+    def columns(table, extra=()):
+        return [column.name for column in Base.metadata.tables[table].columns] + list(extra)
+    
+    parts = {'project': ("SELECT * FROM projects WHERE id = :id", columns('projects'))}
+    for section in sections:
+        if section == 'dmaic':
+            for phase, table in DMAIC_PHASE_TABLES.items():
+                parts[f'dmaic_{phase}'] = (f"SELECT * FROM {table} WHERE project_id = :id", columns(table))
+        else:
+            table, extra = BUNDLE_SECTION_COLUMNS[section]
+            parts[section] = (BUNDLE_SECTIONS[section], columns(table, extra))
+    return parts
+
+def _bundle_sql(dialect, parts):
+    """
+    One SELECT returning every part as a JSON array of row objects, so the
+    whole bundle costs a single round trip
+    """
+    quote = dialect.identifier_preparer.quote
+    selects = []
+    for name, (sql, columns) in parts.items():
+        if dialect.name == 'postgresql':
+            rows = f"SELECT coalesce(json_agg(s), '[]'::json) FROM ({sql}) s"
+        else:
+            fields = ', '.join(
+                f"'{column}', " + (f"CASE WHEN json_valid(s.{quote(column)}) THEN json(s.{quote(column)}) "
+                                   f"ELSE s.{quote(column)} END"
+                                   if column in JSON_COLUMNS else f"s.{quote(column)}")
+                for column in columns
+            )
+            rows = f"SELECT json_group_array(json_object({fields})) FROM ({sql}) s"
+        selects.append(f"({rows}) AS {quote(name)}")
+    return "SELECT " + ",\n       ".join(selects)
+
+def _bundle_frame(rows, columns):
+    """DataFrame of one bundle part (JSON array from _bundle_sql), dates parsed"""
+    if isinstance(rows, (str, bytes)):
+        rows = json_module.loads(rows)
+    return parse_date_columns(pd.DataFrame(rows or [], columns=columns))
+
+@dataclass
+class ProjectBundle:
+    """
+    Snapshot of everything the project management page needs
+    Loaded in one query by ProjectDatabase.get_project_bundle()
+    """
+    project_id: int
+    project: dict = None
+    team_members: pd.DataFrame = field(default_factory=pd.DataFrame)
+    stakeholders: pd.DataFrame = field(default_factory=pd.DataFrame)
+    tasks: pd.DataFrame = field(default_factory=pd.DataFrame)
+    signoffs: pd.DataFrame = field(default_factory=pd.DataFrame)
+    dmaic: dict = field(default_factory=dict)  # phase -> row dict (or None)
+    comments: pd.DataFrame = field(default_factory=pd.DataFrame)
+    activities: pd.DataFrame = field(default_factory=pd.DataFrame)
+    meetings: pd.DataFrame = field(default_factory=pd.DataFrame)
+    action_items: pd.DataFrame = field(default_factory=pd.DataFrame)
+    sections: tuple = ()  # sections actually loaded
+    
+    @property
+    def methodology(self):
+        return (self.project or {}).get('methodology') or 'DMAIC'
+    
+    def matches(self, project_id, section=None):
+        """True if this bundle holds the data of project_id (and the section, if given)"""
+        return (self.project is not None and self.project_id == project_id
+                and (section is None or section in self.sections))
+
+def parse_date_columns(df, json_text=False):
+    """
+    Turn the date/timestamp columns of a query result into datetime64
+    json_text: JSON columns hold raw JSON text (text() SELECT on SQLite) to parse;
+    model queries and PostgreSQL drivers already return Python objects
+    """
+    for column in df.columns:
+        if column in DATE_COLUMNS and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], errors='coerce', format='ISO8601')
+        elif json_text and column in JSON_COLUMNS and df[column].dtype == object:
+            df[column] = df[column].map(_parse_json)
+    return df
+
+def _read_frame(conn, sql, params=None):
+    """Run a SELECT with named :params (works on PostgreSQL and SQLite), dates and JSON parsed"""
+    return parse_date_columns(pd.read_sql_query(text(sql), conn, params=params or {}),
+                              json_text=conn.dialect.name != 'postgresql')
+
+def _first_row(df):
+    """First row as a dict (NaT -> None) or None"""
+    if len(df) == 0:
+        return None
+    return {key: (None if value is pd.NaT else value) for key, value in df.iloc[0].to_dict().items()}
+
+# ==================== STATISTICS ====================
+
+STATISTICS_FACETS = ('status', 'category', 'department')
+
+# All facets in one grouped query: facet | facet_value | count | total_budget | total_cost
+STATISTICS_SQL = {
+    'postgresql': """
+        SELECT CASE WHEN GROUPING(status) = 0 THEN 'status'
+                    WHEN GROUPING(category) = 0 THEN 'category'
+                    WHEN GROUPING(department) = 0 THEN 'department'
+                    ELSE 'total' END AS facet,
+               COALESCE(status, category, department) AS facet_value,
+               COUNT(*) AS count,
+               SUM(budget) AS total_budget,
+               SUM(actual_cost) AS total_cost
+        FROM projects
+        GROUP BY GROUPING SETS ((status), (category), (department), ())
+    """,
+    # SQLite has no GROUPING SETS: same result shape with UNION ALL
+    'default': " UNION ALL ".join(
+        ["SELECT 'total' AS facet, NULL AS facet_value, COUNT(*) AS count, "
+         "SUM(budget) AS total_budget, SUM(actual_cost) AS total_cost FROM projects"] +
+        [f"SELECT '{facet}', {facet}, COUNT(*), SUM(budget), SUM(actual_cost) "
+         f"FROM projects GROUP BY {facet}" for facet in STATISTICS_FACETS]
+    ),
+}
+
+def compute_statistics(conn):
+    """
+    Project statistics from a single grouped query
+    
+    Returns:
+        Dict with total_projects (int), by_status/by_category/by_department
+        (DataFrames <facet>, count) and budget_stats (total_budget, total_cost)
+    """
+    dialect = conn.engine.dialect.name
+    grouped = pd.read_sql_query(text(STATISTICS_SQL.get(dialect, STATISTICS_SQL['default'])), conn)
+    grouped['count'] = grouped['count'].astype('int64')
+    
+    stats = {}
+    for facet in STATISTICS_FACETS:
+        rows = grouped[grouped['facet'] == facet]
+        stats[f'by_{facet}'] = pd.DataFrame({
+            facet: rows['facet_value'].to_numpy(),
+            'count': rows['count'].to_numpy()
+        })
+    
+    total = grouped[grouped['facet'] == 'total']
+    stats['total_projects'] = int(total['count'].iloc[0]) if len(total) else 0
+    budget = total[['total_budget', 'total_cost']].reset_index(drop=True)
+    # SUM() of no rows is NULL -> None, so callers can keep using "value or 0"
+    stats['budget_stats'] = budget.astype(object).where(budget.notna(), None)
+    return stats
+
+# ==================== DASHBOARD ROLLUPS ====================
+
+ROLLUP_DIMENSIONS = ('status', 'category', 'department')
+
+ROLLUP_REBUILD_SQL = """
+    INSERT INTO project_rollups
+        (status, category, department, start_month, project_count, total_budget, total_cost)
+    SELECT COALESCE(status, ''), COALESCE(category, ''), COALESCE(department, ''),
+           COALESCE(SUBSTR(CAST(start_date AS VARCHAR(30)), 1, 7), ''),
+           COUNT(*), COALESCE(SUM(budget), 0), COALESCE(SUM(actual_cost), 0)
+    FROM projects
+    GROUP BY 1, 2, 3, 4
+"""
+
+# INSERT ... ON CONFLICT constructs of the supported dialects
+DIALECT_INSERTS = {'postgresql': pg_insert, 'sqlite': sqlite_insert}
+
+def _amount(value):
+    return 0.0 if value is None or pd.isna(value) else float(value)
+
+def _rollup_key(project):
+    """Rollup group of a Project row: missing values become ''"""
+    key = {dim: getattr(project, dim) or '' for dim in ROLLUP_DIMENSIONS}
+    start_date = project.start_date
+    key['start_month'] = str(start_date)[:7] if start_date else ''
+    return key
+
+def _apply_rollup_delta(session, project, sign):
+    """Add (sign=1) or remove (sign=-1) a project from its rollup group, in the caller's transaction"""
+    key = _rollup_key(project)
+    insert = DIALECT_INSERTS[session.get_bind().dialect.name]
+    stmt = insert(ProjectRollup).values(
+        project_count=sign,
+        total_budget=sign * _amount(project.budget),
+        total_cost=sign * _amount(project.actual_cost),
+        **key
+    )
+    # Atomic increment, safe with concurrent writers
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={
+            'project_count': ProjectRollup.project_count + stmt.excluded.project_count,
+            'total_budget': ProjectRollup.total_budget + stmt.excluded.total_budget,
+            'total_cost': ProjectRollup.total_cost + stmt.excluded.total_cost,
+        }
+    )
+    session.execute(stmt)
+    if sign < 0:
+        session.query(ProjectRollup).filter_by(**key).filter(
+            ProjectRollup.project_count <= 0
+        ).delete(synchronize_session=False)
+
+def rebuild_rollups(engine):
+    """Recompute project_rollups from the projects table; returns the number of groups"""
+    with engine.begin() as conn:
+        if engine.dialect.name == 'postgresql':
+            # Block incremental updates while the table is rebuilt
+            conn.execute(text("LOCK TABLE project_rollups IN EXCLUSIVE MODE"))
+        conn.execute(text("DELETE FROM project_rollups"))
+        conn.execute(text(ROLLUP_REBUILD_SQL))
+        return conn.execute(text("SELECT COUNT(*) FROM project_rollups")).scalar()
+
+def backfill_rollups(engine):
+    """Fill project_rollups for databases created before the table existed"""
+    with engine.connect() as conn:
+        has_rollups = conn.execute(text("SELECT 1 FROM project_rollups LIMIT 1")).first()
+        has_projects = conn.execute(text("SELECT 1 FROM projects LIMIT 1")).first()
+    if has_projects and not has_rollups:
+        rebuild_rollups(engine)
+
+def rollup_statistics(rollups):
+    """
+    Dashboard statistics from project_rollups rows (O(groups), not O(projects))
+    
+    Returns:
+        Same dict as compute_statistics() plus by_month (start_month, count)
+    """
+    stats = {}
+    for dim in ROLLUP_DIMENSIONS + ('start_month',):
+        grouped = rollups.groupby(dim, sort=False)['project_count'].sum()
+        frame = pd.DataFrame({dim: grouped.index.to_numpy(), 'count': grouped.to_numpy(dtype='int64')})
+        if dim == 'start_month':
+            stats['by_month'] = frame[frame[dim] != ''].sort_values(dim).reset_index(drop=True)
+        else:
+            frame[dim] = frame[dim].replace('', None)
+            stats[f'by_{dim}'] = frame
+    
+    total = int(rollups['project_count'].sum())
+    stats['total_projects'] = total
+    stats['budget_stats'] = pd.DataFrame([{
+        'total_budget': float(rollups['total_budget'].sum()) if total else None,
+        'total_cost': float(rollups['total_cost'].sum()) if total else None,
+    }])
+    return stats
+
+# ==================== PROJECT LISTING ====================
+
+# Columns list_projects() may return (the large Text columns are left out)
+PROJECT_LIST_COLUMNS = (
+    'id', 'project_code', 'project_name', 'methodology', 'department', 'category',
+    'status', 'start_date', 'end_date', 'budget', 'actual_cost', 'created_at', 'updated_at'
+)
+PROJECT_SORT_COLUMNS = ('created_at', 'updated_at', 'project_code', 'project_name', 'start_date', 'end_date', 'status')
+PROJECT_FILTERS = ('status', 'category', 'department', 'methodology', 'search')
+
+def _encode_cursor(value, row_id):
+    if hasattr(value, 'item'):
+        value = value.item()  # numpy scalar -> Python value
+    payload = json_module.dumps([value, int(row_id)], default=str)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def _decode_cursor(cursor):
+    try:
+        value, row_id = json_module.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return value, int(row_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+def _project_filter_clauses(filters):
+    """WHERE clauses for list_projects() filters (equality, list = IN, search = code/name)"""
+    columns = Project.__table__.c
+    clauses = []
+    for name, value in (filters or {}).items():
+        if name not in PROJECT_FILTERS:
+            raise ValueError(f"Unknown project filter: {name}")
+        if value is None or value == '' or value == []:
+            continue
+        if name == 'search':
+            pattern = f"%{value.strip()}%"
+            clauses.append(or_(columns.project_code.ilike(pattern), columns.project_name.ilike(pattern)))
+        elif isinstance(value, (list, tuple, set)):
+            clauses.append(columns[name].in_(list(value)))
+        else:
+            clauses.append(columns[name] == value)
+    return clauses
+
+def _keyset_clause(sort_column, descending, cursor):
+    """
+    Rows after the cursor in ORDER BY (sort_column IS NULL), sort_column, id
+    (NULLs always last, both directions)
+    """
+    value, row_id = _decode_cursor(cursor)
+    id_column = Project.__table__.c.id
+    after_id = id_column < row_id if descending else id_column > row_id
+    if value is None:
+        return and_(sort_column.is_(None), after_id)
+    after_value = sort_column < value if descending else sort_column > value
+    return or_(
+        sort_column.is_(None),
+        after_value,
+        and_(sort_column == value, after_id)
+    )
+
+# ==================== JSON QUERIES ====================
+
+def _json_column(table, column):
+    """Validate (table, column) against the JSON columns of the models"""
+    model_table = Base.metadata.tables.get(table)
+    if model_table is None or column not in model_table.c or not isinstance(model_table.c[column].type, JsonDocument):
+        raise ValueError(f"Not a JSON column: {table}.{column}")
+    return model_table
+
+def _json_array_items_query(dialect, table, column, match=None, exclude=None, project_id=None, parent_columns=('id',)):
+    """
+    SELECT for the elements of a JSON array column, one row per element
+    match: {key: value} every element field must equal; exclude: {key: value}
+    no element field may equal (a missing field never counts as equal)
+    """
+    model_table = _json_column(table, column)
+    for name in parent_columns:
+        if name not in model_table.c:
+            raise ValueError(f"Unknown column: {table}.{name}")
+    match, exclude = match or {}, exclude or {}
+    
+    selected = ', '.join(f't.{name}' for name in parent_columns)
+    params, where = {}, []
+    if project_id is not None:
+        if 'project_id' not in model_table.c:
+            raise ValueError(f"{table} has no project_id")
+        where.append('t.project_id = :project_id')
+        params['project_id'] = project_id
+    
+    if dialect == 'postgresql':
+        source = (
+            f"CROSS JOIN LATERAL jsonb_array_elements(CASE WHEN jsonb_typeof(t.{column}) = 'array' "
+            f"THEN t.{column} ELSE '[]'::jsonb END) WITH ORDINALITY AS e(value, position)"
+        )
+        if match:
+            # The row-level containment can use the GIN index (jsonb_path_ops)
+            where.append(f't.{column} @> CAST(:match_array AS jsonb)')
+            where.append('e.value @> CAST(:match AS jsonb)')
+            params['match_array'] = json_module.dumps([match])
+            params['match'] = json_module.dumps(match)
+        for i, (key, value) in enumerate(exclude.items()):
+            where.append(f'NOT (e.value @> CAST(:exclude_{i} AS jsonb))')
+            params[f'exclude_{i}'] = json_module.dumps({key: value})
+        order = 'e.position'
+    else:
+        source = (
+            f", json_each(CASE WHEN json_type(t.{column}) = 'array' THEN t.{column} ELSE '[]' END) AS e"
+        )
+        element = "CASE WHEN e.type = 'object' THEN e.value END"
+        for i, (key, value) in enumerate(match.items()):
+            where.append(f'json_extract({element}, :match_path_{i}) = :match_{i}')
+            params[f'match_path_{i}'] = f'$."{key}"'
+            params[f'match_{i}'] = value
+        for i, (key, value) in enumerate(exclude.items()):
+            where.append(
+                f'(json_extract({element}, :exclude_path_{i}) IS NULL '
+                f'OR json_extract({element}, :exclude_path_{i}) != :exclude_{i})'
+            )
+            params[f'exclude_path_{i}'] = f'$."{key}"'
+            params[f'exclude_{i}'] = value
+        order = 'e.key'
+    
+    # SQLite: elements as JSON text (json_each gives strings unquoted)
+    item = 'e.value' if dialect == 'postgresql' else (
+        "CASE e.type WHEN 'object' THEN e.value WHEN 'array' THEN e.value "
+        "WHEN 'true' THEN 'true' WHEN 'false' THEN 'false' ELSE json_quote(e.value) END"
+    )
+    sql = f"SELECT {selected}, {item} AS item FROM {table} t {source}"
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += f' ORDER BY t.id, {order}'
+    return sql, params
+
+# ==================== FULL-TEXT SEARCH ====================
+
+# Rows per batch when (re)building the search index
+SEARCH_INDEX_BATCH = 1000
+SEARCH_RESULT_COLUMNS = ['entity_type', 'entity_id', 'project_id', 'project_code', 'project_name',
+                         'title', 'snippet', 'rank']
+
+# Database URL -> full-text backend found by _search_backend()
+_SEARCH_BACKENDS = {}
+
+SEARCH_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+    "title_folded, body_folded, content='search_documents', content_rowid='id', tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_fts(rowid, title_folded, body_folded) VALUES (new.id, new.title_folded, new.body_folded); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title_folded, body_folded) "
+    "VALUES ('delete', old.id, old.title_folded, old.body_folded); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title_folded, body_folded) "
+    "VALUES ('delete', old.id, old.title_folded, old.body_folded); "
+    "INSERT INTO search_fts(rowid, title_folded, body_folded) VALUES (new.id, new.title_folded, new.body_folded); END",
+)
+
+def migrate_search_index(connection_string):
+    """
+    Build the full-text index of search_documents
+    PostgreSQL: generated tsvector column (title weight A, body weight B) + GIN index
+    SQLite: FTS5 table synced by triggers (plain LIKE search if FTS5 is missing)
+    The index is filled from the source tables the first time
+    """
+    engine = get_engine(connection_string)
+    try:
+        if engine.dialect.name == 'postgresql':
+            with engine.begin() as conn:
+                conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+                conn.execute(text(
+                    "ALTER TABLE search_documents ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                    "GENERATED ALWAYS AS ("
+                    "setweight(to_tsvector('simple', coalesce(title_folded, '')), 'A') || "
+                    "setweight(to_tsvector('simple', coalesce(body_folded, '')), 'B')) STORED"
+                ))
+            with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                conn.execute(text(
+                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_search_documents_vector "
+                    "ON search_documents USING gin (search_vector)"
+                ))
+        elif engine.dialect.name == 'sqlite':
+            with engine.begin() as conn:
+                for statement in SEARCH_SQLITE_DDL:
+                    conn.execute(text(statement))
+    except Exception as e:
+        print(f"Full-text index skipped: {e}")
+    _SEARCH_BACKENDS.pop(str(engine.url), None)
+    
+    with engine.connect() as conn:
+        indexed = conn.execute(text("SELECT 1 FROM search_documents LIMIT 1")).first()
+    if not indexed:
+        rebuild_search_index(engine)
+
+def _search_backend(engine):
+    """
+    'tsvector', 'fts5' or 'like' (no full-text index in this database)
+    Looked up once per database, then cached (migrate_search_index() resets it)
+    """
+    key = str(engine.url)
+    backend = _SEARCH_BACKENDS.get(key)
+    if backend is None:
+        backend = _SEARCH_BACKENDS[key] = _detect_search_backend(engine)
+    return backend
+
+def _detect_search_backend(engine):
+    if engine.dialect.name == 'postgresql':
+        columns = {col['name'] for col in sa_inspect(engine).get_columns('search_documents')}
+        return 'tsvector' if 'search_vector' in columns else 'like'
+    if engine.dialect.name == 'sqlite':
+        with engine.connect() as conn:
+            found = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_fts'"
+            )).first()
+        return 'fts5' if found else 'like'
+    return 'like'
+
+def _index_search(conn, entity_type, ids):
+    """
+    (Re)index source rows of an entity type after they were written; ids whose
+    row no longer exists are removed from the index
+    conn: Connection or Session (runs in the caller's transaction)
+    """
+    table_name, project_column, title_columns, body_columns = SEARCH_SOURCES[entity_type]
+    source = Base.metadata.tables[table_name]
+    columns = [source.c[name] for name in dict.fromkeys(('id', project_column) + title_columns + body_columns)]
+    search = SearchDocument.__table__
+    now = datetime.now()
+    ids = list(ids)
+    for start in range(0, len(ids), SEARCH_INDEX_BATCH):
+        batch = ids[start:start + SEARCH_INDEX_BATCH]
+        rows = conn.execute(select(*columns).where(source.c.id.in_(batch))).mappings().all()
+        conn.execute(search.delete().where(search.c.entity_type == entity_type, search.c.entity_id.in_(batch)))
+        if rows:
+            conn.execute(search.insert(), [dict(search_entry(entity_type, row), updated_at=now) for row in rows])
+
+def _unindex_search(conn, entity_type, ids):
+    """Drop index entries of deleted rows (ids: list or a SELECT of ids)"""
+    search = SearchDocument.__table__
+    if not isinstance(ids, Select):
+        ids = list(ids)
+    conn.execute(search.delete().where(search.c.entity_type == entity_type, search.c.entity_id.in_(ids)))
+
+def rebuild_search_index(engine):
+    """Re-index every searchable row (in batches, one transaction per batch)"""
+    with engine.begin() as conn:
+        conn.execute(SearchDocument.__table__.delete())
+    for entity_type, (table_name, *_) in SEARCH_SOURCES.items():
+        source = Base.metadata.tables[table_name]
+        last_id = 0
+        while True:
+            with engine.begin() as conn:
+                ids = list(conn.scalars(
+                    select(source.c.id).where(source.c.id > last_id).order_by(source.c.id).limit(SEARCH_INDEX_BATCH)
+                ))
+                if ids:
+                    _index_search(conn, entity_type, ids)
+            if len(ids) < SEARCH_INDEX_BATCH:
+                break
+            last_id = ids[-1]
+
+def _search_query(backend, terms, project_id, entity_types, limit):
+    """SQL and params of a ranked search (rank: higher is better)"""
+    params = {'limit': limit}
+    filters = []
+    if project_id is not None:
+        filters.append("s.project_id = :project_id")
+        params['project_id'] = project_id
+    if entity_types:
+        filters.append("s.entity_type IN :entity_types")
+        params['entity_types'] = list(entity_types)
+    
+    if backend == 'tsvector':
+        params['query'] = ' & '.join(f"{term}:*" for term in terms)
+        where = ' AND '.join(["s.search_vector @@ to_tsquery('simple', :query)"] + filters)
+        sql = (
+            "SELECT s.entity_type, s.entity_id, s.project_id, s.title, s.body, "
+            "ts_rank_cd(s.search_vector, to_tsquery('simple', :query)) AS rank "
+            f"FROM search_documents s WHERE {where} ORDER BY rank DESC, s.id DESC LIMIT :limit"
+        )
+    elif backend == 'fts5':
+        params['query'] = ' AND '.join(f'"{term}"*' for term in terms)
+        where = ' AND '.join(["search_fts MATCH :query"] + filters)
+        sql = (
+            "SELECT s.entity_type, s.entity_id, s.project_id, s.title, s.body, "
+            "-bm25(search_fts, 5.0, 1.0) AS rank "
+            "FROM search_fts JOIN search_documents s ON s.id = search_fts.rowid "
+            f"WHERE {where} ORDER BY bm25(search_fts, 5.0, 1.0), s.id DESC LIMIT :limit"
+        )
+    else:
+        conditions, title_hits = [], []
+        for i, term in enumerate(terms):
+            params[f'term_{i}'] = f"%{term}%"
+            conditions.append(f"(s.title_folded LIKE :term_{i} OR s.body_folded LIKE :term_{i})")
+            title_hits.append(f"CASE WHEN s.title_folded LIKE :term_{i} THEN 1 ELSE 0 END")
+        where = ' AND '.join(conditions + filters)
+        sql = (
+            f"SELECT s.entity_type, s.entity_id, s.project_id, s.title, s.body, {' + '.join(title_hits)} AS rank "
+            f"FROM search_documents s WHERE {where} ORDER BY rank DESC, s.id DESC LIMIT :limit"
+        )
+    
+    statement = text(sql)
+    if entity_types:
+        statement = statement.bindparams(bindparam('entity_types', expanding=True))
+    return statement, params
+
+# ==================== BULK WRITES ====================
+
+# Natural key of each bulk-loaded table, within its project (matched trimmed, case-insensitive)
+BULK_NATURAL_KEYS = {
+    'projects': ('project_code',),
+    'project_tasks': ('phase', 'task_name'),
+    'team_members': ('name',),
+    'stakeholders': ('name',),
+}
+# New rows from this count on are loaded with COPY on PostgreSQL
+BULK_COPY_THRESHOLD = 5000
+# Values per IN (...) when looking up existing keys
+BULK_LOOKUP_CHUNK = 1000
+
+def _bulk_value(value):
+    """DataFrame cell -> value the DB driver accepts (NaN/NaT -> None, numpy -> Python)"""
+    if isinstance(value, (list, dict)):
+        return value
+    if hasattr(value, 'item') and not isinstance(value, pd.Timestamp):
+        value = value.item()  # numpy scalar -> Python value
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value
+
+def _bulk_rows(table, rows, **fixed):
+    """Rows (list of dicts or DataFrame) as dicts with the same columns; `fixed` values (project_id) are set here"""
+    if isinstance(rows, pd.DataFrame):
+        columns = set(rows.columns)
+    else:
+        columns = set()
+        for row in rows:
+            columns.update(row)
+    columns.discard('id')
+    columns.difference_update(fixed)
+    unknown = columns - set(table.c.keys())
+    if unknown:
+        raise ValueError(f"Unknown {table.name} columns: {', '.join(sorted(unknown))}")
+    
+    if isinstance(rows, pd.DataFrame):
+        # Vectorized cleanup: object columns hold Python values, NaN/NaT/NA -> None
+        frame = rows[sorted(columns)].astype(object)
+        frame = frame.where(frame.notna(), None)
+        return [dict(row, **fixed) for row in frame.to_dict('records')]
+    # Each dict keeps only the columns it supplies (updates must not clear the others)
+    return [
+        dict({column: _bulk_value(value) for column, value in row.items() if column in columns}, **fixed)
+        for row in rows
+    ]
+
+def _natural_key(values):
+    return tuple('' if value is None else str(value).strip().casefold() for value in values)
+
+def _copy_text(value):
+    """Value in PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+def _copy_rows(conn, table, rows):
+    """COPY ... FROM STDIN of new rows, in the caller's transaction"""
+    columns = list(rows[0])
+    types = [table.c[column].type for column in columns]
+    dialect = conn.dialect
+    buffer = io.StringIO()
+    for row in rows:
+        values = []
+        for column, column_type in zip(columns, types):
+            value = row[column]
+            if isinstance(column_type, TypeDecorator):
+                value = column_type.process_bind_param(value, dialect)
+            values.append(_copy_text(value))
+        buffer.write('\t'.join(values) + '\n')
+    buffer.seek(0)
+    
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+def _ids_by_natural_key(conn, table, key_columns, values):
+    """natural key -> id (lowest id if repeated) of the rows whose first key column is in values"""
+    ids = {}
+    values = sorted(values)
+    for start in range(0, len(values), BULK_LOOKUP_CHUNK):
+        result = conn.execute(
+            select(table.c.id, *[table.c[column] for column in key_columns])
+            .where(table.c[key_columns[0]].in_(values[start:start + BULK_LOOKUP_CHUNK]))
+            .order_by(table.c.id)
+        )
+        for row in result:
+            ids.setdefault(_natural_key(row[1:]), row[0])
+    return ids
+
+def bulk_upsert_rows(conn, table, rows, upsert=True, insert_values=None, return_ids=False):
+    """
+    bulk_upsert() in the caller's transaction, for rows prepared by _bulk_rows()
+    insert_values are set on inserted rows only (created_at)
+    return_ids: add 'ids' (inserted and updated rows) to the report, inserted
+    rows are found again by their natural keys (works after COPY too)
+    """
+    key_columns = BULK_NATURAL_KEYS[table.name]
+    if 'project_id' in table.c:
+        key_columns = ('project_id',) + key_columns
+    for row in rows:
+        for column in key_columns:
+            row.setdefault(column, None)
+    
+    # Later rows win when the batch itself repeats a key
+    by_key = {}
+    for row in rows:
+        by_key[_natural_key(row[column] for column in key_columns)] = row
+    
+    # Existing rows of the projects (or codes) in the batch
+    lookup = {row[key_columns[0]] for row in rows if row[key_columns[0]] is not None}
+    existing = _ids_by_natural_key(conn, table, key_columns, lookup)
+    
+    # Inserts get every column of the batch (one executemany); updates set only
+    # the columns each row supplied, one executemany per set of columns
+    all_columns = set().union(*rows) if rows else set()
+    new_rows, new_keys, updates = [], [], {}
+    for key, row in by_key.items():
+        if key not in existing:
+            new_rows.append(dict(dict.fromkeys(all_columns), **row, **(insert_values or {})))
+            new_keys.append(key)
+        elif upsert:
+            updates.setdefault(frozenset(row), []).append(dict(row, b_id=existing[key]))
+    
+    updated = sum(len(group) for group in updates.values())
+    report = {'inserted': len(new_rows), 'updated': updated,
+              'skipped': len(rows) - len(new_rows) - updated}
+    for group in updates.values():
+        conn.execute(table.update().where(table.c.id == bindparam('b_id')), group)
+    if new_rows:
+        if conn.dialect.name == 'postgresql' and len(new_rows) >= BULK_COPY_THRESHOLD:
+            _copy_rows(conn, table, new_rows)
+        else:
+            conn.execute(table.insert(), new_rows)
+    
+    if return_ids:
+        report['ids'] = [row['b_id'] for group in updates.values() for row in group]
+        if new_rows:
+            written = _ids_by_natural_key(
+                conn, table, key_columns,
+                {row[key_columns[0]] for row in new_rows if row[key_columns[0]] is not None}
+            )
+            report['ids'] += [written[key] for key in new_keys if key in written]
+    return report
+
+def bulk_upsert(engine, model, rows, upsert=True, insert_values=None, **fixed):
+    """
+    Write many rows in one transaction
+    Rows whose natural key (BULK_NATURAL_KEYS, within the project) already exists
+    are updated (upsert=True) or skipped; the others are inserted with one
+    executemany, or COPY on PostgreSQL for large batches
+    
+    Args:
+        fixed: Values set on every row (project_id)
+    
+    Returns:
+        dict: inserted, updated and skipped counts
+    """
+    table = model.__table__
+    rows = _bulk_rows(table, rows, **fixed)
+    with engine.begin() as conn:
+        return bulk_upsert_rows(conn, table, rows, upsert, insert_values)
+
 # ==================== DATABASE CLASS ====================
 
 class ProjectDatabase:
-    def __init__(self, connection_string=None):
+    def __init__(self, connection_string=None, init_schema=True, pool_config=None, blob_store=None):
         """
         Initialize database connection
         If connection_string is None, try to get from Streamlit secrets
+        The engine is shared process-wide; schema creation runs only once
+        pool_config overrides pool settings (see get_pool_config)
+        blob_store holds document contents (default: get_blob_store() on first use)
         """
         if connection_string is None:
             try:
@@ -401,13 +2029,28 @@ class ProjectDatabase:
                 st.error(f"Chi tiết lỗi: {str(e)}")
                 raise
         
-        self.engine = create_engine(connection_string)
+        self.connection_string = connection_string
+        self.engine = get_engine(connection_string, pool_config)
         self.Session = sessionmaker(bind=self.engine)
-        self.init_database()
+        self._blob_store = blob_store
+        if init_schema:
+            ensure_schema(connection_string)
     
     def init_database(self):
-        """Create all tables if they don't exist"""
-        Base.metadata.create_all(self.engine)
+        """Create all tables and indexes if they don't exist"""
+        with _ENGINE_LOCK:
+            _migrate_schema(self.connection_string)
+            _SCHEMA_READY.add(self.connection_string)
+    
+    def dispose(self):
+        """
+        No-op: the engine is shared by every instance and session of the process,
+        its pool is closed once by dispose_engines() at shutdown
+        """
+    
+    def get_pool_status(self):
+        """Get connection pool statistics (size, checked in/out, overflow)"""
+        return _pool_status(self.engine)
     
     def get_connection(self):
         """Get raw connection for pandas operations"""
@@ -423,6 +2066,9 @@ class ProjectDatabase:
             
             project = Project(**project_data)
             session.add(project)
+            session.flush()
+            _apply_rollup_delta(session, project, 1)
+            _index_search(session, 'project', [project.id])
             session.commit()
             project_id = project.id
             return project_id
@@ -432,12 +2078,42 @@ class ProjectDatabase:
         finally:
             session.close()
     
+    def bulk_add_projects(self, rows, upsert=True, refresh_rollups=True):
+        """
+        Add many projects in one transaction (list of dicts or DataFrame)
+        Existing projects with the same project_code are updated (upsert=True) or skipped
+        
+        Args:
+            refresh_rollups: Rebuild project_rollups afterwards (callers loading
+                             several batches rebuild once at the end)
+        
+        Returns:
+            dict: inserted, updated and skipped counts
+        """
+        now = datetime.now()
+        table = Project.__table__
+        rows = _bulk_rows(table, rows, updated_at=now)
+        with self.engine.begin() as conn:
+            report = bulk_upsert_rows(conn, table, rows, upsert, insert_values={'created_at': now},
+                                      return_ids=True)
+            _index_search(conn, 'project', report.pop('ids'))
+        if refresh_rollups and (report['inserted'] or report['updated']):
+            rebuild_rollups(self.engine)
+        return report
+    
     def update_project(self, project_id, project_data):
         session = self.Session()
         try:
             project_data['updated_at'] = datetime.now().isoformat()
             
+            project = session.get(Project, project_id)
+            if project is not None:
+                _apply_rollup_delta(session, project, -1)
             session.query(Project).filter(Project.id == project_id).update(project_data)
+            if project is not None:
+                session.refresh(project)
+                _apply_rollup_delta(session, project, 1)
+            _index_search(session, 'project', [project_id])
             session.commit()
         except Exception as e:
             session.rollback()
@@ -448,29 +2124,100 @@ class ProjectDatabase:
     def get_project(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM projects WHERE id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM projects WHERE id = :id",
+                {"id": project_id}
             )
             
-            if len(df) > 0:
-                return df.iloc[0].to_dict()
-            return None
+            return _first_row(df)
         finally:
             conn.close()
     
     def get_all_projects(self):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query("SELECT * FROM projects ORDER BY created_at DESC", conn)
+            df = _read_frame(conn, "SELECT * FROM projects ORDER BY created_at DESC")
             return df
         finally:
             conn.close()
     
+    def list_projects(self, filters=None, columns=None, sort='-created_at', limit=50, cursor=None):
+        """
+        One page of projects, using keyset pagination and column projection
+        
+        Args:
+            filters: Dict with status/category/department/methodology (value or list)
+                and search (text matched against project_code/project_name)
+            columns: Columns from PROJECT_LIST_COLUMNS (default: all of them)
+            sort: Column from PROJECT_SORT_COLUMNS, prefix '-' for descending
+            limit: Page size
+            cursor: next_cursor of the previous page (None = first page)
+        
+        Returns:
+            (DataFrame, next_cursor) - next_cursor is None on the last page
+        """
+        descending = sort.startswith('-')
+        sort_name = sort.lstrip('-')
+        if sort_name not in PROJECT_SORT_COLUMNS:
+            raise ValueError(f"Unknown sort column: {sort_name}")
+        columns = list(columns or PROJECT_LIST_COLUMNS)
+        unknown = set(columns) - set(PROJECT_LIST_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown project columns: {sorted(unknown)}")
+        
+        table = Project.__table__
+        sort_column = table.c[sort_name]
+        # id and the sort column are needed to build the next cursor
+        selected = list(dict.fromkeys(columns + ['id', sort_name]))
+        
+        clauses = _project_filter_clauses(filters)
+        if cursor:
+            clauses.append(_keyset_clause(sort_column, descending, cursor))
+        
+        query = (
+            select(*[table.c[name] for name in selected])
+            .where(*clauses)
+            .order_by(
+                sort_column.is_(None),
+                sort_column.desc() if descending else sort_column.asc(),
+                table.c.id.desc() if descending else table.c.id.asc()
+            )
+            .limit(limit + 1)
+        )
+        
+        conn = self.get_connection()
+        try:
+            df = parse_date_columns(pd.read_sql_query(query, conn))
+        finally:
+            conn.close()
+        
+        next_cursor = None
+        if len(df) > limit:
+            df = df.iloc[:limit]
+            last = df.iloc[-1]
+            value = last[sort_name]
+            next_cursor = _encode_cursor(None if pd.isna(value) else value, last['id'])
+        
+        return df[columns].reset_index(drop=True), next_cursor
+    
+    def count_projects(self, filters=None):
+        """Number of projects matching list_projects() filters"""
+        query = select(func.count()).select_from(Project.__table__).where(*_project_filter_clauses(filters))
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+    
     def delete_project(self, project_id):
         session = self.Session()
         try:
+            project = session.get(Project, project_id)
+            if project is not None:
+                _apply_rollup_delta(session, project, -1)
+            hashes = self._document_hashes(session, ProjectDocument.project_id == project_id)
+            # Explicit for SQLite, where foreign keys don't cascade: the blobs are released below
+            self._delete_document_rows(session, ProjectDocument.project_id == project_id)
+            hashes |= self._delete_upload_rows(session, DocumentUpload.project_id == project_id)
+            session.query(SearchDocument).filter(SearchDocument.project_id == project_id).delete()
             session.query(Project).filter(Project.id == project_id).delete()
             session.commit()
         except Exception as e:
@@ -478,6 +2225,41 @@ class ProjectDatabase:
             raise e
         finally:
             session.close()
+        self._release_blobs(hashes)
+    
+    def get_project_bundle(self, project_id, sections=None):
+        """
+        Load a project and its child data with a single query
+        
+        Args:
+            project_id: Project ID
+            sections: Names from BUNDLE_SECTIONS to load (default: all)
+        
+        Returns:
+            ProjectBundle (bundle.project is None if the project doesn't exist)
+        """
+        sections = BUNDLE_SECTIONS if sections is None else sections
+        parts = _bundle_parts(sections)
+        conn = self.get_connection()
+        try:
+            row = conn.execute(text(_bundle_sql(conn.dialect, parts)), {"id": project_id}).one()
+        finally:
+            conn.close()
+        
+        frames = {name: _bundle_frame(row[index], columns)
+                  for index, (name, (_, columns)) in enumerate(parts.items())}
+        bundle = ProjectBundle(project_id=project_id, project=_first_row(frames['project']))
+        if bundle.project is None:
+            return bundle
+        
+        for section in sections:
+            if section == 'dmaic':
+                bundle.dmaic = {phase: _first_row(frames[f'dmaic_{phase}']) for phase in DMAIC_PHASE_TABLES}
+            else:
+                setattr(bundle, section, frames[section])
+        bundle.sections = tuple(sections)
+        
+        return bundle
     
     # ===== TEAM MEMBERS =====
     def add_team_member(self, member_data):
@@ -492,13 +2274,23 @@ class ProjectDatabase:
         finally:
             session.close()
     
+    def bulk_add_team_members(self, project_id, rows, upsert=True):
+        """
+        Add many team members of a project in one transaction (list of dicts or DataFrame)
+        Existing team members with the same name are updated (upsert=True) or skipped
+        
+        Returns:
+            dict: inserted, updated and skipped counts
+        """
+        return bulk_upsert(self.engine, TeamMember, rows, upsert, project_id=project_id)
+    
     def get_team_members(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM team_members WHERE project_id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM team_members WHERE project_id = :id",
+                {"id": project_id}
             )
             return df
         finally:
@@ -528,13 +2320,23 @@ class ProjectDatabase:
         finally:
             session.close()
     
+    def bulk_add_stakeholders(self, project_id, rows, upsert=True):
+        """
+        Add many stakeholders of a project in one transaction (list of dicts or DataFrame)
+        Existing stakeholders with the same name are updated (upsert=True) or skipped
+        
+        Returns:
+            dict: inserted, updated and skipped counts
+        """
+        return bulk_upsert(self.engine, Stakeholder, rows, upsert, project_id=project_id)
+    
     def get_stakeholders(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM stakeholders WHERE project_id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM stakeholders WHERE project_id = :id",
+                {"id": project_id}
             )
             return df
         finally:
@@ -564,13 +2366,23 @@ class ProjectDatabase:
         finally:
             session.close()
     
+    def bulk_add_tasks(self, project_id, rows, upsert=True):
+        """
+        Add many tasks of a project in one transaction (list of dicts or DataFrame)
+        Existing tasks with the same phase, task_name are updated (upsert=True) or skipped
+        
+        Returns:
+            dict: inserted, updated and skipped counts
+        """
+        return bulk_upsert(self.engine, ProjectTask, rows, upsert, project_id=project_id)
+    
     def get_tasks(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM project_tasks WHERE project_id = %(id)s ORDER BY start_date",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM project_tasks WHERE project_id = :id ORDER BY start_date",
+                {"id": project_id}
             )
             return df
         finally:
@@ -598,6 +2410,54 @@ class ProjectDatabase:
         finally:
             session.close()
     
+    def get_deadline_reminders(self, days=(7, 3, 1), today=None):
+        """
+        Unfinished tasks due exactly `days` days from today, with the email of
+        their responsible team member, in one query (tasks ⋈ team_members ⋈ projects)
+        
+        Returns:
+            DataFrame: task_id, project_id, project_name, task_name, phase, end_date,
+            status, progress, responsible, recipient_name, recipient_email, days_left
+        """
+        today = today or date.today()
+        due_dates = {today + timedelta(days=int(offset)): int(offset) for offset in days}
+        tasks = ProjectTask.__table__
+        members = TeamMember.__table__
+        projects = Project.__table__
+        
+        query = (
+            select(
+                tasks.c.id.label('task_id'), tasks.c.project_id, projects.c.project_name,
+                tasks.c.task_name, tasks.c.phase, tasks.c.end_date, tasks.c.status,
+                tasks.c.progress, tasks.c.responsible,
+                members.c.name.label('recipient_name'), members.c.email.label('recipient_email')
+            )
+            .select_from(
+                tasks.join(projects, projects.c.id == tasks.c.project_id)
+                .join(members, and_(
+                    members.c.project_id == tasks.c.project_id,
+                    func.lower(members.c.name) == func.lower(tasks.c.responsible)
+                ))
+            )
+            .where(
+                tasks.c.end_date.in_(list(due_dates)),
+                or_(tasks.c.status.is_(None), tasks.c.status != TASK_DONE_STATUS),
+                members.c.email.isnot(None),
+                members.c.email != ''
+            )
+            .order_by(tasks.c.end_date, tasks.c.project_id, tasks.c.id, members.c.id)
+        )
+        conn = self.get_connection()
+        try:
+            df = parse_date_columns(pd.read_sql_query(query, conn))
+        finally:
+            conn.close()
+        
+        # One reminder per task (first team member with that name)
+        df = df.drop_duplicates('task_id').reset_index(drop=True)
+        df['days_left'] = [due_dates[value.date()] for value in df['end_date']]
+        return df
+    
     # ===== SIGNOFFS =====
     def add_signoff(self, signoff_data):
         session = self.Session()
@@ -614,10 +2474,10 @@ class ProjectDatabase:
     def get_signoffs(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM signoffs WHERE project_id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM signoffs WHERE project_id = :id",
+                {"id": project_id}
             )
             return df
         finally:
@@ -671,41 +2531,23 @@ class ProjectDatabase:
     def get_statistics(self):
         conn = self.get_connection()
         try:
-            # Tổng số dự án
-            total_projects = pd.read_sql_query(
-                "SELECT COUNT(*) as count FROM projects", conn
-            ).iloc[0]['count']
-            
-            # Dự án theo trạng thái
-            by_status = pd.read_sql_query(
-                "SELECT status, COUNT(*) as count FROM projects GROUP BY status", conn
-            )
-            
-            # Dự án theo danh mục
-            by_category = pd.read_sql_query(
-                "SELECT category, COUNT(*) as count FROM projects GROUP BY category", conn
-            )
-            
-            # Dự án theo phòng ban
-            by_department = pd.read_sql_query(
-                "SELECT department, COUNT(*) as count FROM projects GROUP BY department", conn
-            )
-            
-            # Tổng ngân sách
-            budget_stats = pd.read_sql_query(
-                "SELECT SUM(budget) as total_budget, SUM(actual_cost) as total_cost FROM projects", conn
-            )
-            
-            return {
-                'total_projects': total_projects,
-                'by_status': by_status,
-                'by_category': by_category,
-                'by_department': by_department,
-                'budget_stats': budget_stats
-            }
+            return compute_statistics(conn)
         finally:
             conn.close()
     
+    def get_rollup_statistics(self):
+        """Dashboard statistics from project_rollups (includes by_month for the heatmap)"""
+        conn = self.get_connection()
+        try:
+            rollups = _read_frame(conn, "SELECT * FROM project_rollups")
+            return rollup_statistics(rollups)
+        finally:
+            conn.close()
+    
+    def rebuild_project_rollups(self):
+        """Recompute project_rollups from scratch; returns the number of groups"""
+        return rebuild_rollups(self.engine)
+    
     # ==================== NEW METHODS FOR DMAIC TRACKING ====================
     
     # DMAIC Define
@@ -739,14 +2581,12 @@ class ProjectDatabase:
     def get_dmaic_define(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM dmaic_define WHERE project_id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM dmaic_define WHERE project_id = :id",
+                {"id": project_id}
             )
-            if len(df) > 0:
-                return df.iloc[0].to_dict()
-            return None
+            return _first_row(df)
         finally:
             conn.close()
     
@@ -780,14 +2620,12 @@ class ProjectDatabase:
     def get_dmaic_measure(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM dmaic_measure WHERE project_id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM dmaic_measure WHERE project_id = :id",
+                {"id": project_id}
             )
-            if len(df) > 0:
-                return df.iloc[0].to_dict()
-            return None
+            return _first_row(df)
         finally:
             conn.close()
     
@@ -821,14 +2659,12 @@ class ProjectDatabase:
     def get_dmaic_analyze(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM dmaic_analyze WHERE project_id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM dmaic_analyze WHERE project_id = :id",
+                {"id": project_id}
             )
-            if len(df) > 0:
-                return df.iloc[0].to_dict()
-            return None
+            return _first_row(df)
         finally:
             conn.close()
     
@@ -862,14 +2698,12 @@ class ProjectDatabase:
     def get_dmaic_improve(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM dmaic_improve WHERE project_id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM dmaic_improve WHERE project_id = :id",
+                {"id": project_id}
             )
-            if len(df) > 0:
-                return df.iloc[0].to_dict()
-            return None
+            return _first_row(df)
         finally:
             conn.close()
     
@@ -903,14 +2737,12 @@ class ProjectDatabase:
     def get_dmaic_control(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM dmaic_control WHERE project_id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM dmaic_control WHERE project_id = :id",
+                {"id": project_id}
             )
-            if len(df) > 0:
-                return df.iloc[0].to_dict()
-            return None
+            return _first_row(df)
         finally:
             conn.close()
     
@@ -936,10 +2768,10 @@ class ProjectDatabase:
     def get_methodology_phases(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM methodology_phases WHERE project_id = %(id)s ORDER BY phase_order",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM methodology_phases WHERE project_id = :id ORDER BY phase_order",
+                {"id": project_id}
             )
             return df
         finally:
@@ -959,15 +2791,47 @@ class ProjectDatabase:
     
     # ==================== NEW METHODS FOR DOCUMENTS ====================
     
-    def add_document(self, document_data):
+    @property
+    def blob_store(self):
+        """Store of document contents (files are kept out of the database)"""
+        if self._blob_store is None:
+            self._blob_store = get_blob_store()
+        return self._blob_store
+    
+    @blob_store.setter
+    def blob_store(self, store):
+        self._blob_store = store
+    
+    def _store_content(self, data, content):
+        """
+        Put the content in the blob store and keep only its hash and size in the row
+        content: bytes / file object / iterable of chunks; a base64 'file_content'
+        in data (older callers) is moved to the store as well
+        """
+        data = dict(data)
+        legacy = data.pop('file_content', None)
+        if content is None and legacy:
+            content = base64.b64decode(legacy)
+        if content is not None:
+            data['content_hash'], data['file_size'] = self.blob_store.put(content)
+        return data
+    
+    def add_document(self, document_data, content=None):
+        """
+        Add a document
+        content: file bytes / file object / iterable of chunks, stored in the blob store
+        """
         session = self.Session()
         try:
+            document_data = self._store_content(document_data, content)
             now = datetime.now().isoformat()
             document_data['created_at'] = now
             document_data['updated_at'] = now
             
             document = ProjectDocument(**document_data)
             session.add(document)
+            session.flush()
+            _index_search(session, 'document', [document.id])
             session.commit()
             return document.id
         except Exception as e:
@@ -976,55 +2840,613 @@ class ProjectDatabase:
         finally:
             session.close()
     
-    def get_documents(self, project_id):
+    def get_documents(self, project_id, columns=None):
+        """
+        Latest documents of a project, without their contents
+        
+        Args:
+            project_id: Project ID
+            columns: Columns from DOCUMENT_LIST_COLUMNS (default: all of them)
+        """
+        columns = list(columns or DOCUMENT_LIST_COLUMNS)
+        unknown = set(columns) - set(DOCUMENT_LIST_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown document columns: {sorted(unknown)}")
+        
+        table = ProjectDocument.__table__
+        query = (
+            select(*[table.c[name] for name in columns])
+            .where(table.c.project_id == project_id, table.c.is_latest == True)
+            .order_by(table.c.created_at.desc())
+        )
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM project_documents WHERE project_id = %(id)s AND is_latest = true ORDER BY created_at DESC",
-                conn,
-                params={"id": project_id}
-            )
-            return df
+            return parse_date_columns(pd.read_sql_query(query, conn))
         finally:
             conn.close()
     
     def get_document(self, document_id):
+        """Metadata of a document (everything but the content), or None"""
+        table = ProjectDocument.__table__
+        query = select(*[column for column in table.c if column.name != 'file_content']).where(
+            table.c.id == document_id)
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM project_documents WHERE id = %(id)s",
-                conn,
-                params={"id": document_id}
-            )
-            if len(df) > 0:
-                return df.iloc[0].to_dict()
-            return None
+            return _first_row(parse_date_columns(pd.read_sql_query(query, conn)))
         finally:
             conn.close()
     
-    def add_document_version(self, version_data):
+    def get_document_versions(self, document_id):
+        """Versions of a document, newest first, without their contents"""
+        table = DocumentVersion.__table__
+        query = (
+            select(*[table.c[name] for name in DOCUMENT_VERSION_COLUMNS])
+            .where(table.c.document_id == document_id)
+            .order_by(table.c.version_number.desc())
+        )
+        conn = self.get_connection()
+        try:
+            return parse_date_columns(pd.read_sql_query(query, conn))
+        finally:
+            conn.close()
+    
+    def add_document_version(self, version_data, content=None):
+        """
+        Add a version of a document
+        content: file bytes / file object / iterable of chunks; stored as content-defined
+        chunks, so only the parts that differ from earlier versions take new space
+        
+        Returns:
+            int: Version row ID
+        """
+        version_data = dict(version_data)
+        legacy = version_data.pop('file_content', None)
+        if content is None and legacy:
+            content = base64.b64decode(legacy)
+        
         session = self.Session()
         try:
             version = DocumentVersion(**version_data)
             session.add(version)
+            session.flush()
+            if content is not None:
+                version.file_size = self._store_version_chunks(session, version.id, content)
             session.commit()
+            return version.id
         except Exception as e:
             session.rollback()
             raise e
         finally:
             session.close()
     
+    def _store_version_chunks(self, session, version_id, content):
+        """Chunk rows of a version (chunks new to the blob store are written there); returns the size"""
+        rows = [
+            {'version_id': version_id, 'position': position, 'chunk_hash': key, 'size': size}
+            for position, (key, size, _) in enumerate(store_chunks(self.blob_store, content))
+        ]
+        if rows:
+            session.execute(DocumentChunk.__table__.insert(), rows)
+        return sum(row['size'] for row in rows)
+    
+    def iter_document_content(self, document_id, version_number=None, chunk_size=BLOB_CHUNK_SIZE):
+        """
+        Content of a document (or one of its versions) as an iterator of byte chunks
+        
+        Raises:
+            KeyError: Document / version doesn't exist
+        """
+        if version_number is None:
+            query = select(ProjectDocument.content_hash, ProjectDocument.file_content).where(
+                ProjectDocument.id == document_id)
+        else:
+            query = select(DocumentVersion.id, DocumentVersion.content_hash, DocumentVersion.file_content).where(
+                DocumentVersion.document_id == document_id,
+                DocumentVersion.version_number == version_number)
+        with self.engine.connect() as conn:
+            row = conn.execute(query).first()
+            chunk_hashes = [] if row is None or version_number is None else list(conn.scalars(
+                select(DocumentChunk.chunk_hash).where(DocumentChunk.version_id == row.id)
+                .order_by(DocumentChunk.position)))
+        if row is None:
+            raise KeyError(document_id)
+        
+        if chunk_hashes:
+            return self._iter_blobs(chunk_hashes, chunk_size)
+        if row.content_hash:
+            return self.blob_store.open_chunks(row.content_hash, chunk_size)
+        # Not migrated yet (see migrate_document_blobs)
+        return iter_chunks(base64.b64decode(row.file_content or ''), chunk_size)
+    
+    def _iter_blobs(self, keys, chunk_size):
+        for key in keys:
+            yield from self.blob_store.open_chunks(key, chunk_size)
+    
+    def open_document_content(self, document_id, version_number=None):
+        """
+        Content of a document (or one of its versions) as a binary file object,
+        read from the blob store on demand
+        
+        Raises:
+            KeyError: Document / version doesn't exist
+        """
+        chunks = self.iter_document_content(document_id, version_number)
+        return io.BufferedReader(ChunkStream(chunks), BLOB_CHUNK_SIZE)
+    
     def delete_document(self, document_id):
         session = self.Session()
         try:
-            session.query(ProjectDocument).filter(ProjectDocument.id == document_id).delete()
+            hashes = self._document_hashes(session, ProjectDocument.id == document_id)
+            self._delete_document_rows(session, ProjectDocument.id == document_id)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+        self._release_blobs(hashes)
+    
+    @staticmethod
+    def _delete_document_rows(session, document_filter):
+        """Delete the matching documents with their versions and chunk rows (SQLite doesn't cascade)"""
+        document_ids = select(ProjectDocument.id).where(document_filter)
+        version_ids = select(DocumentVersion.id).where(DocumentVersion.document_id.in_(document_ids))
+        session.query(DocumentChunk).filter(DocumentChunk.version_id.in_(version_ids)).delete(synchronize_session=False)
+        session.query(DocumentVersion).filter(DocumentVersion.document_id.in_(document_ids)).delete(synchronize_session=False)
+        _unindex_search(session, 'document', document_ids)
+        session.query(ProjectDocument).filter(document_filter).delete(synchronize_session=False)
+    
+    @staticmethod
+    def _document_hashes(session, document_filter):
+        """Blob keys of the matching documents, their versions and version chunks"""
+        document_ids = select(ProjectDocument.id).where(document_filter)
+        version_ids = select(DocumentVersion.id).where(DocumentVersion.document_id.in_(document_ids))
+        hashes = set(session.scalars(select(ProjectDocument.content_hash).where(document_filter)))
+        hashes.update(session.scalars(
+            select(DocumentVersion.content_hash).where(DocumentVersion.document_id.in_(document_ids))))
+        hashes.update(session.scalars(
+            select(DocumentChunk.chunk_hash).where(DocumentChunk.version_id.in_(version_ids)).distinct()))
+        hashes.discard(None)
+        return hashes
+    
+    def _unreferenced_blobs(self, conn, hashes):
+        """Keys of `hashes` no document, version, chunk or upload part refers to"""
+        hashes = list(hashes)
+        unused = set()
+        for start in range(0, len(hashes), BULK_LOOKUP_CHUNK):
+            batch = set(hashes[start:start + BULK_LOOKUP_CHUNK])
+            for column in (ProjectDocument.content_hash, DocumentVersion.content_hash, DocumentChunk.chunk_hash,
+                           DocumentUploadPart.chunk_hash):
+                batch -= set(conn.scalars(select(column).where(column.in_(batch)).distinct()))
+            unused |= batch
+        return unused
+    
+    def _release_blobs(self, hashes):
+        """
+        Queue blobs no row refers to any more (identical content shares one blob)
+        for deletion, then sweep the queue
+        """
+        with self.engine.begin() as conn:
+            unused = self._unreferenced_blobs(conn, hashes)
+            queued = set(conn.scalars(select(BlobDeletion.blob_key)))  # a short list
+            if unused - queued:
+                now = datetime.now()
+                conn.execute(BlobDeletion.__table__.insert(),
+                             [{'blob_key': key, 'queued_at': now} for key in unused - queued])
+        self.sweep_blobs()
+    
+    def sweep_blobs(self, grace=BLOB_GRACE_PERIOD):
+        """
+        Delete queued blobs still unreferenced and not written / reused for `grace`
+        Blobs used again are dropped from the queue; recent ones stay queued
+        
+        Returns:
+            int: Blobs deleted
+        """
+        with self.engine.connect() as conn:
+            queued = list(conn.scalars(select(BlobDeletion.blob_key)))
+        if not queued:
+            return 0
+        
+        deleted, done = 0, []
+        cutoff = time.time() - grace.total_seconds()
+        with self.engine.connect() as conn:
+            unused = self._unreferenced_blobs(conn, queued)
+        for key in queued:
+            try:
+                if key in unused:
+                    modified = self.blob_store.modified(key)
+                    if modified is not None and modified > cutoff:
+                        continue
+                    if modified is not None:
+                        self.blob_store.delete(key)
+                        deleted += 1
+                done.append(key)
+            except Exception as e:
+                print(f"Error deleting blob {key}: {e}")
+        
+        with self.engine.begin() as conn:
+            for start in range(0, len(done), BULK_LOOKUP_CHUNK):
+                conn.execute(BlobDeletion.__table__.delete().where(
+                    BlobDeletion.blob_key.in_(done[start:start + BULK_LOOKUP_CHUNK])))
+        return deleted
+    
+    def migrate_document_blobs(self, batch_size=50):
+        """
+        Move document contents of older versions out of the database:
+        base64 file_content of documents to the blob store, and version contents
+        (base64 or whole blobs) to content-defined chunks
+        Rows are processed in small batches, each committed on its own
+        
+        Returns:
+            dict: {'project_documents': rows moved, 'document_versions': rows moved}
+        """
+        moved = {'project_documents': 0, 'document_versions': 0}
+        while True:
+            session = self.Session()
+            try:
+                rows = session.query(ProjectDocument).options(undefer(ProjectDocument.file_content)).filter(
+                    ProjectDocument.file_content.isnot(None), ProjectDocument.content_hash.is_(None)
+                ).order_by(ProjectDocument.id).limit(batch_size).all()
+                for row in rows:
+                    row.content_hash, row.file_size = self.blob_store.put(base64.b64decode(row.file_content))
+                    row.file_content = None
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                raise e
+            finally:
+                session.close()
+            moved['project_documents'] += len(rows)
+            if len(rows) < batch_size:
+                break
+        
+        while True:
+            session = self.Session()
+            released = set()
+            try:
+                chunked = select(DocumentChunk.id).where(DocumentChunk.version_id == DocumentVersion.id).exists()
+                rows = session.query(DocumentVersion).options(undefer(DocumentVersion.file_content)).filter(
+                    or_(DocumentVersion.file_content.isnot(None), DocumentVersion.content_hash.isnot(None)),
+                    ~chunked
+                ).order_by(DocumentVersion.id).limit(batch_size).all()
+                for row in rows:
+                    if row.content_hash:
+                        content = self.blob_store.open_chunks(row.content_hash)
+                        released.add(row.content_hash)
+                    else:
+                        content = base64.b64decode(row.file_content)
+                    row.file_size = self._store_version_chunks(session, row.id, content)
+                    row.file_content = row.content_hash = None
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                raise e
+            finally:
+                session.close()
+            self._release_blobs(released)
+            moved['document_versions'] += len(rows)
+            if len(rows) < batch_size:
+                break
+        return moved
+    
+    # ===== CHUNKED DOCUMENT UPLOADS =====
+    def start_document_upload(self, document_data, total_size=None, sha256=None, chunk_size=UPLOAD_CHUNK_SIZE):
+        """
+        Start a chunked upload: the client then sends parts 0, 1, 2, ... of chunk_size
+        bytes (put_document_upload_part) and calls complete_document_upload
+        
+        Args:
+            document_data: Metadata of the document (project_id and document_name required)
+            total_size: File size if known (parts are checked against it)
+            sha256: SHA-256 of the whole file if known (checked on completion)
+            chunk_size: Size of every part but the last
+        
+        Returns:
+            str: Upload ID (keep it to resume after a dropped connection)
+        """
+        if not document_data.get('project_id') or not document_data.get('document_name'):
+            raise ValueError("project_id and document_name are required")
+        allowed = (set(DOCUMENT_LIST_COLUMNS) | {'file_path'}) - {'id', 'file_size'}
+        unknown = set(document_data) - allowed
+        if unknown:
+            raise ValueError(f"Unknown document columns: {sorted(unknown)}")
+        if not 0 < chunk_size <= UPLOAD_MAX_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {UPLOAD_MAX_CHUNK_SIZE}")
+        if total_size is not None and total_size < 0:
+            raise ValueError("total_size must not be negative")
+        
+        session = self.Session()
+        try:
+            now = datetime.now()
+            upload = DocumentUpload(
+                id=uuid.uuid4().hex, project_id=document_data['project_id'],
+                document_data=dict(document_data), chunk_size=chunk_size,
+                total_size=total_size, expected_sha256=sha256.lower() if sha256 else None,
+                status='open', created_at=now, updated_at=now
+            )
+            session.add(upload)
             session.commit()
+            return upload.id
         except Exception as e:
             session.rollback()
             raise e
         finally:
             session.close()
     
+    def get_document_upload(self, upload_id):
+        """
+        State of an upload, or None
+        
+        Returns:
+            dict: id, status, project_id, document_name, chunk_size, total_size,
+            received_bytes, parts (part numbers received), next_part, document_id
+        """
+        with self.engine.connect() as conn:
+            upload = conn.execute(
+                select(DocumentUpload.__table__).where(DocumentUpload.id == upload_id)
+            ).mappings().first()
+            if upload is None:
+                return None
+            parts = conn.execute(
+                select(DocumentUploadPart.part_number, DocumentUploadPart.size)
+                .where(DocumentUploadPart.upload_id == upload_id)
+                .order_by(DocumentUploadPart.part_number)
+            ).all()
+        
+        numbers = [part.part_number for part in parts]
+        next_part = next((i for i, number in enumerate(numbers) if number != i), len(numbers))
+        return {
+            'id': upload['id'],
+            'status': upload['status'],
+            'project_id': upload['project_id'],
+            'document_name': (upload['document_data'] or {}).get('document_name'),
+            'chunk_size': upload['chunk_size'],
+            'total_size': upload['total_size'],
+            'received_bytes': sum(part.size for part in parts),
+            'parts': numbers,
+            'next_part': next_part,
+            'document_id': upload['document_id'],
+        }
+    
+    def _open_upload(self, upload_id):
+        upload = self.get_document_upload(upload_id)
+        if upload is None:
+            raise KeyError(upload_id)
+        if upload['status'] != 'open':
+            raise ValueError(f"Upload {upload_id} is {upload['status']}")
+        return upload
+    
+    def put_document_upload_part(self, upload_id, part_number, data, sha256=None):
+        """
+        Store one part of an upload (sending a part again replaces it, so a client
+        that lost the connection can resend from get_document_upload()['next_part'])
+        
+        Args:
+            upload_id: Upload ID
+            part_number: 0-based part index
+            data: Part bytes (chunk_size bytes, except the last part)
+            sha256: SHA-256 of the part, if the client sends it (checked)
+        
+        Returns:
+            dict: Upload state (see get_document_upload)
+        """
+        upload = self._open_upload(upload_id)
+        chunk_size, total_size = upload['chunk_size'], upload['total_size']
+        if part_number < 0 or len(data) > chunk_size or not data:
+            raise ValueError(f"Part {part_number} must hold 1 to {chunk_size} bytes")
+        if total_size is not None:
+            last_part = max(total_size - 1, 0) // chunk_size
+            expected = chunk_size if part_number < last_part else total_size - last_part * chunk_size
+            if part_number > last_part or len(data) != expected:
+                raise ValueError(f"Part {part_number} must hold {expected if part_number <= last_part else 0} bytes")
+        
+        key = hashlib.sha256(data).hexdigest()
+        if sha256 and sha256.lower() != key:
+            raise ValueError(f"Part {part_number} checksum mismatch")
+        if not self.blob_store.touch(key):
+            self.blob_store.put(data)
+        
+        session = self.Session()
+        try:
+            part_filter = and_(DocumentUploadPart.upload_id == upload_id,
+                               DocumentUploadPart.part_number == part_number)
+            replaced = set(session.scalars(select(DocumentUploadPart.chunk_hash).where(part_filter)))
+            session.query(DocumentUploadPart).filter(part_filter).delete(synchronize_session=False)
+            session.add(DocumentUploadPart(upload_id=upload_id, part_number=part_number,
+                                           chunk_hash=key, size=len(data)))
+            session.query(DocumentUpload).filter(DocumentUpload.id == upload_id).update(
+                {'updated_at': datetime.now()}, synchronize_session=False)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+        self._release_blobs(replaced - {key})
+        return self.get_document_upload(upload_id)
+    
+    def complete_document_upload(self, upload_id):
+        """
+        Join the parts into the document's blob (streamed part by part) and create the document
+        
+        Returns:
+            int: Document ID
+        
+        Raises:
+            ValueError: Parts missing / size or SHA-256 different from the ones announced
+        """
+        upload = self._open_upload(upload_id)
+        if upload['next_part'] != len(upload['parts']):
+            raise ValueError(f"Part {upload['next_part']} is missing")
+        if upload['total_size'] is not None and upload['received_bytes'] != upload['total_size']:
+            raise ValueError(f"Received {upload['received_bytes']} of {upload['total_size']} bytes")
+        
+        with self.engine.connect() as conn:
+            row = conn.execute(select(DocumentUpload.document_data, DocumentUpload.expected_sha256)
+                               .where(DocumentUpload.id == upload_id)).first()
+            part_hashes = list(conn.scalars(
+                select(DocumentUploadPart.chunk_hash).where(DocumentUploadPart.upload_id == upload_id)
+                .order_by(DocumentUploadPart.part_number)))
+        
+        key, size = self.blob_store.put(self._iter_blobs(part_hashes, BLOB_CHUNK_SIZE))
+        if row.expected_sha256 and row.expected_sha256 != key:
+            self._release_blobs({key})
+            raise ValueError("File checksum mismatch")
+        
+        session = self.Session()
+        try:
+            now = datetime.now().isoformat()
+            document = ProjectDocument(**dict(row.document_data, content_hash=key, file_size=size,
+                                              created_at=now, updated_at=now))
+            session.add(document)
+            session.flush()
+            _index_search(session, 'document', [document.id])
+            self._delete_upload_rows(session, DocumentUpload.id == upload_id, keep_upload=True)
+            session.query(DocumentUpload).filter(DocumentUpload.id == upload_id).update(
+                {'status': 'completed', 'document_id': document.id, 'updated_at': datetime.now()},
+                synchronize_session=False)
+            session.commit()
+            document_id = document.id
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+        self._release_blobs(set(part_hashes))
+        return document_id
+    
+    def abort_document_upload(self, upload_id):
+        """Drop an upload and its parts"""
+        session = self.Session()
+        try:
+            hashes = self._delete_upload_rows(session, DocumentUpload.id == upload_id)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+        self._release_blobs(hashes)
+    
+    def expire_document_uploads(self, max_age=timedelta(days=1)):
+        """Drop uploads not completed or resumed for max_age (and finished upload records); returns the count"""
+        session = self.Session()
+        try:
+            upload_filter = DocumentUpload.updated_at < datetime.now() - max_age
+            count = session.query(DocumentUpload).filter(upload_filter).count()
+            hashes = self._delete_upload_rows(session, upload_filter)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+        self._release_blobs(hashes)
+        return count
+    
+    @staticmethod
+    def _delete_upload_rows(session, upload_filter, keep_upload=False):
+        """Delete the parts (and unless keep_upload, the matching uploads); returns the part blob keys"""
+        upload_ids = select(DocumentUpload.id).where(upload_filter)
+        part_filter = DocumentUploadPart.upload_id.in_(upload_ids)
+        hashes = set(session.scalars(select(DocumentUploadPart.chunk_hash).where(part_filter).distinct()))
+        session.query(DocumentUploadPart).filter(part_filter).delete(synchronize_session=False)
+        if not keep_upload:
+            session.query(DocumentUpload).filter(upload_filter).delete(synchronize_session=False)
+        return hashes
+    
+    def get_document_storage(self, document_id, measure=True):
+        """
+        Storage used by the versions of a document
+        
+        Args:
+            document_id: Document ID
+            measure: Also time the reconstruction of the newest version (reads it fully)
+        
+        Returns:
+            dict: versions, logical_bytes (sum of version sizes), stored_bytes (distinct
+            chunks and blobs), chunks, unique_chunks, saved_ratio, reconstruct_ms
+        """
+        with self.engine.connect() as conn:
+            versions = conn.execute(
+                select(DocumentVersion.id, DocumentVersion.version_number, DocumentVersion.file_size,
+                       DocumentVersion.content_hash)
+                .where(DocumentVersion.document_id == document_id)
+                .order_by(DocumentVersion.version_number)
+            ).all()
+            chunks = conn.execute(
+                select(DocumentChunk.chunk_hash, DocumentChunk.size)
+                .where(DocumentChunk.version_id.in_([row.id for row in versions]))
+            ).all()
+        
+        stored = dict(chunks)
+        for row in versions:
+            if row.content_hash:
+                stored[row.content_hash] = row.file_size or 0
+        logical = sum(row.file_size or 0 for row in versions)
+        stored_bytes = sum(stored.values())
+        
+        reconstruct_ms = None
+        if measure and versions:
+            started = time.perf_counter()
+            for _ in self.iter_document_content(document_id, versions[-1].version_number):
+                pass
+            reconstruct_ms = round((time.perf_counter() - started) * 1000, 1)
+        
+        return {
+            'versions': len(versions),
+            'logical_bytes': logical,
+            'stored_bytes': stored_bytes,
+            'chunks': len(chunks),
+            'unique_chunks': len({key for key, _ in chunks}),
+            'saved_ratio': round(1 - stored_bytes / logical, 4) if logical else 0.0,
+            'reconstruct_ms': reconstruct_ms,
+        }
+    
+    # ==================== FULL-TEXT SEARCH ====================
+    
+    def search(self, query, project_id=None, entity_types=None, limit=20):
+        """
+        Ranked full-text search over projects, comments, meetings, documents and activities
+        Diacritics and case are ignored; every word must match (as a word prefix)
+        
+        Args:
+            query: Text typed by the user
+            project_id: Only entries of this project
+            entity_types: Keys of SEARCH_SOURCES to search (default: all)
+            limit: Maximum results
+        
+        Returns:
+            DataFrame with SEARCH_RESULT_COLUMNS, best match first
+        """
+        terms = query_terms(query)
+        if not terms:
+            return pd.DataFrame(columns=SEARCH_RESULT_COLUMNS)
+        unknown = set(entity_types or ()) - set(SEARCH_SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown search entity types: {sorted(unknown)}")
+        
+        statement, params = _search_query(_search_backend(self.engine), terms, project_id, entity_types, limit)
+        with self.engine.connect() as conn:
+            results = pd.DataFrame(conn.execute(statement, params).mappings().all(),
+                                   columns=['entity_type', 'entity_id', 'project_id', 'title', 'body', 'rank'])
+            project_ids = [int(pid) for pid in results['project_id'].dropna().unique()]
+            projects = {
+                row.id: (row.project_code, row.project_name)
+                for row in conn.execute(select(Project.id, Project.project_code, Project.project_name)
+                                        .where(Project.id.in_(project_ids)))
+            }
+        
+        results['project_code'] = results['project_id'].map(lambda pid: projects.get(pid, (None, None))[0])
+        results['project_name'] = results['project_id'].map(lambda pid: projects.get(pid, (None, None))[1])
+        results['snippet'] = results['body'].map(lambda body: snippet(body, terms))
+        return results[SEARCH_RESULT_COLUMNS]
+    
+    def rebuild_search_index(self):
+        """Re-index every searchable row (after data was changed outside the app)"""
+        rebuild_search_index(self.engine)
+    
     # ==================== NEW METHODS FOR COLLABORATION ====================
     
     # Comments
@@ -1037,6 +3459,8 @@ class ProjectDatabase:
             
             comment = ProjectComment(**comment_data)
             session.add(comment)
+            session.flush()
+            _index_search(session, 'comment', [comment.id])
             session.commit()
             return comment.id
         except Exception as e:
@@ -1048,10 +3472,10 @@ class ProjectDatabase:
     def get_comments(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM project_comments WHERE project_id = %(id)s ORDER BY created_at DESC",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM project_comments WHERE project_id = :id ORDER BY created_at DESC",
+                {"id": project_id}
             )
             return df
         finally:
@@ -1064,6 +3488,8 @@ class ProjectDatabase:
             activity_data['timestamp'] = datetime.now().isoformat()
             activity = ActivityLog(**activity_data)
             session.add(activity)
+            session.flush()
+            _index_search(session, 'activity', [activity.id])
             session.commit()
         except Exception as e:
             session.rollback()
@@ -1074,10 +3500,10 @@ class ProjectDatabase:
     def get_activities(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM activity_log WHERE project_id = %(id)s ORDER BY timestamp DESC LIMIT 50",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM activity_log WHERE project_id = :id ORDER BY timestamp DESC LIMIT 50",
+                {"id": project_id}
             )
             return df
         finally:
@@ -1101,15 +3527,72 @@ class ProjectDatabase:
     def get_notifications(self, recipient_email):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM notifications WHERE recipient_email = %(email)s AND is_read = false ORDER BY created_at DESC",
+            df = _read_frame(
                 conn,
-                params={"email": recipient_email}
+                "SELECT * FROM notifications WHERE recipient_email = :email AND is_read = false ORDER BY created_at DESC",
+                {"email": recipient_email}
             )
             return df
         finally:
             conn.close()
     
+    def add_notifications(self, notifications):
+        """
+        Insert many notifications in one statement
+        Rows whose idempotency_key already exists are skipped
+        
+        Returns:
+            list: ids of the rows actually inserted
+        """
+        if not notifications:
+            return []
+        now = datetime.now()
+        rows = [
+            dict({'is_read': False, 'is_sent': False, 'created_at': now}, **notification)
+            for notification in notifications
+        ]
+        # A multi-row VALUES needs the same keys in every row
+        columns = set().union(*rows)
+        rows = [{column: row.get(column) for column in columns} for row in rows]
+        
+        insert = DIALECT_INSERTS[self.engine.dialect.name]
+        inserted = []
+        with self.engine.begin() as conn:
+            for start in range(0, len(rows), NOTIFICATION_INSERT_CHUNK):
+                stmt = (
+                    insert(Notification)
+                    .values(rows[start:start + NOTIFICATION_INSERT_CHUNK])
+                    .on_conflict_do_nothing(index_elements=['idempotency_key'])
+                    .returning(Notification.id)
+                )
+                inserted += [row[0] for row in conn.execute(stmt)]
+        return inserted
+    
+    def get_unsent_notifications(self, created_before=None):
+        """Notifications not emailed yet (oldest first per recipient)"""
+        notifications = Notification.__table__
+        query = (
+            select(notifications)
+            .where(notifications.c.is_sent == False, notifications.c.recipient_email.isnot(None))
+            .order_by(notifications.c.recipient_email, notifications.c.created_at, notifications.c.id)
+        )
+        if created_before is not None:
+            query = query.where(notifications.c.created_at < created_before)
+        conn = self.get_connection()
+        try:
+            return parse_date_columns(pd.read_sql_query(query, conn))
+        finally:
+            conn.close()
+    
+    def mark_notifications_sent(self, notification_ids):
+        notifications = Notification.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                notifications.update()
+                .where(notifications.c.id.in_(list(notification_ids)))
+                .values(is_sent=True, sent_at=datetime.now())
+            )
+    
     def mark_notification_read(self, notification_id):
         session = self.Session()
         try:
@@ -1125,14 +3608,21 @@ class ProjectDatabase:
     
     # Meeting Minutes
     def add_meeting(self, meeting_data):
+        """Add a meeting; an 'action_items' list is stored as rows of the action_items table"""
         session = self.Session()
         try:
             now = datetime.now().isoformat()
-            meeting_data['created_at'] = now
-            meeting_data['updated_at'] = now
+            meeting_data = dict(meeting_data, created_at=now, updated_at=now)
+            action_items = meeting_data.pop('action_items', None) or []
             
             meeting = MeetingMinute(**meeting_data)
             session.add(meeting)
+            session.flush()
+            for item in action_items:
+                row = _action_item_row(meeting.id, meeting.project_id, item, now)
+                if row is not None:
+                    session.add(ActionItem(**row))
+            _index_search(session, 'meeting', [meeting.id])
             session.commit()
             return meeting.id
         except Exception as e:
@@ -1144,10 +3634,10 @@ class ProjectDatabase:
     def get_meetings(self, project_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM meeting_minutes WHERE project_id = %(id)s ORDER BY meeting_date DESC",
+            df = _read_frame(
                 conn,
-                params={"id": project_id}
+                "SELECT * FROM meeting_minutes WHERE project_id = :id ORDER BY meeting_date DESC",
+                {"id": project_id}
             )
             return df
         finally:
@@ -1156,14 +3646,12 @@ class ProjectDatabase:
     def get_meeting(self, meeting_id):
         conn = self.get_connection()
         try:
-            df = pd.read_sql_query(
-                "SELECT * FROM meeting_minutes WHERE id = %(id)s",
+            df = _read_frame(
                 conn,
-                params={"id": meeting_id}
+                "SELECT * FROM meeting_minutes WHERE id = :id",
+                {"id": meeting_id}
             )
-            if len(df) > 0:
-                return df.iloc[0].to_dict()
-            return None
+            return _first_row(df)
         finally:
             conn.close()
     
@@ -1172,9 +3660,289 @@ class ProjectDatabase:
         try:
             meeting_data['updated_at'] = datetime.now().isoformat()
             session.query(MeetingMinute).filter(MeetingMinute.id == meeting_id).update(meeting_data)
+            _index_search(session, 'meeting', [meeting_id])
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    # JSON queries
+    def find_json_array_items(self, table, column, match=None, exclude=None, project_id=None, parent_columns=('id',)):
+        """
+        Elements of a JSON array column filtered inside the database
+        e.g. find_json_array_items('meeting_minutes', 'action_items', exclude={'status': 'Completed'})
+        Returns a DataFrame: parent_columns + 'item' (the element as a dict)
+        """
+        sql, params = _json_array_items_query(
+            self.engine.dialect.name, table, column, match, exclude, project_id, parent_columns
+        )
+        conn = self.get_connection()
+        try:
+            df = _read_frame(conn, sql, params)
+            if self.engine.dialect.name != 'postgresql':
+                df['item'] = df['item'].map(_parse_json)
+            return df
+        finally:
+            conn.close()
+    
+    def delete_meeting(self, meeting_id):
+        session = self.Session()
+        try:
+            session.query(ActionItem).filter(ActionItem.meeting_id == meeting_id).delete()
+            session.query(MeetingMinute).filter(MeetingMinute.id == meeting_id).delete()
+            _unindex_search(session, 'meeting', [meeting_id])
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    # ===== ACTION ITEMS =====
+    def add_action_item(self, action_data):
+        session = self.Session()
+        try:
+            now = datetime.now().isoformat()
+            action = ActionItem(**dict(action_data, created_at=now, updated_at=now))
+            session.add(action)
+            session.commit()
+            return action.id
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def update_action_item(self, action_id, action_data):
+        session = self.Session()
+        try:
+            action_data = dict(action_data, updated_at=datetime.now().isoformat())
+            session.query(ActionItem).filter(ActionItem.id == action_id).update(action_data)
             session.commit()
         except Exception as e:
             session.rollback()
             raise e
         finally:
             session.close()
+    
+    def delete_action_item(self, action_id):
+        session = self.Session()
+        try:
+            session.query(ActionItem).filter(ActionItem.id == action_id).delete()
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def get_action_item(self, action_id):
+        conn = self.get_connection()
+        try:
+            df = _read_frame(conn, "SELECT * FROM action_items WHERE id = :id", {"id": action_id})
+            return _first_row(df)
+        finally:
+            conn.close()
+    
+    def get_action_items(self, meeting_id=None, project_id=None, status=None):
+        """
+        Action items with their meeting title/date, soonest due first
+        status may be a single status or a list
+        """
+        return self._query_action_items(meeting_id=meeting_id, project_id=project_id, status=status)
+    
+    def get_open_action_items(self, project_id=None, assigned_to=None, department=None, due_before=None):
+        """
+        Action items still to do, across all projects unless filtered
+        (e.g. a person's open items, or a department's overdue items with due_before=today)
+        Served by the (status, due_date) indexes of action_items
+        """
+        return self._query_action_items(
+            project_id=project_id, status=OPEN_ACTION_STATUSES,
+            assigned_to=assigned_to, department=department, due_before=due_before
+        )
+    
+    def _query_action_items(self, meeting_id=None, project_id=None, status=None,
+                            assigned_to=None, department=None, due_before=None):
+        actions = ActionItem.__table__
+        projects = Project.__table__
+        meetings = MeetingMinute.__table__
+        
+        clauses = []
+        if meeting_id is not None:
+            clauses.append(actions.c.meeting_id == meeting_id)
+        if project_id is not None:
+            clauses.append(actions.c.project_id == project_id)
+        if isinstance(status, (list, tuple, set)):
+            clauses.append(actions.c.status.in_(list(status)))
+        elif status is not None:
+            clauses.append(actions.c.status == status)
+        if assigned_to is not None:
+            clauses.append(actions.c.assigned_to == assigned_to)
+        if department is not None:
+            clauses.append(projects.c.department == department)
+        if due_before is not None:
+            clauses.append(actions.c.due_date < due_before)
+        
+        query = (
+            select(
+                actions,
+                projects.c.project_code, projects.c.project_name, projects.c.department,
+                meetings.c.meeting_title, meetings.c.meeting_date
+            )
+            .select_from(
+                actions.join(projects, projects.c.id == actions.c.project_id)
+                .outerjoin(meetings, meetings.c.id == actions.c.meeting_id)
+            )
+            .where(*clauses)
+            .order_by(actions.c.due_date.is_(None), actions.c.due_date, actions.c.id)
+        )
+        conn = self.get_connection()
+        try:
+            return parse_date_columns(pd.read_sql_query(query, conn))
+        finally:
+            conn.close()
+    
+    # ===== EMAIL OUTBOX =====
+    def enqueue_emails(self, messages):
+        """
+        Add emails to the outbox (one transaction)
+        messages: dicts with recipient_email, subject, body_html, body_text
+        (optional project_id, notification_type)
+        Returns the outbox ids
+        """
+        session = self.Session()
+        try:
+            now = datetime.now()
+            rows = [
+                OutboxEmail(**dict(message, status='pending', attempts=0, next_attempt_at=now, created_at=now))
+                for message in messages
+            ]
+            session.add_all(rows)
+            session.commit()
+            return [row.id for row in rows]
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def claim_emails(self, limit=20):
+        """
+        Mark up to `limit` due emails as 'sending' and return them (list of dicts)
+        Concurrent workers never get the same email (SKIP LOCKED on PostgreSQL,
+        a single writer on SQLite)
+        """
+        outbox = OutboxEmail.__table__
+        now = datetime.now()
+        due = (
+            select(outbox.c.id)
+            .where(outbox.c.status == 'pending', outbox.c.next_attempt_at <= now)
+            .order_by(outbox.c.next_attempt_at, outbox.c.id)
+            .limit(limit)
+        )
+        if self.engine.dialect.name == 'postgresql':
+            due = due.with_for_update(skip_locked=True)
+        claim = (
+            outbox.update()
+            .where(outbox.c.id.in_(due.scalar_subquery()))
+            .values(status='sending', locked_at=now, attempts=outbox.c.attempts + 1)
+            .returning(*outbox.c)
+        )
+        with self.engine.begin() as conn:
+            rows = [dict(row._mapping) for row in conn.execute(claim)]
+        return sorted(rows, key=lambda row: row['id'])
+    
+    def mark_emails_sent(self, email_ids):
+        outbox = OutboxEmail.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                outbox.update()
+                .where(outbox.c.id.in_(list(email_ids)))
+                .values(status='sent', sent_at=datetime.now(), locked_at=None, last_error=None)
+            )
+    
+    def mark_email_failed(self, email_id, error, retry_at=None):
+        """Record a failed attempt: back to 'pending' until retry_at, or 'failed' for good if retry_at is None"""
+        outbox = OutboxEmail.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                outbox.update()
+                .where(outbox.c.id == email_id)
+                .values(
+                    status='pending' if retry_at is not None else 'failed',
+                    next_attempt_at=retry_at, locked_at=None, last_error=str(error)[:2000]
+                )
+            )
+    
+    def release_stale_emails(self, older_than):
+        """Put emails left in 'sending' since before older_than (crashed worker) back in the queue"""
+        outbox = OutboxEmail.__table__
+        with self.engine.begin() as conn:
+            return conn.execute(
+                outbox.update()
+                .where(outbox.c.status == 'sending', outbox.c.locked_at < older_than)
+                .values(status='pending', locked_at=None, next_attempt_at=datetime.now())
+            ).rowcount
+    
+    def get_outbox_statistics(self):
+        """Number of outbox emails per status"""
+        conn = self.get_connection()
+        try:
+            df = _read_frame(conn, "SELECT status, COUNT(*) AS count FROM email_outbox GROUP BY status")
+            return dict(zip(df['status'], df['count'].astype(int)))
+        finally:
+            conn.close()
+    
+    # ===== EXPORT =====
+    def stream_rows(self, table_name, columns=None, batch_size=2000):
+        """
+        Yield the rows of a table in batches (lists of Row), ordered by id
+        PostgreSQL uses a server-side cursor, so memory stays at one batch
+        """
+        table = Base.metadata.tables[table_name]
+        selected = [table.c[column] for column in columns] if columns else list(table.c)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+                select(*selected).order_by(table.c.id)
+            )
+            for batch in result.partitions():
+                yield batch
+    
+    def count_rows(self, table_names):
+        """Row count of each table"""
+        with self.engine.connect() as conn:
+            return {
+                name: conn.execute(select(func.count()).select_from(Base.metadata.tables[name])).scalar()
+                for name in table_names
+            }
+    
+    def get_change_fingerprint(self, table_names):
+        """
+        Cheap value that changes whenever rows of the tables change (cache key of exports)
+        Per table: row count plus
+        - PostgreSQL: sum of the row transaction ids (xmin), new on every insert/update
+        - SQLite: max id, latest created_at/updated_at and the table_versions
+          counter bumped by the UPDATE / DELETE triggers
+        """
+        parts = []
+        with self.engine.connect() as conn:
+            postgresql = conn.dialect.name == 'postgresql'
+            versions = {} if postgresql else dict(conn.execute(
+                select(TableVersion.table_name, TableVersion.version)
+                .where(TableVersion.table_name.in_(list(table_names)))
+            ).all())
+            for name in table_names:
+                table = Base.metadata.tables[name]
+                stamps = [func.count()]
+                if postgresql:
+                    stamps.append(func.sum(literal_column('xmin::text::bigint')))
+                else:
+                    stamps.append(func.max(table.c.id))
+                    stamps += [func.max(table.c[column]) for column in ('created_at', 'updated_at')
+                               if column in table.c]
+                row = conn.execute(select(*stamps).select_from(table)).one()
+                parts.append((name, versions.get(name)) + tuple(str(value) for value in row))
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
@@ -5,9 +5,20 @@ import plotly.graph_objects as go
 import json
 from datetime import datetime
 
+def _json_value(value):
+    """Saved JSON field as a Python object (rows of older versions may still hold JSON text)"""
+    return json.loads(value) if isinstance(value, str) else value
+
 class DMAICTools:
-    def __init__(self, db):
+    def __init__(self, db, bundle=None):
         self.db = db
+        self.bundle = bundle  # ProjectBundle preloaded by the project page (optional)
+    
+    def _load_phase(self, phase, project_id):
+        """Get saved phase data from the preloaded bundle, else from the database"""
+        if self.bundle is not None and self.bundle.matches(project_id, 'dmaic'):
+            return self.bundle.dmaic.get(phase) or {}
+        return getattr(self.db, f'get_dmaic_{phase}')(project_id) or {}
     
     def render_dmaic_tracker(self, project_id, project_info):
         """Main DMAIC tracking interface"""
@@ -36,7 +47,7 @@ class DMAICTools:
         st.subheader("📋 Define Phase")
         
         # Load existing data
-        define_data = self.db.get_dmaic_define(project_id) or {}
+        define_data = self._load_phase('define', project_id)
         
         # SIPOC Builder
         with st.expander("🔗 SIPOC Diagram", expanded=True):
@@ -142,7 +153,7 @@ class DMAICTools:
             voc_list = []
             if define_data.get('voc_data'):
                 try:
-                    voc_list = json.loads(define_data['voc_data'])
+                    voc_list = _json_value(define_data['voc_data'])
                 except:
                     voc_list = []
             
@@ -167,7 +178,7 @@ class DMAICTools:
                         'category': voc_category,
                         'feedback': voc_feedback
                     })
-                    self.db.save_dmaic_define(project_id, {'voc_data': json.dumps(voc_list)})
+                    self.db.save_dmaic_define(project_id, {'voc_data': voc_list})
                     st.success("✅ Đã thêm VOC!")
                     st.rerun()
             
@@ -186,7 +197,7 @@ class DMAICTools:
                         with col3:
                             if st.button("🗑️", key=f"del_voc_{idx}"):
                                 voc_list.pop(idx)
-                                self.db.save_dmaic_define(project_id, {'voc_data': json.dumps(voc_list)})
+                                self.db.save_dmaic_define(project_id, {'voc_data': voc_list})
                                 st.rerun()
                         st.divider()
             
@@ -207,7 +218,7 @@ class DMAICTools:
     def render_measure_phase(self, project_id):
         st.subheader("📊 Measure Phase")
         
-        measure_data = self.db.get_dmaic_measure(project_id) or {}
+        measure_data = self._load_phase('measure', project_id)
         
         # Data Collection Plan
         with st.expander("📋 Data Collection Plan", expanded=True):
@@ -242,7 +253,7 @@ class DMAICTools:
             baseline_list = []
             if measure_data.get('baseline_metrics'):
                 try:
-                    baseline_list = json.loads(measure_data['baseline_metrics'])
+                    baseline_list = _json_value(measure_data['baseline_metrics'])
                 except:
                     baseline_list = []
             
@@ -273,7 +284,7 @@ class DMAICTools:
                         'date': str(metric_date),
                         'notes': metric_notes
                     })
-                    self.db.save_dmaic_measure(project_id, {'baseline_metrics': json.dumps(baseline_list)})
+                    self.db.save_dmaic_measure(project_id, {'baseline_metrics': baseline_list})
                     st.success("✅ Đã thêm metric!")
                     st.rerun()
             
@@ -338,7 +349,7 @@ class DMAICTools:
     def render_analyze_phase(self, project_id):
         st.subheader("🔍 Analyze Phase")
         
-        analyze_data = self.db.get_dmaic_analyze(project_id) or {}
+        analyze_data = self._load_phase('analyze', project_id)
         
         # Fishbone Diagram
         with st.expander("🐟 Fishbone Diagram (Ishikawa)", expanded=True):
@@ -348,7 +359,7 @@ class DMAICTools:
             fishbone_dict = {}
             if analyze_data.get('fishbone_categories'):
                 try:
-                    fishbone_dict = json.loads(analyze_data['fishbone_categories'])
+                    fishbone_dict = _json_value(analyze_data['fishbone_categories'])
                 except:
                     fishbone_dict = {}
             
@@ -368,7 +379,7 @@ class DMAICTools:
                 fishbone_dict[category] = causes
             
             if st.button("💾 Lưu Fishbone Diagram", key="save_fishbone"):
-                self.db.save_dmaic_analyze(project_id, {'fishbone_categories': json.dumps(fishbone_dict)})
+                self.db.save_dmaic_analyze(project_id, {'fishbone_categories': fishbone_dict})
                 st.success("✅ Đã lưu Fishbone!")
                 st.rerun()
         
@@ -380,7 +391,7 @@ class DMAICTools:
             five_whys_list = []
             if analyze_data.get('five_whys_data'):
                 try:
-                    five_whys_list = json.loads(analyze_data['five_whys_data'])
+                    five_whys_list = _json_value(analyze_data['five_whys_data'])
                 except:
                     five_whys_list = []
             
@@ -403,7 +414,7 @@ class DMAICTools:
                     'why5': whys[4],
                     'root_cause': root_cause
                 })
-                self.db.save_dmaic_analyze(project_id, {'five_whys_data': json.dumps(five_whys_list)})
+                self.db.save_dmaic_analyze(project_id, {'five_whys_data': five_whys_list})
                 st.success("✅ Đã thêm 5 Whys!")
                 st.rerun()
             
@@ -429,7 +440,7 @@ class DMAICTools:
             pareto_list = []
             if analyze_data.get('pareto_data'):
                 try:
-                    pareto_list = json.loads(analyze_data['pareto_data'])
+                    pareto_list = _json_value(analyze_data['pareto_data'])
                 except:
                     pareto_list = []
             
@@ -446,7 +457,7 @@ class DMAICTools:
                         'category': category,
                         'frequency': frequency
                     })
-                    self.db.save_dmaic_analyze(project_id, {'pareto_data': json.dumps(pareto_list)})
+                    self.db.save_dmaic_analyze(project_id, {'pareto_data': pareto_list})
                     st.success("✅ Đã thêm!")
                     st.rerun()
             
@@ -518,17 +529,17 @@ class DMAICTools:
                         
                         # Save stats
                         stats_summary = {
-                            'mean': df_stats['values'].mean(),
-                            'median': df_stats['values'].median(),
-                            'std': df_stats['values'].std(),
+                            'mean': float(df_stats['values'].mean()),
+                            'median': float(df_stats['values'].median()),
+                            'std': float(df_stats['values'].std()) if len(values) > 1 else 0.0,
                             'count': len(values),
-                            'min': df_stats['values'].min(),
-                            'max': df_stats['values'].max()
+                            'min': float(df_stats['values'].min()),
+                            'max': float(df_stats['values'].max())
                         }
                         
                         if st.button("💾 Lưu Statistical Analysis", key="save_stats"):
                             self.db.save_dmaic_analyze(project_id, {
-                                'statistical_data': json.dumps(stats_summary)
+                                'statistical_data': stats_summary
                             })
                             st.success("✅ Đã lưu!")
                             st.rerun()
@@ -551,7 +562,7 @@ class DMAICTools:
     def render_improve_phase(self, project_id):
         st.subheader("⚡ Improve Phase")
         
-        improve_data = self.db.get_dmaic_improve(project_id) or {}
+        improve_data = self._load_phase('improve', project_id)
         
         # Solution Brainstorming
         with st.expander("💡 Solution Brainstorming", expanded=True):
@@ -561,7 +572,7 @@ class DMAICTools:
             solutions_list = []
             if improve_data.get('solutions_brainstormed'):
                 try:
-                    solutions_list = json.loads(improve_data['solutions_brainstormed'])
+                    solutions_list = _json_value(improve_data['solutions_brainstormed'])
                 except:
                     solutions_list = []
             
@@ -587,7 +598,7 @@ class DMAICTools:
                         'description': solution_description,
                         'selected': False
                     })
-                    self.db.save_dmaic_improve(project_id, {'solutions_brainstormed': json.dumps(solutions_list)})
+                    self.db.save_dmaic_improve(project_id, {'solutions_brainstormed': solutions_list})
                     st.success("✅ Đã thêm giải pháp!")
                     st.rerun()
             
@@ -608,7 +619,7 @@ class DMAICTools:
                     st.divider()
                 
                 if st.button("💾 Lưu lựa chọn", key="save_selections"):
-                    self.db.save_dmaic_improve(project_id, {'solutions_brainstormed': json.dumps(solutions_list)})
+                    self.db.save_dmaic_improve(project_id, {'solutions_brainstormed': solutions_list})
                     st.success("✅ Đã lưu!")
                     st.rerun()
             
@@ -726,7 +737,7 @@ class DMAICTools:
     def render_control_phase(self, project_id):
         st.subheader("🎯 Control Phase")
         
-        control_data = self.db.get_dmaic_control(project_id) or {}
+        control_data = self._load_phase('control', project_id)
         
         # Control Plan
         with st.expander("📋 Control Plan", expanded=True):
@@ -736,7 +747,7 @@ class DMAICTools:
             control_items = []
             if control_data.get('control_plan'):
                 try:
-                    control_items = json.loads(control_data['control_plan'])
+                    control_items = _json_value(control_data['control_plan'])
                 except:
                     control_items = []
             
@@ -761,7 +772,7 @@ class DMAICTools:
                         'responsible': responsible,
                         'action': action_if_out
                     })
-                    self.db.save_dmaic_control(project_id, {'control_plan': json.dumps(control_items)})
+                    self.db.save_dmaic_control(project_id, {'control_plan': control_items})
                     st.success("✅ Đã thêm!")
                     st.rerun()
             
@@ -800,7 +811,7 @@ class DMAICTools:
             sop_list = []
             if control_data.get('sop_documents'):
                 try:
-                    sop_list = json.loads(control_data['sop_documents'])
+                    sop_list = _json_value(control_data['sop_documents'])
                 except:
                     sop_list = []
             
@@ -827,7 +838,7 @@ class DMAICTools:
                         'description': sop_description,
                         'location': sop_location
                     })
-                    self.db.save_dmaic_control(project_id, {'sop_documents': json.dumps(sop_list)})
+                    self.db.save_dmaic_control(project_id, {'sop_documents': sop_list})
                     st.success("✅ Đã thêm SOP!")
                     st.rerun()
             
@@ -0,0 +1,288 @@
+"""
+Email Outbox Module
+Emails are written to the email_outbox table and sent by a pool of background
+workers, so pages never wait for the mail server
+Each worker keeps its SMTP connection open, sends claimed emails in batches
+and retries failures with exponential backoff
+"""
+
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+from typing import Dict, List, Optional
+
+
+class EmailDeliveryError(Exception):
+    """The provider did not accept the email"""
+
+
+def build_message(email: Dict, from_email: str, from_name: str = None) -> MIMEMultipart:
+    """MIME message for an outbox row"""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = email.get('subject') or ''
+    msg['From'] = formataddr((from_name, from_email)) if from_name else from_email
+    msg['To'] = email['recipient_email']
+
+    if email.get('body_text'):
+        msg.attach(MIMEText(email['body_text'], 'plain', 'utf-8'))
+    msg.attach(MIMEText(email.get('body_html') or '', 'html', 'utf-8'))
+    return msg
+
+
+# ==================== TRANSPORTS ====================
+
+class SmtpTransport:
+    """
+    One SMTP connection reused for many emails
+    Reconnects when the server closed the connection (idle timeout, restart)
+    """
+
+    def __init__(self, host: str, port: int = 587, username: str = None, password: str = None,
+                 starttls: bool = True, from_email: str = 'noreply@hospital.com',
+                 from_name: str = None, timeout: float = 30, max_idle: float = 60):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.from_email = from_email
+        self.from_name = from_name
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.connections_opened = 0
+        self._smtp = None
+        self._last_used = 0.0
+
+    def _connection(self):
+        # A connection idle for a while may have been dropped by the server
+        if self._smtp is not None and time.monotonic() - self._last_used > self.max_idle:
+            try:
+                self._smtp.noop()
+            except smtplib.SMTPException:
+                self.close()
+
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+            self._smtp = smtp
+            self.connections_opened += 1
+        return self._smtp
+
+    def send(self, email: Dict):
+        msg = build_message(email, self.from_email, self.from_name)
+        try:
+            self._connection().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Dropped between two emails: reconnect once
+            self.close()
+            self._connection().send_message(msg)
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+class ServiceTransport:
+    """Send through NotificationService (SendGrid / AWS SES API clients)"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def send(self, email: Dict):
+        if not self.service.send_email(email['recipient_email'], email.get('subject') or '',
+                                       email.get('body_html') or '', email.get('body_text')):
+            raise EmailDeliveryError(f"{self.service.provider} did not accept the email")
+
+    def close(self):
+        pass
+
+
+def transport_factory(service):
+    """Factory of worker transports for a NotificationService (SMTP for gmail/smtp providers)"""
+    config = service.config
+    if service.provider in ('gmail', 'smtp'):
+        return lambda: SmtpTransport(
+            config.get('smtp_server', 'smtp.gmail.com'),
+            int(config.get('smtp_port', 587)),
+            username=config.get('username'),
+            password=config.get('password'),
+            starttls=config.get('starttls', True),
+            from_email=service.from_email,
+            from_name=service.from_name
+        )
+    return lambda: ServiceTransport(service)
+
+
+# ==================== OUTBOX ====================
+
+class EmailOutbox:
+    """
+    Persistent email queue (email_outbox table) and its worker pool
+
+    enqueue() only writes a row; worker threads claim due emails in batches,
+    send them over their own transport and record the delivery status
+    """
+
+    def __init__(self, database, transport_factory, workers: int = 2, batch_size: int = 20,
+                 poll_interval: float = 5.0, max_attempts: int = 5, retry_delay: float = 30,
+                 max_retry_delay: float = 3600, stale_after: float = 600):
+        """
+        Args:
+            database: ProjectDatabase instance
+            transport_factory: Callable returning a transport (send(email), close())
+            workers: Number of worker threads
+            batch_size: Emails claimed per database round trip
+            poll_interval: Seconds a worker sleeps when the queue is empty
+            max_attempts: Attempts before an email is marked 'failed'
+            retry_delay: Delay after the first failure (doubles each attempt)
+            max_retry_delay: Upper bound of the retry delay
+            stale_after: Seconds after which an email stuck in 'sending' is retried
+        """
+        self.db = database
+        self.transport_factory = transport_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.stale_after = stale_after
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    # ===== PRODUCERS =====
+
+    def enqueue(self, recipient_email: str, subject: str, body_html: str, body_text: str = None,
+                project_id: int = None, notification_type: str = None) -> int:
+        """Queue one email; returns its outbox id"""
+        return self.enqueue_many([{
+            'recipient_email': recipient_email,
+            'subject': subject,
+            'body_html': body_html,
+            'body_text': body_text,
+            'project_id': project_id,
+            'notification_type': notification_type
+        }])[0]
+
+    def enqueue_many(self, messages: List[Dict]) -> List[int]:
+        """Queue several emails in one transaction"""
+        ids = self.db.enqueue_emails(messages) if messages else []
+        self._wake.set()
+        return ids
+
+    # ===== WORKERS =====
+
+    def retry_at(self, attempts: int) -> Optional[datetime]:
+        """When to retry after `attempts` failed attempts (None: give up)"""
+        if attempts >= self.max_attempts:
+            return None
+        delay = min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+        return datetime.now() + timedelta(seconds=delay)
+
+    def process_batch(self, transport) -> int:
+        """Claim and send one batch; returns the number of emails claimed"""
+        emails = self.db.claim_emails(self.batch_size)
+        sent = []
+        for email in emails:
+            try:
+                transport.send(email)
+                sent.append(email['id'])
+            except Exception as e:
+                self.db.mark_email_failed(email['id'], e, self.retry_at(email['attempts']))
+        if sent:
+            self.db.mark_emails_sent(sent)
+        return len(emails)
+
+    def drain(self) -> int:
+        """Send every due email now in the calling thread (cron jobs, tests)"""
+        transport = self.transport_factory()
+        total = 0
+        try:
+            while True:
+                count = self.process_batch(transport)
+                total += count
+                if count == 0:
+                    return total
+        finally:
+            transport.close()
+
+    def _run(self):
+        transport = self.transport_factory()
+        try:
+            while not self._stop.is_set():
+                try:
+                    if self.process_batch(transport):
+                        continue
+                except Exception as e:
+                    print(f"Email outbox worker error: {e}")
+                    transport.close()
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        finally:
+            transport.close()
+
+    def start(self):
+        """Start the worker threads (emails left in 'sending' by a crash are queued again)"""
+        if self._threads:
+            return self
+        self.db.release_stale_emails(datetime.now() - timedelta(seconds=self.stale_after))
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"email-outbox-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 10):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def statistics(self) -> Dict:
+        """Number of outbox emails per status"""
+        return self.db.get_outbox_statistics()
+
+
+# ==================== PROCESS-WIDE OUTBOX ====================
+
+_DEFAULT_OUTBOX: Optional[EmailOutbox] = None
+
+def get_default_outbox() -> Optional[EmailOutbox]:
+    """Outbox started by start_email_outbox() (None: emails are sent synchronously)"""
+    return _DEFAULT_OUTBOX
+
+def start_email_outbox(database, service=None, **options) -> EmailOutbox:
+    """
+    Start the worker pool and make it the process-wide outbox used by
+    NotificationService / NotificationSystem
+
+    Args:
+        database: ProjectDatabase instance
+        service: NotificationService whose provider config is used (default: from secrets)
+        options: EmailOutbox options (workers, batch_size, ...)
+    """
+    global _DEFAULT_OUTBOX
+    if service is None:
+        from notification_service import get_notification_service
+        service = get_notification_service()
+
+    if _DEFAULT_OUTBOX is not None:
+        _DEFAULT_OUTBOX.stop()
+    _DEFAULT_OUTBOX = EmailOutbox(database, transport_factory(service), **options).start()
+    return _DEFAULT_OUTBOX
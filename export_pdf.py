@@ -8,25 +8,46 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
+import io
+import threading
 import pandas as pd
 
+_font_lock = threading.Lock()
+_font_available = None
+
 def setup_vietnamese_font():
     """
     Thiết lập font hỗ trợ tiếng Việt
+    Font chỉ được đăng ký một lần cho cả process (đọc file TTF tốn thời gian)
     """
-    try:
-        pdfmetrics.registerFont(TTFont('DejaVuSans', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'))
-        pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'))
-        return True
-    except:
-        return False
+    global _font_available
+    if _font_available is None:
+        with _font_lock:
+            if _font_available is None:
+                try:
+                    pdfmetrics.registerFont(TTFont('DejaVuSans', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'))
+                    pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'))
+                    _font_available = True
+                except Exception:
+                    _font_available = False
+    return _font_available
+
+def format_date(value, default=''):
+    """Ngày (Timestamp/date/chuỗi ISO) -> 'YYYY-MM-DD'"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return default
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    return str(value)
 
-def create_project_pdf(project_data, team_members, stakeholders, tasks, signoffs, output_path):
+def create_project_pdf(project_data, team_members, stakeholders, tasks, signoffs, output_path=None):
     """
     Tạo file PDF báo cáo dự án Lean Six Sigma
+    output_path: đường dẫn file PDF, hoặc None để tạo trong bộ nhớ (trả về bytes)
     """
+    buffer = io.BytesIO() if output_path is None else None
     doc = SimpleDocTemplate(
-        output_path,
+        buffer if buffer is not None else output_path,
         pagesize=A4,
         rightMargin=2*cm,
         leftMargin=2*cm,
@@ -88,8 +109,8 @@ def create_project_pdf(project_data, team_members, stakeholders, tasks, signoffs
         ["Phòng/Ban:", project_data.get('department', 'N/A')],
         ["Danh mục:", project_data.get('category', 'N/A')],
         ["Trạng thái:", project_data.get('status', 'N/A')],
-        ["Ngày bắt đầu:", project_data.get('start_date', 'N/A')],
-        ["Ngày kết thúc:", project_data.get('end_date', 'N/A')],
+        ["Ngày bắt đầu:", format_date(project_data.get('start_date'), 'N/A')],
+        ["Ngày kết thúc:", format_date(project_data.get('end_date'), 'N/A')],
     ]
     
     general_table = Table(general_info, colWidths=[4*cm, 12*cm])
@@ -199,8 +220,8 @@ def create_project_pdf(project_data, team_members, stakeholders, tasks, signoffs
     elements.append(Paragraph("4. NGÂN SÁCH", heading_style))
     
     budget_info = [
-        ["Ngân sách dự kiến:", f"{project_data.get('budget', 0):,.0f} VNĐ"],
-        ["Chi phí thực tế:", f"{project_data.get('actual_cost', 0):,.0f} VNĐ"],
+        ["Ngân sách dự kiến:", f"{project_data.get('budget') or 0:,.0f} VNĐ"],
+        ["Chi phí thực tế:", f"{project_data.get('actual_cost') or 0:,.0f} VNĐ"],
     ]
     
     budget_table = Table(budget_info, colWidths=[4*cm, 12*cm])
@@ -226,8 +247,8 @@ def create_project_pdf(project_data, team_members, stakeholders, tasks, signoffs
             task_data.append([
                 task.get('phase', ''),
                 task.get('task_name', ''),
-                task.get('start_date', ''),
-                task.get('end_date', ''),
+                format_date(task.get('start_date')),
+                format_date(task.get('end_date')),
                 task.get('responsible', ''),
                 f"{task.get('progress', 0)}%"
             ])
@@ -263,7 +284,7 @@ def create_project_pdf(project_data, team_members, stakeholders, tasks, signoffs
             sign_data.append([
                 sign.get('role', ''),
                 sign.get('name', ''),
-                sign.get('date', ''),
+                format_date(sign.get('date')),
                 ''  # Chỗ để ký tay
             ])
         
@@ -288,4 +309,4 @@ def create_project_pdf(project_data, team_members, stakeholders, tasks, signoffs
     # Tạo PDF
     doc.build(elements)
     
-    return output_path
+    return buffer.getvalue() if buffer is not None else output_path
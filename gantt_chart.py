@@ -3,12 +3,127 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, date
 
-def create_gantt_chart(tasks_df):
+# Màu theo trạng thái / phase DMAIC
+STATUS_COLORS = {
+    'Chưa bắt đầu': 'lightgray',
+    'Đang thực hiện': 'steelblue',
+    'Hoàn thành': 'green',
+    'Tạm dừng': 'orange'
+}
+
+PHASE_COLORS = {
+    'Define': '#FF6B6B',
+    'Measure': '#4ECDC4',
+    'Analyze': '#45B7D1',
+    'Improve': '#96CEB4',
+    'Control': '#FFEAA7'
+}
+
+DMAIC_PHASE_ORDER = ['Define', 'Measure', 'Analyze', 'Improve', 'Control']
+
+# Large-task mode: số task tối đa mỗi trang và số dòng hiển thị cùng lúc (cuộn/kéo để xem tiếp)
+GANTT_PAGE_SIZE = 100
+GANTT_VISIBLE_ROWS = 30
+GANTT_ROW_HEIGHT = 40
+
+# customdata columns -> %{customdata[i]} in the hover template
+HOVER_COLUMNS = ['task_name', 'phase', 'start_label', 'end_label', 'status', 'progress', 'responsible']
+HOVER_TEMPLATE = (
+    "<b>%{customdata[0]}</b><br>"
+    "Phase: %{customdata[1]}<br>"
+    "Start: %{customdata[2]}<br>"
+    "End: %{customdata[3]}<br>"
+    "Status: %{customdata[4]}<br>"
+    "Progress: %{customdata[5]}%<br>"
+    "Responsible: %{customdata[6]}<br>"
+    "<extra></extra>"
+)
+
+
+def _prepare_tasks(tasks_df):
+    """Copy tasks with parsed dates, bar length in ms and hover labels"""
+    df = tasks_df.copy()
+    
+    df['start_date'] = pd.to_datetime(df['start_date'])
+    df['end_date'] = pd.to_datetime(df['end_date'])
+    
+    # Trục date của plotly tính độ dài bar bằng millisecond
+    df['duration_ms'] = (df['end_date'] - df['start_date']).dt.total_seconds() * 1000
+    df['start_label'] = df['start_date'].dt.strftime('%Y-%m-%d')
+    df['end_label'] = df['end_date'].dt.strftime('%Y-%m-%d')
+    
+    for column in ('phase', 'status', 'responsible', 'progress'):
+        if column not in df.columns:
+            df[column] = None
+    df['progress'] = pd.to_numeric(df['progress'], errors='coerce').fillna(0).round().astype(int)
+    
+    return df
+
+
+def gantt_page_count(tasks_df, page_size=GANTT_PAGE_SIZE):
+    """Số trang của large-task mode"""
+    return max(1, -(-len(tasks_df) // page_size))
+
+
+def _build_gantt(df, label_column, group_column, colors, title, yaxis_title, page, page_size):
+    """
+    One go.Bar trace per group (status/phase) built from column arrays
+    
+    Hover text comes from customdata + one shared template, so the figure
+    size grows with the number of tasks, not with the number of traces
+    """
+    if page is not None:
+        df = df.iloc[page * page_size:(page + 1) * page_size]
+    
+    fig = go.Figure()
+    
+    groups = df[group_column].fillna('N/A')
+    for group in pd.unique(groups):
+        rows = df[groups == group]
+        fig.add_trace(go.Bar(
+            name=str(group),
+            x=rows['duration_ms'],
+            y=rows[label_column],
+            base=rows['start_label'],
+            orientation='h',
+            marker=dict(color=colors.get(group, 'lightgray')),
+            text=rows['progress'].astype(str) + '%',
+            textposition='inside',
+            customdata=rows[HOVER_COLUMNS].fillna('N/A').to_numpy(),
+            hovertemplate=HOVER_TEMPLATE
+        ))
+    
+    # Giữ thứ tự task theo DataFrame (không theo nhóm trace), task đầu tiên ở trên cùng
+    labels = list(pd.unique(df[label_column]))
+    yaxis = dict(categoryorder='array', categoryarray=labels[::-1])
+    if len(labels) > GANTT_VISIBLE_ROWS:
+        # Virtualized y-axis: chỉ hiển thị các dòng đầu, kéo (pan) để xem tiếp
+        yaxis['range'] = [len(labels) - GANTT_VISIBLE_ROWS - 0.5, len(labels) - 0.5]
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title='Timeline',
+        yaxis_title=yaxis_title,
+        height=max(400, min(len(labels), GANTT_VISIBLE_ROWS) * GANTT_ROW_HEIGHT),
+        showlegend=True,
+        barmode='overlay',
+        xaxis=dict(type='date'),
+        yaxis=yaxis,
+        dragmode='pan',
+        hovermode='closest'
+    )
+    
+    return fig
+
+
+def create_gantt_chart(tasks_df, page=None, page_size=GANTT_PAGE_SIZE):
     """
     Tạo Gantt Chart cơ bản từ DataFrame tasks
     
     Args:
         tasks_df: DataFrame với columns: task_name, start_date, end_date, phase, status, progress
+        page: Trang cần vẽ (large-task mode, bắt đầu từ 0) - None = tất cả task
+        page_size: Số task mỗi trang
     
     Returns:
         plotly.graph_objects.Figure hoặc None nếu lỗi
@@ -17,76 +132,26 @@ def create_gantt_chart(tasks_df):
         return None
     
     try:
-        # Prepare data
-        df = tasks_df.copy()
-        
-        # Convert dates to datetime
-        df['start_date'] = pd.to_datetime(df['start_date'])
-        df['end_date'] = pd.to_datetime(df['end_date'])
-        
-        # Add duration
-        df['duration'] = (df['end_date'] - df['start_date']).dt.days
+        df = _prepare_tasks(tasks_df)
         
-        # Color mapping by status
-        color_map = {
-            'Chưa bắt đầu': 'lightgray',
-            'Đang thực hiện': 'steelblue',
-            'Hoàn thành': 'green',
-            'Tạm dừng': 'orange'
-        }
-        
-        df['color'] = df['status'].map(color_map).fillna('lightgray')
-        
-        # Create figure
-        fig = go.Figure()
-        
-        # Add bars
-        for idx, row in df.iterrows():
-            fig.add_trace(go.Bar(
-                name=row['task_name'],
-                x=[row['duration']],
-                y=[row['task_name']],
-                orientation='h',
-                marker=dict(color=row['color']),
-                base=row['start_date'],
-                text=f"{row['progress']}%",
-                textposition='inside',
-                hovertemplate=(
-                    f"<b>{row['task_name']}</b><br>" +
-                    f"Phase: {row['phase']}<br>" +
-                    f"Start: {row['start_date'].strftime('%Y-%m-%d')}<br>" +
-                    f"End: {row['end_date'].strftime('%Y-%m-%d')}<br>" +
-                    f"Status: {row['status']}<br>" +
-                    f"Progress: {row['progress']}%<br>" +
-                    f"Responsible: {row.get('responsible', 'N/A')}<br>" +
-                    "<extra></extra>"
-                )
-            ))
-        
-        # Update layout
-        fig.update_layout(
-            title='Gantt Chart - Project Timeline',
-            xaxis_title='Timeline',
-            yaxis_title='Tasks',
-            height=max(400, len(df) * 40),
-            showlegend=False,
-            xaxis=dict(type='date'),
-            hovermode='closest'
+        return _build_gantt(
+            df, 'task_name', 'status', STATUS_COLORS,
+            'Gantt Chart - Project Timeline', 'Tasks', page, page_size
         )
-        
-        return fig
     
     except Exception as e:
         print(f"Error creating gantt chart: {e}")
         return None
 
 
-def create_dmaic_gantt(tasks_df):
+def create_dmaic_gantt(tasks_df, page=None, page_size=GANTT_PAGE_SIZE):
     """
     Tạo Gantt Chart với group theo DMAIC phases
     
     Args:
         tasks_df: DataFrame với columns: task_name, start_date, end_date, phase, status, progress
+        page: Trang cần vẽ (large-task mode, bắt đầu từ 0) - None = tất cả task
+        page_size: Số task mỗi trang
     
     Returns:
         plotly.graph_objects.Figure hoặc None nếu lỗi
@@ -95,68 +160,18 @@ def create_dmaic_gantt(tasks_df):
         return None
     
     try:
-        # Prepare data
-        df = tasks_df.copy()
-        
-        # Convert dates
-        df['start_date'] = pd.to_datetime(df['start_date'])
-        df['end_date'] = pd.to_datetime(df['end_date'])
-        
-        # DMAIC phase colors
-        phase_colors = {
-            'Define': '#FF6B6B',
-            'Measure': '#4ECDC4',
-            'Analyze': '#45B7D1',
-            'Improve': '#96CEB4',
-            'Control': '#FFEAA7'
-        }
-        
-        df['color'] = df['phase'].map(phase_colors).fillna('lightgray')
+        df = _prepare_tasks(tasks_df)
         
         # Sort by phase order
-        phase_order = ['Define', 'Measure', 'Analyze', 'Improve', 'Control']
-        df['phase_order'] = df['phase'].apply(
-            lambda x: phase_order.index(x) if x in phase_order else 999
-        )
+        phase_rank = {phase: i for i, phase in enumerate(DMAIC_PHASE_ORDER)}
+        df['phase_order'] = df['phase'].map(phase_rank).fillna(999)
         df = df.sort_values(['phase_order', 'start_date'])
+        df['label'] = df['phase'].astype(str) + ': ' + df['task_name'].astype(str)
         
-        # Create figure
-        fig = go.Figure()
-        
-        # Add bars grouped by phase
-        for idx, row in df.iterrows():
-            fig.add_trace(go.Bar(
-                name=row['task_name'],
-                x=[row['end_date'] - row['start_date']],
-                y=[f"{row['phase']}: {row['task_name']}"],
-                orientation='h',
-                marker=dict(color=row['color']),
-                base=row['start_date'],
-                text=f"{row['progress']}%",
-                textposition='inside',
-                hovertemplate=(
-                    f"<b>{row['task_name']}</b><br>" +
-                    f"Phase: {row['phase']}<br>" +
-                    f"Start: {row['start_date'].strftime('%Y-%m-%d')}<br>" +
-                    f"End: {row['end_date'].strftime('%Y-%m-%d')}<br>" +
-                    f"Status: {row['status']}<br>" +
-                    f"Progress: {row['progress']}%<br>" +
-                    "<extra></extra>"
-                )
-            ))
-        
-        # Update layout
-        fig.update_layout(
-            title='DMAIC Gantt Chart',
-            xaxis_title='Timeline',
-            yaxis_title='Tasks by Phase',
-            height=max(400, len(df) * 40),
-            showlegend=False,
-            xaxis=dict(type='date'),
-            hovermode='closest'
+        return _build_gantt(
+            df, 'label', 'phase', PHASE_COLORS,
+            'DMAIC Gantt Chart', 'Tasks by Phase', page, page_size
         )
-        
-        return fig
     
     except Exception as e:
         print(f"Error creating DMAIC gantt: {e}")
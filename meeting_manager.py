@@ -6,23 +6,37 @@ Handles meeting minutes, action items, and decision log
 from datetime import datetime
 from typing import List, Dict, Optional
 import json
+import pandas as pd
 import streamlit as st
 
+
+def format_meeting_date(value) -> str:
+    """Meeting date (Timestamp/date/string) -> 'YYYY-MM-DD' ('' if missing)"""
+    if hasattr(value, 'strftime'):
+        try:
+            return value.strftime('%Y-%m-%d')
+        except ValueError:  # NaT
+            return ''
+    return value or ''
+
+
 class MeetingManager:
     """
     Manage meeting minutes, action items, and decisions
     """
     
-    def __init__(self, database, activity_tracker=None):
+    def __init__(self, database, activity_tracker=None, bundle=None):
         """
         Initialize meeting manager
         
         Args:
             database: ProjectDatabase instance
             activity_tracker: ActivityTracker instance (optional)
+            bundle: ProjectBundle preloaded by the project page (optional)
         """
         self.db = database
         self.activity_tracker = activity_tracker
+        self.bundle = bundle
     
     def add_meeting(self, project_id: int, meeting_data: Dict) -> bool:
         """
@@ -40,7 +54,7 @@ class MeetingManager:
             meeting_data['project_id'] = project_id
             meeting_data['created_at'] = datetime.now().isoformat()
             
-            success = self.db.add_meeting_minutes(meeting_data)
+            success = self.db.add_meeting(meeting_data)
             
             if success and self.activity_tracker:
                 meeting_date = meeting_data.get('meeting_date', '')
@@ -82,7 +96,10 @@ class MeetingManager:
             List of meeting dicts
         """
         try:
-            meetings = self.db.get_meeting_minutes(project_id)
+            if self.bundle is not None and self.bundle.matches(project_id, 'meetings'):
+                meetings = self.bundle.meetings
+            else:
+                meetings = self.db.get_meetings(project_id)
             # Convert DataFrame to list of dicts
             if meetings is not None and not meetings.empty:
                 return meetings.to_dict('records')
@@ -95,7 +112,7 @@ class MeetingManager:
     def get_meeting_by_id(self, meeting_id: int) -> Optional[Dict]:
         """Get a specific meeting by ID"""
         try:
-            return self.db.get_meeting_by_id(meeting_id)
+            return self.db.get_meeting(meeting_id)
         except Exception as e:
             print(f"Error getting meeting: {e}")
             return None
@@ -103,7 +120,8 @@ class MeetingManager:
     def update_meeting(self, meeting_id: int, meeting_data: Dict) -> bool:
         """Update meeting minutes"""
         try:
-            return self.db.update_meeting_minutes(meeting_id, meeting_data)
+            self.db.update_meeting(meeting_id, meeting_data)
+            return True
         except Exception as e:
             print(f"Error updating meeting: {e}")
             return False
@@ -111,7 +129,8 @@ class MeetingManager:
     def delete_meeting(self, meeting_id: int) -> bool:
         """Delete meeting minutes"""
         try:
-            return self.db.delete_meeting_minutes(meeting_id)
+            self.db.delete_meeting(meeting_id)
+            return True
         except Exception as e:
             print(f"Error deleting meeting: {e}")
             return False
@@ -128,33 +147,26 @@ class MeetingManager:
             List of action item dicts
         """
         try:
-            meetings = self.get_meetings(project_id)
-            all_action_items = []
-            
-            for meeting in meetings:
-                meeting_date = meeting.get('meeting_date', '')
-                action_items_json = meeting.get('action_items', '[]')
-                
-                # Parse JSON
-                try:
-                    if isinstance(action_items_json, str):
-                        action_items = json.loads(action_items_json)
-                    else:
-                        action_items = action_items_json
-                except:
-                    action_items = []
-                
-                # Add meeting context to each action item
-                for item in action_items:
-                    if isinstance(item, dict):
-                        item['meeting_id'] = meeting.get('id')
-                        item['meeting_date'] = meeting_date
-                        
-                        # Filter by status if specified
-                        if status is None or item.get('status') == status:
-                            all_action_items.append(item)
+            if self.bundle is not None and self.bundle.matches(project_id, 'action_items'):
+                rows = self.bundle.action_items
+                if status is not None:
+                    rows = rows[rows['status'] == status]
+            else:
+                rows = self.db.get_action_items(project_id=project_id, status=status)
             
-            return all_action_items
+            return [
+                {
+                    'id': int(row['id']),
+                    'description': row['item_description'],
+                    'owner': row['assigned_to'],
+                    'due_date': format_meeting_date(row['due_date']),
+                    'status': row['status'],
+                    'priority': row['priority'],
+                    'meeting_id': None if pd.isna(row['meeting_id']) else int(row['meeting_id']),
+                    'meeting_date': format_meeting_date(row['meeting_date'])
+                }
+                for row in rows.to_dict('records')
+            ]
         
         except Exception as e:
             print(f"Error getting action items: {e}")
@@ -175,7 +187,7 @@ class MeetingManager:
             all_decisions = []
             
             for meeting in meetings:
-                meeting_date = meeting.get('meeting_date', '')
+                meeting_date = format_meeting_date(meeting.get('meeting_date'))
                 decisions_json = meeting.get('decisions', '[]')
                 
                 # Parse JSON
@@ -258,8 +270,13 @@ def render_meetings_list(project_id: int, current_user: str,
             reverse=True
         )
         
+        # One query for the whole project, grouped by meeting
+        items_by_meeting = {}
+        for item in meeting_manager.get_action_items(project_id):
+            items_by_meeting.setdefault(item['meeting_id'], []).append(item)
+        
         for meeting in meetings_sorted:
-            render_meeting_card(meeting, meeting_manager)
+            render_meeting_card(meeting, meeting_manager, items_by_meeting.get(meeting.get('id'), []))
 
 
 def render_meeting_form(project_id: int, current_user: str,
@@ -366,11 +383,11 @@ def render_meeting_form(project_id: int, current_user: str,
                     'meeting_time': str(meeting_time),
                     'location': location,
                     'duration_minutes': duration,
-                    'attendees': attendees,
+                    'attendees': [name.strip() for name in attendees.split(',') if name.strip()],
                     'agenda': agenda,
                     'notes': notes,
-                    'action_items': json.dumps(action_items),
-                    'decisions': json.dumps(decisions),
+                    'action_items': action_items,
+                    'decisions': decisions,
                     'created_by': current_user
                 }
                 
@@ -384,12 +401,12 @@ def render_meeting_form(project_id: int, current_user: str,
                     st.error("❌ Lỗi khi lưu biên bản")
 
 
-def render_meeting_card(meeting: Dict, meeting_manager: MeetingManager):
-    """Render a single meeting card"""
+def render_meeting_card(meeting: Dict, meeting_manager: MeetingManager, action_items: List[Dict]):
+    """Render a single meeting card (action_items: the items of this meeting)"""
     
     meeting_id = meeting.get('id')
     title = meeting.get('meeting_title', 'Untitled Meeting')
-    date = meeting.get('meeting_date', '')
+    date = format_meeting_date(meeting.get('meeting_date'))
     location = meeting.get('location', 'N/A')
     
     with st.expander(f"📅 {title} - {date}"):
@@ -409,7 +426,8 @@ def render_meeting_card(meeting: Dict, meeting_manager: MeetingManager):
         
         # Attendees
         st.write("**Người tham dự:**")
-        st.write(meeting.get('attendees', 'N/A'))
+        attendees = meeting.get('attendees') or 'N/A'
+        st.write(", ".join(map(str, attendees)) if isinstance(attendees, list) else attendees)
         
         # Agenda
         st.write("**Nội dung:**")
@@ -420,12 +438,6 @@ def render_meeting_card(meeting: Dict, meeting_manager: MeetingManager):
         st.write(meeting.get('notes', 'N/A'))
         
         # Action Items
-        action_items_json = meeting.get('action_items', '[]')
-        try:
-            action_items = json.loads(action_items_json) if isinstance(action_items_json, str) else action_items_json
-        except:
-            action_items = []
-        
         if action_items:
             st.write(f"**Action Items:** ({len(action_items)})")
             for item in action_items:
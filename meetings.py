@@ -34,7 +34,7 @@ class MeetingManager:
         Args:
             project_id: Project ID
             meeting_title: Meeting title
-            meeting_date: Meeting date (datetime or string)
+            meeting_date: Meeting date and time (datetime or string)
             duration: Duration in minutes
             location: Meeting location
             attendees: List of attendee names or comma-separated string
@@ -44,14 +44,17 @@ class MeetingManager:
         Returns:
             int: Meeting ID
         """
-        # Convert attendees to string if list
-        if isinstance(attendees, list):
-            attendees = ','.join(attendees)
+        # Store attendees as a JSON list
+        if isinstance(attendees, str):
+            attendees = [name.strip() for name in attendees.split(',') if name.strip()]
         
+        # meeting_date is a DATE column: the time of day goes to meeting_time
+        meeting_start = pd.Timestamp(meeting_date)
         meeting_data = {
             'project_id': project_id,
             'meeting_title': meeting_title,
-            'meeting_date': meeting_date if isinstance(meeting_date, str) else meeting_date.isoformat(),
+            'meeting_date': meeting_start.date(),
+            'meeting_time': meeting_start.strftime('%H:%M'),
             'duration': duration,
             'location': location,
             'attendees': attendees,
@@ -96,8 +99,8 @@ class MeetingManager:
         
         # Get meeting info for logging
         meeting = self.db.get_meeting(meeting_id)
-        if not meeting.empty and self.collaboration_manager:
-            project_id = meeting.iloc[0]['project_id']
+        if meeting and self.collaboration_manager:
+            project_id = meeting['project_id']
             self.collaboration_manager.log_activity(
                 project_id=project_id,
                 user_name=updated_by,
@@ -128,7 +131,7 @@ class MeetingManager:
             meeting_id: Meeting ID
         
         Returns:
-            DataFrame: Meeting data
+            dict: Meeting data (None if not found)
         """
         return self.db.get_meeting(meeting_id)
     
@@ -139,9 +142,9 @@ class MeetingManager:
         # Get meeting info before deleting
         meeting = self.db.get_meeting(meeting_id)
         
-        if not meeting.empty:
-            project_id = meeting.iloc[0]['project_id']
-            meeting_title = meeting.iloc[0]['meeting_title']
+        if meeting:
+            project_id = meeting['project_id']
+            meeting_title = meeting['meeting_title']
             
             self.db.delete_meeting(meeting_id)
             
@@ -223,11 +226,10 @@ class MeetingManager:
         # Log activity
         if self.collaboration_manager and updated_by:
             # Get action item info
-            all_items = self.db.get_action_items()
-            item = all_items[all_items['id'] == action_id]
+            item = self.db.get_action_item(action_id)
             
-            if not item.empty:
-                project_id = item.iloc[0]['project_id']
+            if item:
+                project_id = item['project_id']
                 self.collaboration_manager.log_activity(
                     project_id=project_id,
                     user_name=updated_by,
@@ -262,28 +264,17 @@ class MeetingManager:
         Returns:
             DataFrame: Overdue action items
         """
-        all_items = self.get_action_items(project_id=project_id, status='Open')
-        
-        if all_items.empty:
-            return all_items
-        
-        today = datetime.now().date()
-        all_items['due_date_dt'] = pd.to_datetime(all_items['due_date']).dt.date
-        
-        overdue = all_items[all_items['due_date_dt'] < today]
-        
-        return overdue
+        return self.db.get_open_action_items(project_id=project_id, due_before=datetime.now().date())
     
     def delete_action_item(self, action_id, deleted_by):
         """
         Delete an action item
         """
         # Get info before deleting
-        all_items = self.db.get_action_items()
-        item = all_items[all_items['id'] == action_id]
+        item = self.db.get_action_item(action_id)
         
-        if not item.empty:
-            project_id = item.iloc[0]['project_id']
+        if item:
+            project_id = item['project_id']
             
             self.db.delete_action_item(action_id)
             
@@ -342,7 +333,9 @@ class MeetingManager:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.write(f"**Ngày:** {pd.to_datetime(meeting['meeting_date']).strftime('%d/%m/%Y %H:%M')}")
+                    meeting_time = meeting.get('meeting_time')
+                    st.write(f"**Ngày:** {pd.to_datetime(meeting['meeting_date']).strftime('%d/%m/%Y')} "
+                             f"{meeting_time if pd.notna(meeting_time) else ''}")
                     st.write(f"**Thời lượng:** {meeting['duration']} phút")
                     st.write(f"**Địa điểm:** {meeting['location']}")
                 
@@ -355,8 +348,10 @@ class MeetingManager:
                 # Attendees
                 st.write("**👥 Người tham dự:**")
                 if meeting['attendees']:
-                    attendees_list = meeting['attendees'].split(',')
-                    st.write(", ".join(attendees_list))
+                    attendees_list = meeting['attendees']
+                    if isinstance(attendees_list, str):
+                        attendees_list = attendees_list.split(',')
+                    st.write(", ".join(map(str, attendees_list)))
                 
                 # Agenda
                 st.write("**📋 Chương trình:**")
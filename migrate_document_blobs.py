@@ -0,0 +1,20 @@
+"""
+Script chuyển nội dung tài liệu (base64 trong database) của phiên bản cũ sang blob store
+Sau khi chạy, database chỉ còn metadata và mã SHA-256 của file
+Chạy: python migrate_document_blobs.py [connection_string]
+"""
+
+import sys
+
+from database import ProjectDatabase
+
+def migrate(connection_string=None):
+    db = ProjectDatabase(connection_string)
+
+    print("🔄 Đang chuyển nội dung tài liệu sang blob store...")
+    moved = db.migrate_document_blobs()
+
+    print(f"✅ Đã chuyển {moved['project_documents']} tài liệu và {moved['document_versions']} phiên bản")
+
+if __name__ == "__main__":
+    migrate(sys.argv[1] if len(sys.argv) > 1 else None)
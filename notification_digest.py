@@ -0,0 +1,118 @@
+"""
+Notification Digest Module
+Gộp các thông báo chưa gửi thành MỘT email cho mỗi người nhận trong mỗi khoảng thời gian
+Mỗi thông báo có idempotency key: chạy lại (hoặc nhiều tiến trình cùng chạy) không tạo bản trùng
+"""
+
+import hashlib
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from notification_service import EmailTemplates
+
+# Notifications of one recipient created in the same window go into one email
+DIGEST_WINDOW = timedelta(days=1)
+
+
+def notification_key(notification_type: str, recipient_email: str, *parts) -> str:
+    """Idempotency key: same type, recipient and parts -> same notification"""
+    key = ':'.join([notification_type, (recipient_email or '').strip().lower()] + [str(part) for part in parts])
+    if len(key) > 200:
+        key = f"{notification_type}:{hashlib.sha1(key.encode('utf-8')).hexdigest()}"
+    return key
+
+
+def deadline_notifications(batch: pd.DataFrame) -> List[Dict]:
+    """
+    Notification rows for a ProjectDatabase.get_deadline_reminders() batch
+    One per task, deadline and reminder day (the 8 AM job can run twice safely)
+    """
+    notifications = []
+    for reminder in batch.to_dict('records'):
+        deadline = reminder['end_date'].date()
+        progress = 0 if pd.isna(reminder['progress']) else int(reminder['progress'])
+        notifications.append({
+            'project_id': int(reminder['project_id']),
+            'notification_type': 'deadline_reminder',
+            'title': f"Task '{reminder['task_name']}' còn {reminder['days_left']} ngày",
+            'message': (f"Dự án {reminder['project_name']} - deadline {deadline.strftime('%d/%m/%Y')}, "
+                        f"tiến độ {progress}%"),
+            'recipient_email': reminder['recipient_email'],
+            'recipient_name': reminder['recipient_name'],
+            'idempotency_key': notification_key(
+                'deadline_reminder', reminder['recipient_email'],
+                reminder['task_id'], deadline.isoformat(), reminder['days_left']
+            )
+        })
+    return notifications
+
+
+def record_notifications(database, notifications: List[Dict]) -> Dict:
+    """Bulk-insert notifications; duplicates (same idempotency key) are suppressed"""
+    inserted = database.add_notifications(notifications)
+    return {'recorded': len(inserted), 'suppressed': len(notifications) - len(inserted)}
+
+
+def build_digests(notifications: pd.DataFrame, window: timedelta = DIGEST_WINDOW) -> List[Dict]:
+    """
+    Group unsent notifications per recipient and window into one email each
+
+    Returns:
+        List of dicts: recipient_email, notification_ids, subject, body_html, body_text
+    """
+    if notifications.empty:
+        return []
+
+    frame = notifications.assign(
+        _recipient=notifications['recipient_email'].str.strip().str.lower(),
+        _window=notifications['created_at'].dt.floor(pd.Timedelta(window))
+    )
+    digests = []
+    for (_, _), group in frame.groupby(['_recipient', '_window'], sort=True):
+        names = group['recipient_name'].dropna()
+        subject, html, text = EmailTemplates.notification_digest(
+            names.iloc[0] if len(names) else None,
+            group[['title', 'message']].to_dict('records')
+        )
+        digests.append({
+            'recipient_email': group['recipient_email'].iloc[0].strip(),
+            'notification_ids': [int(value) for value in group['id']],
+            'subject': subject,
+            'body_html': html,
+            'body_text': text
+        })
+    return digests
+
+
+def send_digests(database, sender: Optional[Callable] = None, window: timedelta = DIGEST_WINDOW,
+                 dry_run: bool = False) -> Dict:
+    """
+    Email every unsent notification, one combined email per recipient and window
+
+    Args:
+        database: ProjectDatabase instance
+        sender: send(to_email, subject, body_html, body_text) -> bool
+                (default: NotificationService.queue_email, i.e. the email outbox)
+        window: Digest window
+        dry_run: Build the digests without sending or marking anything
+
+    Returns:
+        Dict with notifications, digests and sent counts
+    """
+    pending = database.get_unsent_notifications()
+    digests = build_digests(pending, window)
+    report = {'notifications': len(pending), 'digests': len(digests), 'sent': 0}
+    if dry_run:
+        return report
+
+    if sender is None:
+        from notification_service import get_notification_service
+        sender = get_notification_service().queue_email
+
+    for digest in digests:
+        if sender(digest['recipient_email'], digest['subject'], digest['body_html'], digest['body_text']):
+            database.mark_notifications_sent(digest['notification_ids'])
+            report['sent'] += 1
+    return report
@@ -19,18 +19,40 @@ class NotificationService:
     Fallback: Gmail SMTP
     """
     
-    def __init__(self, provider='sendgrid', config=None):
+    def __init__(self, provider='sendgrid', config=None, outbox=None):
         """
         Initialize notification service
         
         Args:
             provider: 'sendgrid', 'gmail', 'ses'
             config: Dict with email credentials
+            outbox: EmailOutbox for queue_email() (optional, None = send immediately)
         """
         self.provider = provider
         self.config = config or {}
         self.from_email = self.config.get('from_email', 'noreply@hospital.com')
         self.from_name = self.config.get('from_name', 'Lean Six Sigma App')
+        self.outbox = outbox
+    
+    def queue_email(self, to_email: str, subject: str, body_html: str,
+                    body_text: str = None, **metadata) -> bool:
+        """
+        Queue an email for the background workers (send_email() if no outbox is running)
+        
+        Args:
+            metadata: project_id, notification_type (stored with the queued email)
+        
+        Returns:
+            bool: Queued (or sent) successfully
+        """
+        if self.outbox is None:
+            return self.send_email(to_email, subject, body_html, body_text)
+        try:
+            self.outbox.enqueue(to_email, subject, body_html, body_text, **metadata)
+            return True
+        except Exception as e:
+            print(f"Error queueing email: {e}")
+            return False
         
     def send_email(self, to_email: str, subject: str, body_html: str, 
                    body_text: str = None) -> bool:
@@ -223,19 +245,61 @@ class EmailTemplates:
         
         text_body = f"{mentioned_by} mentioned you: {comment}. Reply: {project_url}"
         return (subject, html_body, text_body)
+    
+    @staticmethod
+    def notification_digest(recipient_name, items):
+        """
+        Template for several notifications combined in one email
+        
+        Args:
+            recipient_name: Recipient display name
+            items: List of dicts with title, message
+        """
+        subject = f"🔔 {len(items)} thông báo mới - Lean Six Sigma"
+        
+        rows_html = "".join(
+            f"""
+                    <div style="background: white; padding: 12px; margin: 8px 0; border-left: 4px solid #4A90E2;">
+                        <p style="margin: 0;"><strong>{item['title']}</strong></p>
+                        <p style="margin: 4px 0 0 0; color: #555;">{item.get('message') or ''}</p>
+                    </div>"""
+            for item in items
+        )
+        
+        html_body = f"""
+        <!DOCTYPE html>
+        <html>
+        <body style="font-family: Arial; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <div style="background: #4A90E2; color: white; padding: 20px; border-radius: 5px;">
+                    <h2>🔔 Tổng hợp thông báo</h2>
+                </div>
+                <div style="background: #f9f9f9; padding: 20px; margin: 20px 0;">
+                    <p>Xin chào <strong>{recipient_name or ''}</strong>,</p>
+                    <p>Bạn có {len(items)} thông báo mới:</p>{rows_html}
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        
+        text_body = "\n".join(f"- {item['title']}: {item.get('message') or ''}" for item in items)
+        return (subject, html_body, text_body)
 
 
 def get_notification_service(config=None):
-    """Factory function to get notification service"""
+    """Factory function to get notification service (queues through the running email outbox)"""
+    from email_outbox import get_default_outbox
+    outbox = get_default_outbox()
     try:
         import streamlit as st
         if hasattr(st, 'secrets') and 'email' in st.secrets:
             email_config = dict(st.secrets['email'])
             provider = email_config.get('provider', 'sendgrid')
-            return NotificationService(provider=provider, config=email_config)
+            return NotificationService(provider=provider, config=email_config, outbox=outbox)
     except:
         pass
-    return NotificationService(config=config or {})
+    return NotificationService(config=config or {}, outbox=outbox)
 
 
 def send_notification(notification_type, recipient_email, data):
@@ -255,4 +319,4 @@ def send_notification(notification_type, recipient_email, data):
     else:
         return False
     
-    return service.send_email(recipient_email, subject, html, text)
+    return service.queue_email(recipient_email, subject, html, text, notification_type=notification_type)
@@ -6,24 +6,30 @@ Gửi email notifications cho các sự kiện quan trọng trong dự án
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+import time
 from datetime import datetime, timedelta
 import pandas as pd
 
+from email_outbox import get_default_outbox
+from notification_digest import deadline_notifications, record_notifications, send_digests
+
 class NotificationSystem:
     """
     Hệ thống thông báo email cho Lean Six Sigma Projects
     """
     
-    def __init__(self, db, smtp_config=None):
+    def __init__(self, db, smtp_config=None, outbox=None):
         """
         Initialize notification system
         
         Args:
             db: ProjectDatabase instance
             smtp_config: Dict with keys: server, port, username, password, from_email
+            outbox: EmailOutbox to queue emails in (default: the running outbox, if any)
         """
         self.db = db
         self.smtp_config = smtp_config or self._get_default_config()
+        self.outbox = outbox if outbox is not None else get_default_outbox()
     
     def _get_default_config(self):
         """
@@ -61,8 +67,17 @@ class NotificationSystem:
             body_text: Plain text fallback (optional)
         
         Returns:
-            bool: True if sent successfully, False otherwise
+            bool: True if sent (or queued) successfully, False otherwise
         """
+        if self.outbox is not None:
+            # The outbox workers send it in the background
+            try:
+                self.outbox.enqueue(to_email, subject, body_html, body_text)
+                return True
+            except Exception as e:
+                print(f"Error queueing email: {e}")
+                return False
+        
         if not self.smtp_config.get('enabled'):
             print(f"SMTP not configured. Would send email to {to_email}: {subject}")
             return False
@@ -96,16 +111,18 @@ class NotificationSystem:
     
     def _create_notification_record(self, project_id, recipient_email, notification_type, title, message):
         """Create notification record in database"""
+        # The email went out directly: keep the record out of the digests
         notification_data = {
             'project_id': project_id,
             'recipient_email': recipient_email,
             'notification_type': notification_type,
             'title': title,
             'message': message,
-            'is_read': 0,
-            'sent_at': datetime.now().isoformat()
+            'is_read': False,
+            'is_sent': True,
+            'sent_at': datetime.now()
         }
-        return self.db.add_notification(notification_data)
+        return self.db.create_notification(notification_data)
     
     # ===== PROJECT ASSIGNMENT NOTIFICATIONS =====
     
@@ -161,91 +178,27 @@ class NotificationSystem:
     
     # ===== DEADLINE NOTIFICATIONS =====
     
-    def check_approaching_deadlines(self, days_ahead=7):
+    def check_approaching_deadlines(self, days_ahead=7, dry_run=False):
         """
-        Check for tasks with approaching deadlines and send notifications
+        Check for tasks with approaching deadlines and notify the responsible people
+        Tasks, projects and recipients come from one query (get_deadline_reminders);
+        reminders are recorded once (idempotency key) and emailed as one digest per person
         
         Args:
             days_ahead: Number of days ahead to check (default 7)
+            dry_run: Only report the batch (size, time taken), send nothing
         """
-        today = datetime.now().date()
-        deadline_date = today + timedelta(days=days_ahead)
-        
-        # Get all tasks
-        all_tasks = self.db.get_all_tasks()
+        started = time.perf_counter()
+        batch = self.db.get_deadline_reminders(days=range(0, days_ahead + 1))
         
-        notifications_sent = []
-        
-        for _, task in all_tasks.iterrows():
-            if pd.notna(task['end_date']):
-                try:
-                    task_end = datetime.fromisoformat(task['end_date']).date()
-                    
-                    # Check if deadline is approaching
-                    if today <= task_end <= deadline_date:
-                        days_remaining = (task_end - today).days
-                        
-                        # Get project info
-                        project = self.db.get_project(task['project_id'])
-                        if not project.empty:
-                            project_info = project.iloc[0]
-                            
-                            # Get responsible person's email
-                            team_members = self.db.get_team_members(task['project_id'])
-                            responsible_member = team_members[team_members['name'] == task['responsible']]
-                            
-                            if not responsible_member.empty and pd.notna(responsible_member.iloc[0]['email']):
-                                recipient_email = responsible_member.iloc[0]['email']
-                                
-                                subject = f"⏰ Nhắc nhở: Task '{task['task_name']}' sắp đến hạn"
-                                
-                                urgency_color = "#dc3545" if days_remaining <= 3 else "#ffc107"
-                                
-                                body_html = f"""
-                                <html>
-                                    <body style="font-family: Arial, sans-serif;">
-                                        <h2 style="color: {urgency_color};">⏰ Nhắc nhở deadline</h2>
-                                        <p>Xin chào {task['responsible']},</p>
-                                        <p>Task của bạn sắp đến hạn trong <strong>{days_remaining} ngày</strong>:</p>
-                                        
-                                        <div style="background-color: #fff3cd; padding: 15px; border-left: 4px solid {urgency_color}; margin: 20px 0;">
-                                            <h3 style="margin-top: 0;">{task['task_name']}</h3>
-                                            <p><strong>Dự án:</strong> {project_info['project_name']}</p>
-                                            <p><strong>Phase:</strong> {task['phase']}</p>
-                                            <p><strong>Deadline:</strong> {task['end_date']}</p>
-                                            <p><strong>Trạng thái hiện tại:</strong> {task['status']}</p>
-                                            <p><strong>Tiến độ:</strong> {task['progress']}%</p>
-                                        </div>
-                                        
-                                        <p>Vui lòng cập nhật tiến độ hoặc hoàn thành task trước deadline.</p>
-                                        
-                                        <p>Trân trọng,<br>
-                                        Hệ thống quản lý Lean Six Sigma</p>
-                                    </body>
-                                </html>
-                                """
-                                
-                                # Send email
-                                if self.send_email(recipient_email, subject, body_html):
-                                    notifications_sent.append({
-                                        'task': task['task_name'],
-                                        'email': recipient_email,
-                                        'days_remaining': days_remaining
-                                    })
-                                
-                                # Create notification record
-                                self._create_notification_record(
-                                    task['project_id'],
-                                    recipient_email,
-                                    'deadline_reminder',
-                                    subject,
-                                    f"Task '{task['task_name']}' sắp đến hạn trong {days_remaining} ngày"
-                                )
-                
-                except Exception as e:
-                    print(f"Error processing task {task['task_name']}: {e}")
+        if dry_run:
+            return {'reminders': len(batch), 'seconds': time.perf_counter() - started}
         
-        return notifications_sent
+        report = {'reminders': len(batch)}
+        report.update(record_notifications(self.db, deadline_notifications(batch)))
+        report.update(send_digests(self.db, sender=self.send_email))
+        report['seconds'] = time.perf_counter() - started
+        return report
     
     # ===== SIGN-OFF NOTIFICATIONS =====
     
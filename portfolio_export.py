@@ -0,0 +1,276 @@
+"""
+Portfolio Export Module
+Xuất toàn bộ dữ liệu (dự án và mọi bảng con) ra Excel nhiều sheet hoặc file ZIP chứa CSV
+Dữ liệu được đọc theo lô từ cursor phía server và ghi thẳng ra file (xlsxwriter
+constant_memory), chạy nền với tiến độ; file đã tạo được dùng lại tới khi dữ liệu thay đổi
+"""
+
+import csv
+import glob
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from database import Base
+
+# (table, sheet / file name, columns left out: file contents, images)
+EXPORT_TABLES = (
+    ('projects', 'Dự án', ()),
+    ('team_members', 'Thành viên', ()),
+    ('stakeholders', 'Stakeholders', ()),
+    ('project_tasks', 'Kế hoạch', ()),
+    ('signoffs', 'Ký tên', ('signature',)),
+    ('dmaic_define', 'DMAIC Define', ()),
+    ('dmaic_measure', 'DMAIC Measure', ('process_map_image',)),
+    ('dmaic_analyze', 'DMAIC Analyze', ()),
+    ('dmaic_improve', 'DMAIC Improve', ()),
+    ('dmaic_control', 'DMAIC Control', ()),
+    ('methodology_phases', 'Giai đoạn PDCA-PDSA', ()),
+    ('meeting_minutes', 'Biên bản họp', ()),
+    ('action_items', 'Action items', ()),
+    ('project_comments', 'Bình luận', ()),
+    ('project_documents', 'Tài liệu', ('file_content',)),
+    ('activity_log', 'Lịch sử hoạt động', ()),
+)
+EXPORT_FORMATS = {
+    'xlsx': ('Excel (nhiều sheet)', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'zip': ('CSV (file ZIP)', 'application/zip'),
+}
+EXPORT_BATCH_ROWS = 2000
+# Data rows per Excel sheet (1 048 576 rows including the header); more go to "<sheet> (2)"
+EXCEL_MAX_ROWS = 1048575
+EXPORT_DIRECTORY = os.path.join(tempfile.gettempdir(), 'lean_portfolio_exports')
+
+
+def _export_columns(table_name, excluded):
+    return [column.name for column in Base.metadata.tables[table_name].c if column.name not in excluded]
+
+
+def _cell(value):
+    """Value written to a cell: JSON as text, dates kept for date formats"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+# ==================== WRITERS ====================
+
+class ExcelWriter:
+    """xlsxwriter workbook in constant_memory mode: rows are flushed to disk as they are written"""
+
+    def __init__(self, path):
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(path, {
+            'constant_memory': True,
+            # Cell text is data: never turn it into formulas, numbers or links
+            'strings_to_formulas': False,
+            'strings_to_numbers': False,
+            'strings_to_urls': False,
+        })
+        self.header = self.workbook.add_format({'bold': True, 'bg_color': '#DDEBF7'})
+        self.date = self.workbook.add_format({'num_format': 'dd/mm/yyyy'})
+        self.datetime = self.workbook.add_format({'num_format': 'dd/mm/yyyy hh:mm'})
+        self.sheet = None
+
+    def start(self, table_name, name, columns, part=1):
+        self.table_name, self.name, self.columns, self.part = table_name, name, columns, part
+        self.sheet = self.workbook.add_worksheet(name if part == 1 else f"{name[:26]} ({part})")
+        self.sheet.write_row(0, 0, columns, self.header)
+        self.sheet.freeze_panes(1, 0)
+        self.row = 0
+
+    def write(self, values):
+        if self.row == EXCEL_MAX_ROWS:
+            self.start(self.table_name, self.name, self.columns, self.part + 1)
+        self.row += 1
+        for col, value in enumerate(values):
+            value = _cell(value)
+            if value is None:
+                continue
+            if isinstance(value, datetime):
+                self.sheet.write_datetime(self.row, col, value, self.datetime)
+            elif isinstance(value, date):
+                self.sheet.write_datetime(self.row, col, value, self.date)
+            else:
+                self.sheet.write(self.row, col, value)
+
+    def close(self):
+        self.workbook.close()
+
+
+class CsvZipWriter:
+    """One UTF-8 CSV per table in a ZIP file, written through a compressed stream"""
+
+    def __init__(self, path):
+        self.zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+        self.stream = None
+
+    def start(self, table_name, name, columns):
+        self._close_stream()
+        self.stream = io.TextIOWrapper(self.zip.open(f"{table_name}.csv", 'w', force_zip64=True),
+                                       encoding='utf-8-sig', newline='')
+        self.writer = csv.writer(self.stream)
+        self.writer.writerow(columns)
+
+    def write(self, values):
+        self.writer.writerow([
+            value.isoformat() if isinstance(value, (date, datetime)) else _cell(value)
+            for value in values
+        ])
+
+    def _close_stream(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def close(self):
+        self._close_stream()
+        self.zip.close()
+
+
+def write_portfolio(database, path, fmt='xlsx', progress=None):
+    """
+    Write every EXPORT_TABLES table to `path`
+
+    Args:
+        database: ProjectDatabase instance
+        path: Output file
+        fmt: 'xlsx' or 'zip'
+        progress: Called with (rows written, table name) after each batch
+
+    Returns:
+        int: Number of data rows written
+    """
+    writer = ExcelWriter(path) if fmt == 'xlsx' else CsvZipWriter(path)
+    written = 0
+    try:
+        for table_name, label, excluded in EXPORT_TABLES:
+            columns = _export_columns(table_name, excluded)
+            writer.start(table_name, label, columns)
+            for batch in database.stream_rows(table_name, columns, EXPORT_BATCH_ROWS):
+                for row in batch:
+                    writer.write(row)
+                written += len(batch)
+                if progress:
+                    progress(written, table_name)
+    finally:
+        writer.close()
+    return written
+
+
+# ==================== BACKGROUND JOBS ====================
+
+class ExportJob:
+    """One export run (or a finished file reused from the cache)"""
+
+    def __init__(self, fmt, fingerprint, path, total_rows=0):
+        self.fmt = fmt
+        self.fingerprint = fingerprint
+        self.path = path
+        self.total_rows = total_rows
+        self.rows_written = 0
+        self.current_table = None
+        self.status = 'running'
+        self.error = None
+        self.cached = False
+        self.started_at = time.time()
+        self.finished_at = None
+
+    @property
+    def progress(self) -> float:
+        if self.status == 'done':
+            return 1.0
+        return min(self.rows_written / self.total_rows, 1.0) if self.total_rows else 0.0
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def file_name(self) -> str:
+        return f"Portfolio_{datetime.fromtimestamp(self.started_at).strftime('%Y%m%d_%H%M')}.{self.fmt}"
+
+
+class PortfolioExporter:
+    """
+    Runs portfolio exports in a background thread
+    Finished files are kept in `directory` under the data fingerprint, so the
+    same export is served from disk until one of the exported tables changes
+    """
+
+    def __init__(self, database, directory: str = EXPORT_DIRECTORY):
+        self.db = database
+        self.directory = directory
+        self._jobs: Dict[str, ExportJob] = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _artifact_path(self, fmt, fingerprint):
+        return os.path.join(self.directory, f"portfolio_{fingerprint[:20]}.{fmt}")
+
+    def job(self, fmt='xlsx') -> Optional[ExportJob]:
+        """Latest job of the format (None if never started)"""
+        return self._jobs.get(fmt)
+
+    def start(self, fmt='xlsx') -> ExportJob:
+        """
+        Start an export (or return the running / cached one for unchanged data)
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        tables = [table for table, _, _ in EXPORT_TABLES]
+        fingerprint = self.db.get_change_fingerprint(tables)
+        path = self._artifact_path(fmt, fingerprint)
+
+        with self._lock:
+            job = self._jobs.get(fmt)
+            if job is not None and job.fingerprint == fingerprint and (
+                    job.status == 'running' or (job.status == 'done' and os.path.exists(job.path))):
+                return job
+
+            if os.path.exists(path):
+                job = ExportJob(fmt, fingerprint, path)
+                job.status, job.cached = 'done', True
+                job.started_at = job.finished_at = os.path.getmtime(path)
+                self._jobs[fmt] = job
+                return job
+
+            job = ExportJob(fmt, fingerprint, path, sum(self.db.count_rows(tables).values()))
+            self._jobs[fmt] = job
+        threading.Thread(target=self._run, args=(job,), name=f"portfolio-export-{fmt}", daemon=True).start()
+        return job
+
+    def _run(self, job):
+        partial = f"{job.path}.{threading.get_ident()}.part"
+
+        def progress(rows, table_name):
+            job.rows_written, job.current_table = rows, table_name
+
+        try:
+            write_portfolio(self.db, partial, job.fmt, progress)
+            os.replace(partial, job.path)
+            job.status = 'done'
+            self._remove_stale(job)
+        except Exception as e:
+            print(f"Error exporting portfolio: {e}")
+            job.status, job.error = 'failed', str(e)
+            if os.path.exists(partial):
+                os.remove(partial)
+        finally:
+            job.finished_at = time.time()
+
+    def _remove_stale(self, job):
+        """Delete files of older data versions"""
+        for path in glob.glob(os.path.join(self.directory, f"portfolio_*.{job.fmt}")):
+            if path != job.path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -0,0 +1,341 @@
+"""
+Query Cache Module
+Read-through cache for ProjectDatabase with per-table TTL, LRU eviction
+and automatic invalidation by the add_*/update_*/delete_*/save_* methods
+"""
+
+import copy
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Seconds a cached result stays valid (other processes may write too)
+DEFAULT_TTLS = {
+    'departments': 600,
+    'projects': 60,
+    'team_members': 300,
+    'stakeholders': 300,
+    'signoffs': 300,
+    'notifications': 30,
+    'activity_log': 30,
+}
+DEFAULT_TTL = 120
+
+# Tables a project bundle section reads
+BUNDLE_SECTION_TABLES = {
+    'team_members': ('team_members',),
+    'stakeholders': ('stakeholders',),
+    'tasks': ('project_tasks',),
+    'signoffs': ('signoffs',),
+    'dmaic': ('dmaic_define', 'dmaic_measure', 'dmaic_analyze', 'dmaic_improve', 'dmaic_control'),
+    'comments': ('project_comments',),
+    'activities': ('activity_log',),
+    'meetings': ('meeting_minutes',),
+    'action_items': ('action_items', 'meeting_minutes'),
+}
+
+# Read method -> (tables read, True if the first argument is a project_id)
+READ_METHODS = {
+    'get_project': (('projects',), True),
+    'get_all_projects': (('projects',), False),
+    'list_projects': (('projects',), False),
+    'count_projects': (('projects',), False),
+    'get_statistics': (('projects',), False),
+    'get_rollup_statistics': (('projects',), False),
+    'get_team_members': (('team_members',), True),
+    'get_stakeholders': (('stakeholders',), True),
+    'get_tasks': (('project_tasks',), True),
+    'get_signoffs': (('signoffs',), True),
+    'get_departments': (('departments',), False),
+    'get_dmaic_define': (('dmaic_define',), True),
+    'get_dmaic_measure': (('dmaic_measure',), True),
+    'get_dmaic_analyze': (('dmaic_analyze',), True),
+    'get_dmaic_improve': (('dmaic_improve',), True),
+    'get_dmaic_control': (('dmaic_control',), True),
+    'get_methodology_phases': (('methodology_phases',), True),
+    'get_documents': (('project_documents',), True),
+    'get_document': (('project_documents',), False),
+    'get_document_versions': (('project_documents',), False),
+    'get_comments': (('project_comments',), True),
+    'get_activities': (('activity_log',), True),
+    'get_notifications': (('notifications',), False),
+    'get_meetings': (('meeting_minutes',), True),
+    'get_meeting': (('meeting_minutes',), False),
+    'get_action_item': (('action_items',), False),
+    'get_action_items': (('action_items', 'meeting_minutes'), False),
+    'get_open_action_items': (('action_items', 'projects', 'meeting_minutes'), False),
+    'search': (('projects', 'project_comments', 'meeting_minutes', 'project_documents', 'activity_log'), False),
+}
+
+# Write method -> (table(s) written, where to find the project_id)
+#   'arg'  : first positional argument
+#   'data' : 'project_id' key of the first positional argument (a dict)
+#   None   : unknown, invalidate the whole table
+ALL_TABLES = '*'
+WRITE_METHODS = {
+    'add_project': ('projects', None),
+    'update_project': ('projects', 'arg'),
+    'bulk_add_projects': ('projects', None),
+    'delete_project': (ALL_TABLES, 'arg'),
+    'rebuild_project_rollups': ('projects', None),
+    'add_team_member': ('team_members', 'data'),
+    'bulk_add_team_members': ('team_members', 'arg'),
+    'delete_team_member': ('team_members', None),
+    'add_stakeholder': ('stakeholders', 'data'),
+    'bulk_add_stakeholders': ('stakeholders', 'arg'),
+    'delete_stakeholder': ('stakeholders', None),
+    'add_task': ('project_tasks', 'data'),
+    'bulk_add_tasks': ('project_tasks', 'arg'),
+    'update_task': ('project_tasks', None),
+    'delete_task': ('project_tasks', None),
+    'add_signoff': ('signoffs', 'data'),
+    'delete_signoff': ('signoffs', None),
+    'add_department': ('departments', None),
+    'delete_department': ('departments', None),
+    'save_dmaic_define': ('dmaic_define', 'arg'),
+    'save_dmaic_measure': ('dmaic_measure', 'arg'),
+    'save_dmaic_analyze': ('dmaic_analyze', 'arg'),
+    'save_dmaic_improve': ('dmaic_improve', 'arg'),
+    'save_dmaic_control': ('dmaic_control', 'arg'),
+    'save_methodology_phase': ('methodology_phases', 'data'),
+    'update_methodology_phase': ('methodology_phases', None),
+    'add_document': ('project_documents', 'data'),
+    'add_document_version': ('project_documents', None),
+    'delete_document': ('project_documents', None),
+    'migrate_document_blobs': ('project_documents', None),
+    'complete_document_upload': ('project_documents', None),
+    'add_comment': ('project_comments', 'data'),
+    'log_activity': ('activity_log', 'data'),
+    'create_notification': ('notifications', 'data'),
+    'mark_notification_read': ('notifications', None),
+    'add_notifications': ('notifications', None),
+    'mark_notifications_sent': ('notifications', None),
+    'add_meeting': (('meeting_minutes', 'action_items'), 'data'),
+    'update_meeting': ('meeting_minutes', None),
+    'delete_meeting': (('meeting_minutes', 'action_items'), None),
+    'add_action_item': ('action_items', 'data'),
+    'update_action_item': ('action_items', None),
+    'delete_action_item': ('action_items', None),
+}
+
+
+def _freeze(value):
+    """Hashable form of call arguments (filters dicts, column lists)"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _copy_value(value):
+    """Copy cached results so callers can't mutate the cached object"""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, dict):
+        return copy.copy(value)
+    if isinstance(value, tuple):
+        return tuple(_copy_value(item) for item in value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(value, **{
+            f.name: _copy_value(getattr(value, f.name))
+            for f in dataclasses.fields(value)
+            if isinstance(getattr(value, f.name), (pd.DataFrame, dict))
+        })
+    return value
+
+
+class QueryCache:
+    """
+    Size-bounded LRU cache whose entries expire after a per-table TTL
+    Every entry records the (table, project_id) pairs it depends on
+    Each table has a generation bumped by invalidate(): a read that started
+    before a write is not stored (it may hold the data from before the write)
+    """
+
+    def __init__(self, max_entries: int = 512, ttls: Optional[Dict[str, int]] = None,
+                 default_ttl: int = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, dependencies, value)
+        self._generations = {}  # table (or ALL_TABLES) -> invalidation count
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0, 'stale_puts': 0}
+        self._table_stats = {}
+
+    def _count(self, tables, counter):
+        self._stats[counter] += 1
+        for table in tables:
+            table_stats = self._table_stats.setdefault(table, {'hits': 0, 'misses': 0})
+            table_stats[counter] += 1
+
+    def get(self, key, tables):
+        """Return (True, value) on a fresh hit, (False, None) otherwise"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count(tables, 'hits')
+                return True, _copy_value(entry[2])
+            if entry is not None:
+                del self._entries[key]
+            self._count(tables, 'misses')
+            return False, None
+
+    def generation(self, tables):
+        """Snapshot to take before reading the tables, passed on to put()"""
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in (ALL_TABLES,) + tuple(tables))
+
+    def put(self, key, dependencies, value, generation=None):
+        """
+        Store a result; skipped if one of its tables was invalidated since the
+        generation() snapshot taken before the read
+        """
+        tables = tuple(table for table, _ in dependencies)
+        ttl = min(self.ttls.get(table, self.default_ttl) for table in tables)
+        with self._lock:
+            if generation is not None and generation != tuple(
+                    self._generations.get(table, 0) for table in (ALL_TABLES,) + tables):
+                self._stats['stale_puts'] += 1
+                return
+            self._entries[key] = (time.monotonic() + ttl, frozenset(dependencies), _copy_value(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, table, project_id=None):
+        """
+        Drop entries depending on (table, project_id)
+        project_id=None drops every entry of the table; table=ALL_TABLES drops
+        every entry of the project (or everything if project_id is None too)
+        """
+        def affected(dependencies):
+            for dep_table, dep_project in dependencies:
+                if table != ALL_TABLES and dep_table != table:
+                    continue
+                if project_id is None or dep_project is None or dep_project == project_id:
+                    return True
+            return False
+
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, entry in self._entries.items() if affected(entry[1])]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters (overall and per table) and current size"""
+        with self._lock:
+            total = self._stats['hits'] + self._stats['misses']
+            return dict(
+                self._stats,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                hit_rate=round(self._stats['hits'] / total, 3) if total else 0.0,
+                by_table={table: dict(counts) for table, counts in self._table_stats.items()}
+            )
+
+
+class CachedProjectDatabase:
+    """
+    Drop-in wrapper around ProjectDatabase
+    get_* methods are served from a QueryCache; write methods pass through
+    and invalidate the (table, project_id) entries they affect
+    """
+
+    def __init__(self, database, cache: Optional[QueryCache] = None):
+        """
+        Args:
+            database: ProjectDatabase instance
+            cache: QueryCache instance (optional, default settings otherwise)
+        """
+        self._db = database
+        self.cache = cache or QueryCache()
+
+    def __getattr__(self, name):
+        attr = getattr(self._db, name)
+        if not callable(attr):
+            return attr
+
+        if name == 'get_project_bundle':
+            wrapper = self._cached_bundle(attr)
+        elif name in READ_METHODS:
+            wrapper = self._cached_read(name, attr)
+        elif name in WRITE_METHODS:
+            wrapper = self._invalidating_write(name, attr)
+        else:
+            return attr
+
+        # Remember the wrapper so the next lookup skips __getattr__
+        setattr(self, name, wrapper)
+        return wrapper
+
+    def _cached_read(self, name, method):
+        tables, project_scoped = READ_METHODS[name]
+
+        def wrapper(*args, **kwargs):
+            project_id = args[0] if project_scoped and args else kwargs.get('project_id')
+            key = (name, _freeze(args), _freeze(kwargs))
+            hit, value = self.cache.get(key, tables)
+            if hit:
+                return value
+            generation = self.cache.generation(tables)
+            value = method(*args, **kwargs)
+            self.cache.put(key, [(table, project_id) for table in tables], value, generation)
+            return value
+
+        return wrapper
+
+    def _cached_bundle(self, method):
+        from database import BUNDLE_SECTIONS
+
+        def wrapper(project_id, sections=None):
+            sections = tuple(BUNDLE_SECTIONS if sections is None else sections)
+            tables = ('projects',) + tuple(
+                table for section in sections for table in BUNDLE_SECTION_TABLES[section]
+            )
+            key = ('get_project_bundle', project_id, sections)
+            hit, value = self.cache.get(key, tables)
+            if hit:
+                return value
+            generation = self.cache.generation(tables)
+            value = method(project_id, sections=sections)
+            self.cache.put(key, [(table, project_id) for table in tables], value, generation)
+            return value
+
+        return wrapper
+
+    def _invalidating_write(self, name, method):
+        tables, project_source = WRITE_METHODS[name]
+        if isinstance(tables, str):
+            tables = (tables,)
+
+        def wrapper(*args, **kwargs):
+            project_id = None
+            if project_source == 'arg' and args:
+                project_id = args[0]
+            elif project_source == 'data' and args and isinstance(args[0], dict):
+                project_id = args[0].get('project_id')
+            try:
+                return method(*args, **kwargs)
+            finally:
+                for table in tables:
+                    self.cache.invalidate(table, project_id)
+
+        return wrapper
+
+    def cache_stats(self):
+        """Hit/miss counters of the query cache"""
+        return self.cache.stats()
@@ -0,0 +1,21 @@
+"""
+Script tính lại bảng tổng hợp dashboard (project_rollups) từ bảng projects
+Dùng khi dữ liệu dự án được sửa trực tiếp trong database (ngoài ứng dụng)
+Chạy: python rebuild_rollups.py [connection_string]
+"""
+
+import sys
+
+from database import ProjectDatabase
+
+def rebuild(connection_string=None):
+    db = ProjectDatabase(connection_string)
+
+    print("🔄 Đang tính lại project_rollups...")
+    groups = db.rebuild_project_rollups()
+    stats = db.get_rollup_statistics()
+
+    print(f"✅ Đã tạo {groups} nhóm cho {stats['total_projects']} dự án")
+
+if __name__ == "__main__":
+    rebuild(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,174 @@
+"""
+Report Service Module
+Hàng đợi tạo báo cáo PDF với một pool worker nhỏ chạy nền
+PDF được tạo trong bộ nhớ và lưu cache theo mã băm nội dung dữ liệu dự án:
+tải lại báo cáo của dự án không thay đổi là có ngay
+"""
+
+import hashlib
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import pandas as pd
+
+from export_pdf import create_project_pdf, setup_vietnamese_font
+
+# Bundle sections used by the PDF report
+REPORT_SECTIONS = ('team_members', 'stakeholders', 'tasks', 'signoffs')
+# Bump when the report layout changes (cached PDFs of the old layout are not reused)
+REPORT_VERSION = 1
+
+
+def _records(frame):
+    if frame is None:
+        return []
+    if isinstance(frame, pd.DataFrame):
+        return frame.to_dict('records')
+    return frame
+
+
+def report_key(bundle) -> str:
+    """Content hash of the data shown in the report"""
+    content = {
+        'version': REPORT_VERSION,
+        'project': dict(bundle.project),
+        **{section: _records(getattr(bundle, section)) for section in REPORT_SECTIONS}
+    }
+    payload = json.dumps(content, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ReportJob:
+    """One PDF report request"""
+
+    def __init__(self, project_id, key, bundle=None):
+        self.project_id = project_id
+        self.key = key
+        self.bundle = bundle
+        self.status = 'queued'
+        self.pdf: Optional[bytes] = None
+        self.error = None
+        self.cached = False
+        self.created_at = time.time()
+        self.finished_at = None
+        self._done = threading.Event()
+
+    @property
+    def file_name(self) -> str:
+        return f"Project_{self.bundle.project['project_code']}.pdf"
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished_at or time.time()) - self.created_at
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the report is done or failed"""
+        return self._done.wait(timeout)
+
+    def _finish(self, status, pdf=None, error=None):
+        self.pdf, self.error, self.status = pdf, error, status
+        self.finished_at = time.time()
+        self._done.set()
+
+
+class ReportService:
+    """
+    PDF report queue served by `workers` threads
+    Finished PDFs are kept in an LRU cache keyed by report_key(bundle)
+    """
+
+    def __init__(self, database, workers: int = 2, cache_size: int = 32):
+        """
+        Args:
+            database: ProjectDatabase instance (bundles of submit(project_id))
+            workers: Number of worker threads
+            cache_size: PDFs kept in memory
+        """
+        self.db = database
+        self.workers = workers
+        self.cache_size = cache_size
+        self._queue = queue.Queue()
+        self._cache = OrderedDict()  # key -> pdf bytes
+        self._pending: Dict[str, ReportJob] = {}
+        self._latest: Dict[int, ReportJob] = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self.stats = {'rendered': 0, 'cache_hits': 0, 'failed': 0}
+
+    def start(self):
+        """Register the fonts and start the worker threads"""
+        setup_vietnamese_font()
+        with self._lock:
+            if self._threads:
+                return self
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"report-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def submit(self, project_id: int, bundle=None) -> ReportJob:
+        """
+        Queue the PDF report of a project
+        Returns a finished job at once when the same content was rendered before,
+        or the job already queued for it
+        """
+        if bundle is None:
+            bundle = self.db.get_project_bundle(project_id, sections=REPORT_SECTIONS)
+        key = report_key(bundle)
+
+        with self._lock:
+            pdf = self._cache.get(key)
+            if pdf is not None:
+                self._cache.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                job = ReportJob(project_id, key, bundle)
+                job.cached = True
+                job._finish('done', pdf)
+            elif key in self._pending:
+                job = self._pending[key]
+            else:
+                job = ReportJob(project_id, key, bundle)
+                self._pending[key] = job
+                self._queue.put(job)
+            self._latest[project_id] = job
+
+        if not self._threads:
+            self.start()
+        return job
+
+    def job(self, project_id: int) -> Optional[ReportJob]:
+        """Latest job of the project (None if never requested)"""
+        return self._latest.get(project_id)
+
+    def _render(self, job):
+        bundle = job.bundle
+        return create_project_pdf(bundle.project, bundle.team_members, bundle.stakeholders,
+                                  bundle.tasks, bundle.signoffs)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            job.status = 'running'
+            try:
+                pdf = self._render(job)
+                with self._lock:
+                    self._cache[job.key] = pdf
+                    self._cache.move_to_end(job.key)
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+                    self._pending.pop(job.key, None)
+                    self.stats['rendered'] += 1
+                job._finish('done', pdf)
+            except Exception as e:
+                print(f"Error rendering report for project {job.project_id}: {e}")
+                with self._lock:
+                    self._pending.pop(job.key, None)
+                    self.stats['failed'] += 1
+                job._finish('failed', error=str(e))
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,115 @@
+"""
+Search Index Module
+Chuẩn hóa văn bản tiếng Việt cho tìm kiếm toàn văn: bỏ dấu (ấ -> a, đ -> d), chữ thường
+Gõ "giam thoi gian cho" hay "Giảm thời gian chờ" đều tìm được cùng kết quả
+Định nghĩa các nguồn được đánh chỉ mục (dự án, bình luận, biên bản họp, tài liệu, hoạt động)
+"""
+
+import re
+import unicodedata
+
+# entity type -> (table, project id column, title columns, body columns)
+# Title words rank above body words
+SEARCH_SOURCES = {
+    'project': ('projects', 'id', ('project_code', 'project_name'),
+                ('department', 'category', 'status', 'description', 'problem_statement', 'goal', 'scope')),
+    'comment': ('project_comments', 'project_id', ('author',), ('comment_text',)),
+    'meeting': ('meeting_minutes', 'project_id', ('meeting_title',),
+                ('location', 'agenda', 'discussion_notes', 'decisions', 'next_meeting_agenda', 'attendees')),
+    'document': ('project_documents', 'project_id', ('document_name',),
+                 ('document_type', 'document_category', 'tags', 'description')),
+    'activity': ('activity_log', 'project_id', ('user',),
+                 ('activity_type', 'activity_description', 'affected_field', 'old_value', 'new_value')),
+}
+SEARCH_ENTITY_LABELS = {
+    'project': 'Dự án',
+    'comment': 'Bình luận',
+    'meeting': 'Biên bản họp',
+    'document': 'Tài liệu',
+    'activity': 'Hoạt động',
+}
+# Longest indexed body (characters); the rest of very long notes is not searchable
+SEARCH_BODY_LIMIT = 100000
+SNIPPET_LENGTH = 160
+
+
+def _fold_table():
+    """Precomposed Latin letters (Vietnamese included) -> base letter, one character each"""
+    table = {ord('đ'): 'd', ord('Đ'): 'D'}
+    for code in list(range(0x00C0, 0x0250)) + list(range(0x1E00, 0x1F00)):
+        char = chr(code)
+        base = ''.join(c for c in unicodedata.normalize('NFD', char) if not unicodedata.combining(c))
+        if len(base) == 1 and base != char:
+            table[code] = base
+    return table
+
+
+_FOLD = _fold_table()
+_TERM = re.compile(r'[0-9a-z]+')
+
+
+def normalize_text(value) -> str:
+    """Text of a column value (lists / dicts of JSON columns flattened), NFC"""
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return ' '.join(normalize_text(item) for item in value)
+    if isinstance(value, dict):
+        return ' '.join(normalize_text(item) for item in value.values())
+    return unicodedata.normalize('NFC', str(value))
+
+
+def fold_text(value) -> str:
+    """
+    Lower case without diacritics: 'Giảm thời gian chờ' -> 'giam thoi gian cho'
+    Each character of NFC text maps to one character, so positions in the folded
+    text are positions in the original (used for snippets)
+    """
+    return normalize_text(value).translate(_FOLD).lower()
+
+
+def query_terms(query):
+    """Search words of a user query (folded, letters and digits only)"""
+    return _TERM.findall(fold_text(query))
+
+
+def search_entry(entity_type, row):
+    """
+    search_documents values of a source row (a mapping with the SEARCH_SOURCES columns)
+    """
+    _, project_column, title_columns, body_columns = SEARCH_SOURCES[entity_type]
+    title = ' · '.join(text for text in (normalize_text(row[c]).strip() for c in title_columns) if text)
+    body = '\n'.join(text for text in (normalize_text(row[c]).strip() for c in body_columns) if text)
+    body = body[:SEARCH_BODY_LIMIT]
+    return {
+        'entity_type': entity_type,
+        'entity_id': row['id'],
+        'project_id': row[project_column],
+        'title': title,
+        'body': body,
+        'title_folded': fold_text(title),
+        'body_folded': fold_text(body),
+    }
+
+
+def snippet(body, terms, length=SNIPPET_LENGTH):
+    """Part of the body around the first query word, with the words in **bold**"""
+    body = body or ''
+    folded = fold_text(body)
+    starts = [folded.find(term) for term in terms if folded.find(term) >= 0]
+    start = max(min(starts) - length // 3, 0) if starts else 0
+    end = min(start + length, len(body))
+
+    marks = []
+    for term in terms:
+        for match in re.finditer(re.escape(term), folded[start:end]):
+            marks.append((match.start() + start, match.end() + start))
+    text, position = [], start
+    for mark_start, mark_end in sorted(marks):
+        if mark_start < position:
+            continue
+        text.append(body[position:mark_start])
+        text.append(f"**{body[mark_start:mark_end]}**")
+        position = mark_end
+    text.append(body[position:end])
+    return ('…' if start > 0 else '') + ''.join(text).replace('\n', ' ') + ('…' if end < len(body) else '')
@@ -0,0 +1,84 @@
+"""
+Test script - Verify the action_items table: meeting items stored as rows,
+migration of the JSON arrays of older versions and the cross-project queries
+Run: python test_action_items.py  (or: python -m pytest test_action_items.py)
+"""
+
+from datetime import date
+
+from sqlalchemy import text
+
+from database import migrate_action_items
+from test_helpers import temp_database
+
+
+def test_meeting_items_become_rows_and_open_items_span_projects():
+    with temp_database() as db:
+        p1 = db.add_project({'project_code': 'P1', 'project_name': 'a', 'department': 'Khoa Nội'})
+        p2 = db.add_project({'project_code': 'P2', 'project_name': 'b', 'department': 'Khoa Ngoại'})
+        m1 = db.add_meeting({'project_id': p1, 'meeting_title': 'Họp 1', 'meeting_date': '2024-03-01', 'action_items': [
+            {'description': 'Đo thời gian chờ', 'owner': 'Lan', 'due_date': '2024-03-10', 'status': 'Completed'},
+            {'description': 'Vẽ lưu đồ', 'owner': 'Lan', 'due_date': '2024-03-05', 'status': 'In Progress'},
+            {'description': 'Phỏng vấn', 'owner': 'Minh'},
+        ]})
+        db.add_action_item({'project_id': p2, 'item_description': 'Thu thập dữ liệu', 'assigned_to': 'Lan',
+                            'due_date': date(2024, 3, 1), 'status': 'Open'})
+
+        assert db.get_meeting(m1)['action_items'] is None
+        assert list(db.get_action_items(meeting_id=m1)['item_description']) == \
+            ['Vẽ lưu đồ', 'Đo thời gian chờ', 'Phỏng vấn']
+
+        mine = db.get_open_action_items(assigned_to='Lan')
+        assert list(mine['item_description']) == ['Thu thập dữ liệu', 'Vẽ lưu đồ']
+        assert list(mine['project_code']) == ['P2', 'P1']
+
+        overdue = db.get_open_action_items(department='Khoa Nội', due_before='2024-03-06')
+        assert list(overdue['item_description']) == ['Vẽ lưu đồ']
+        assert overdue['meeting_title'].iloc[0] == 'Họp 1'
+
+        item_id = int(overdue['id'].iloc[0])
+        db.update_action_item(item_id, {'status': 'Completed'})
+        assert db.get_action_item(item_id)['status'] == 'Completed'
+        db.delete_meeting(m1)
+        assert db.get_action_items(project_id=p1).empty
+
+
+def test_migrates_json_action_items_of_older_versions():
+    with temp_database() as db:
+        project_id = db.add_project({'project_code': 'P1', 'project_name': 'a'})
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO meeting_minutes (project_id, meeting_title, action_items) VALUES (:p, 'Cũ', :items)"
+            ), {'p': project_id, 'items': '[{"description": "Cập nhật SOP", "owner": "Hoa", '
+                                          '"due_date": "không rõ"}, "Báo cáo", {"owner": "X"}]'})
+
+        migrate_action_items(db.engine)
+        migrate_action_items(db.engine)  # second run finds nothing to move
+
+        items = db.get_action_items(project_id=project_id)
+        assert list(items['item_description']) == ['Cập nhật SOP', 'Báo cáo']
+        assert list(items['assigned_to'].fillna('')) == ['Hoa', '']
+        assert set(items['status']) == {'Open'} and items['due_date'].isna().all()
+
+        with db.engine.connect() as conn:
+            plan = ' '.join(str(row[-1]) for row in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM action_items WHERE project_id = 1 AND status = 'Open' "
+                "ORDER BY due_date"
+            )))
+        assert 'ix_action_items_project_status_due' in plan
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING action items")
+    print("=" * 60)
+
+    test_meeting_items_become_rows_and_open_items_span_projects()
+    print("✅ Test 1: Meeting items are rows; open items are queried across projects")
+
+    test_migrates_json_action_items_of_older_versions()
+    print("✅ Test 2: JSON action items of older versions are migrated")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,174 @@
+"""
+Test script - Verify the document blob store: content addressed by SHA-256,
+identical files stored once, chunked reads and metadata-only rows in the database
+Run: python test_blob_store.py  (or: python -m pytest test_blob_store.py)
+"""
+
+import base64
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from blob_store import BlobStore, LocalBlobStore, S3BlobStore
+from test_helpers import temp_database
+
+
+class MemoryS3Client:
+    """Local stand-in for the boto3 S3 client methods used by S3BlobStore"""
+
+    def __init__(self):
+        self.objects = {}
+        self.modified = {}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise KeyError(Key)
+        return {'ContentLength': len(self.objects[Bucket, Key]), 'LastModified': self.modified[Bucket, Key]}
+
+    def upload_fileobj(self, fileobj, bucket, key):
+        self.objects[bucket, key] = fileobj.read()
+        self.modified[bucket, key] = datetime.now(timezone.utc)
+
+    def copy_object(self, Bucket, Key, CopySource, MetadataDirective):
+        source = (CopySource['Bucket'], CopySource['Key'])
+        if source not in self.objects:
+            raise KeyError(Key)
+        self.objects[Bucket, Key] = self.objects[source]
+        self.modified[Bucket, Key] = datetime.now(timezone.utc)
+
+    def get_object(self, Bucket, Key):
+        return {'Body': io.BytesIO(self.objects[Bucket, Key])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+def test_stores_deduplicate_and_stream_chunks():
+    directory = tempfile.mkdtemp()
+    content = os.urandom(300_000)
+    key = hashlib.sha256(content).hexdigest()
+    try:
+        client = MemoryS3Client()
+        for store in (LocalBlobStore(directory), S3BlobStore(client, 'docs', 'blobs/')):
+            assert store.put(content) == (key, len(content))
+            assert store.put(io.BytesIO(content)) == (key, len(content))  # already there
+            chunks = list(store.open_chunks(key, chunk_size=100_000))
+            assert [len(chunk) for chunk in chunks] == [100_000] * 3 and b''.join(chunks) == content
+            assert store.size(key) == len(content)
+            assert store.touch(key) and time.time() - store.modified(key) < 60
+            store.delete(key)
+            assert not store.exists(key)
+            assert not store.touch(key) and store.modified(key) is None
+
+        assert list(client.objects) == []
+        files = [name for _, _, names in os.walk(directory) for name in names]
+        assert files == []  # no leftover partial files
+
+        # The generic put() (spool + _save) stores local blobs the same way
+        local = LocalBlobStore(directory)
+        assert BlobStore.put(local, content) == (key, len(content)) and local.read(key) == content
+
+        class IncompleteStore(BlobStore):
+            def exists(self, key):
+                return False
+        try:
+            IncompleteStore()
+            assert False, "incomplete store created"
+        except TypeError:
+            pass
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_documents_keep_only_the_hash_in_the_database():
+    with temp_database(blobs=True) as db:
+        store = db.blob_store
+        project_id = db.add_project({'project_code': 'P1', 'project_name': 'a'})
+        content = b'%PDF A3 report' * 1000
+
+        first = db.add_document({'project_id': project_id, 'document_name': 'A3'}, content=content)
+        second = db.add_document({'project_id': project_id, 'document_name': 'A3 (copy)'},
+                                 content=io.BytesIO(content))
+        db.add_document_version({'document_id': first, 'version_number': 1}, content=content)
+        document = db.get_document(first)
+        assert 'file_content' not in document and document['file_size'] == len(content)
+        assert document['content_hash'] == hashlib.sha256(content).hexdigest()
+        assert b''.join(db.iter_document_content(first)) == content
+        assert b''.join(db.iter_document_content(first, version_number=1)) == content
+
+        # One blob for three rows; removed with the last row using it
+        db.delete_document(first)
+        assert store.exists(document['content_hash'])
+        db.delete_project(project_id)
+        assert store.exists(document['content_hash'])  # written just now: kept for the grace period
+        assert db.sweep_blobs(grace=timedelta(0)) == 1
+        assert not store.exists(document['content_hash'])
+
+
+def test_blob_reused_by_an_upload_in_progress_is_not_deleted():
+    with temp_database(blobs=True) as db:
+        store = db.blob_store
+        project_id = db.add_project({'project_code': 'P1', 'project_name': 'a'})
+        old = db.add_document({'project_id': project_id, 'document_name': 'A3'}, content=b'A3 report')
+        key = db.get_document(old)['content_hash']
+        an_hour_ago = time.time() - 3600
+        os.utime(store._path(key), (an_hour_ago, an_hour_ago))
+
+        # Another session uploads the same content: the blob is reused before its row is committed
+        assert store.put(b'A3 report')[0] == key
+        db.delete_document(old)
+        assert store.exists(key) and db.sweep_blobs() == 0
+        new = db.add_document({'project_id': project_id, 'document_name': 'A3'}, content=b'A3 report')
+        assert db.sweep_blobs(grace=timedelta(0)) == 0  # referenced again: dropped from the queue
+        assert b''.join(db.iter_document_content(new)) == b'A3 report'
+
+        # Unused and not touched for the grace period: deleted with the row
+        os.utime(store._path(key), (an_hour_ago, an_hour_ago))
+        db.delete_document(new)
+        assert not store.exists(key)
+
+
+def test_base64_rows_of_older_versions_are_migrated():
+    with temp_database(blobs=True) as db:
+        project_id = db.add_project({'project_code': 'P1', 'project_name': 'a'})
+        with db.engine.begin() as conn:
+            for i in range(3):
+                conn.execute(text(
+                    "INSERT INTO project_documents (project_id, document_name, file_content, is_latest) "
+                    "VALUES (:p, :n, :c, :latest)"
+                ), {'p': project_id, 'n': f'SOP {i}', 'c': base64.b64encode(b'SOP').decode(), 'latest': True})
+        assert b''.join(db.iter_document_content(1)) == b'SOP'  # readable before the migration
+
+        assert db.migrate_document_blobs(batch_size=2) == {'project_documents': 3, 'document_versions': 0}
+        with db.engine.connect() as conn:
+            rows = conn.execute(text("SELECT file_content, content_hash FROM project_documents")).all()
+        assert {row.file_content for row in rows} == {None} and len({row.content_hash for row in rows}) == 1
+        assert b''.join(db.iter_document_content(3)) == b'SOP'
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING blob store")
+    print("=" * 60)
+
+    test_stores_deduplicate_and_stream_chunks()
+    print("✅ Test 1: Stores deduplicate content and stream chunks")
+
+    test_documents_keep_only_the_hash_in_the_database()
+    print("✅ Test 2: Documents keep only the content hash in the database")
+
+    test_blob_reused_by_an_upload_in_progress_is_not_deleted()
+    print("✅ Test 3: Blobs reused by an upload in progress are not deleted")
+
+    test_base64_rows_of_older_versions_are_migrated()
+    print("✅ Test 4: Base64 rows of older versions are migrated")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
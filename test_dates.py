@@ -0,0 +1,119 @@
+"""
+Test script - Verify native date columns, write coercion and the migration
+of text dates written by older versions
+Run: python test_dates.py  (or: python -m pytest test_dates.py)
+"""
+
+import sqlite3
+from datetime import date, datetime
+
+import pandas as pd
+
+from database import ProjectDatabase, migrate_date_columns, parse_legacy_date
+from test_helpers import temp_database, temp_db_path
+
+
+def test_writes_accept_strings_and_reads_return_datetime64():
+    with temp_database() as db:
+        project_id = db.add_project({
+            'project_code': 'P1', 'project_name': 'Dự án', 'start_date': '2024-03-01',
+            'end_date': date(2024, 6, 30)
+        })
+        db.add_task({'project_id': project_id, 'task_name': 'Đo', 'start_date': '2024-03-05T08:30:00',
+                     'end_date': ''})
+        db.add_signoff({'project_id': project_id, 'role': 'Trưởng khoa', 'date': datetime(2024, 7, 1, 9)})
+
+        bundle = db.get_project_bundle(project_id, sections=('tasks', 'signoffs'))
+        assert bundle.project['start_date'] == pd.Timestamp('2024-03-01')
+        assert isinstance(bundle.project['created_at'], pd.Timestamp)
+        assert bundle.tasks['start_date'].iloc[0] == pd.Timestamp('2024-03-05')
+        assert bundle.tasks['end_date'].isna().all()
+        assert pd.api.types.is_datetime64_any_dtype(bundle.signoffs['date'])
+        assert pd.api.types.is_datetime64_any_dtype(db.get_all_projects()['created_at'])
+
+
+def test_migrates_text_dates_of_older_versions():
+    with temp_db_path() as path:
+        legacy = sqlite3.connect(path)
+        legacy.execute(
+            "CREATE TABLE projects (id INTEGER PRIMARY KEY, project_code VARCHAR(50) UNIQUE NOT NULL, "
+            "project_name TEXT NOT NULL, department VARCHAR(200), start_date VARCHAR(20), end_date VARCHAR(20), "
+            "status VARCHAR(50), category VARCHAR(100), methodology VARCHAR(20), description TEXT, "
+            "problem_statement TEXT, goal TEXT, scope TEXT, budget FLOAT, actual_cost FLOAT, "
+            "created_at VARCHAR(30), updated_at VARCHAR(30))"
+        )
+        legacy.executemany(
+            "INSERT INTO projects (project_code, project_name, start_date, end_date, created_at) VALUES (?, ?, ?, ?, ?)",
+            [('A', 'a', '2024-01-15', '', '2024-02-01T10:00:00.123456'),
+             ('B', 'b', '2024-01-20T00:00:00', 'chưa rõ', '2024-01-01T08:00:00')]
+        )
+        legacy.commit()
+        legacy.close()
+
+        db = ProjectDatabase(f"sqlite:///{path}")
+        projects = db.get_all_projects()
+        assert list(projects['project_code']) == ['A', 'B']  # ORDER BY created_at on real timestamps
+        assert list(projects['start_date']) == [pd.Timestamp('2024-01-15'), pd.Timestamp('2024-01-20')]
+        assert projects['end_date'].isna().all()
+
+        # Rows of the old format can be loaded and updated through the ORM
+        db.update_project(int(projects['id'].iloc[1]), {'end_date': '2024-12-31'})
+        assert db.get_project_bundle(int(projects['id'].iloc[1]), sections=()).project['end_date'] == \
+            pd.Timestamp('2024-12-31')
+
+
+def test_non_iso_dates_are_converted_and_unreadable_ones_kept():
+    assert parse_legacy_date('15/01/2024') == datetime(2024, 1, 15)
+    assert parse_legacy_date('2024-02-30') is None
+    with temp_db_path() as path:
+        legacy = sqlite3.connect(path)
+        legacy.execute(
+            "CREATE TABLE project_tasks (id INTEGER PRIMARY KEY, project_id INTEGER, phase VARCHAR(50), "
+            "task_name TEXT, start_date VARCHAR(20), end_date VARCHAR(20))"
+        )
+        legacy.executemany(
+            "INSERT INTO project_tasks (project_id, task_name, start_date, end_date) VALUES (1, ?, ?, ?)",
+            [('a', '15/01/2024', '2024-02-30'), ('b', '01.03.2024', 'chưa rõ')]
+        )
+        legacy.commit()
+        legacy.close()
+
+        url = f"sqlite:///{path}"
+        db = ProjectDatabase(url)
+        tasks = db.get_tasks(1)
+        assert list(tasks['start_date']) == [pd.Timestamp('2024-01-15'), pd.Timestamp('2024-03-01')]
+        assert tasks['end_date'].isna().all()
+
+        kept = sqlite3.connect(path)
+        assert kept.execute(
+            "SELECT row_id, value FROM legacy_values WHERE table_name = 'project_tasks' ORDER BY row_id"
+        ).fetchall() == [('1', '2024-02-30'), ('2', 'chưa rõ')]
+        assert kept.execute(
+            "SELECT COUNT(*) FROM schema_migrations WHERE name = 'dates:project_tasks.end_date'"
+        ).fetchone() == (1,)
+        # Done once: later starts leave the column alone
+        kept.execute("UPDATE project_tasks SET phase = 'x', end_date = '31/12/2024' WHERE id = 1")
+        kept.commit()
+        migrate_date_columns(url)
+        assert kept.execute("SELECT end_date FROM project_tasks WHERE id = 1").fetchone() == ('31/12/2024',)
+        assert kept.execute("SELECT COUNT(*) FROM legacy_values").fetchone() == (2,)
+        kept.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING date columns")
+    print("=" * 60)
+
+    test_writes_accept_strings_and_reads_return_datetime64()
+    print("✅ Test 1: Writes accept strings, reads return datetime64")
+
+    test_migrates_text_dates_of_older_versions()
+    print("✅ Test 2: Text dates of older versions are migrated")
+
+    test_non_iso_dates_are_converted_and_unreadable_ones_kept()
+    print("✅ Test 3: dd/mm/yyyy dates converted, unreadable ones kept in legacy_values")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,55 @@
+"""
+Test script - Verify the deadline reminder batch (one query for all projects)
+and the dry-run report
+Run: python test_deadline_reminders.py  (or: python -m pytest test_deadline_reminders.py)
+"""
+
+from datetime import date, timedelta
+
+from collaboration import check_deadlines_and_notify
+from test_helpers import temp_database
+
+
+def test_reminder_batch_matches_windows_and_recipients():
+    with temp_database() as db:
+        today = date.today()
+        p1 = db.add_project({'project_code': 'P1', 'project_name': 'Giảm thời gian chờ'})
+        p2 = db.add_project({'project_code': 'P2', 'project_name': 'An toàn thuốc'})
+        db.add_team_member({'project_id': p1, 'name': 'Nguyễn Lan', 'email': 'lan@bv.vn'})
+        db.add_team_member({'project_id': p1, 'name': 'nguyễn lan', 'email': 'lan2@bv.vn'})
+        db.add_team_member({'project_id': p1, 'name': 'Minh', 'email': ''})
+        db.add_team_member({'project_id': p2, 'name': 'Hoa', 'email': 'hoa@bv.vn'})
+
+        def task(project_id, name, offset, responsible, status='Đang thực hiện'):
+            db.add_task({'project_id': project_id, 'task_name': name, 'responsible': responsible,
+                         'end_date': today + timedelta(days=offset), 'status': status, 'progress': 40})
+
+        task(p1, 'Đo lường', 7, 'Nguyễn Lan')
+        task(p1, 'Phân tích', 3, 'Minh')                   # no email
+        task(p1, 'Cải tiến', 1, 'Nguyễn Lan', 'Hoàn thành')  # done
+        task(p1, 'Kiểm soát', 2, 'Nguyễn Lan')             # not a reminder day
+        task(p2, 'Xác định', 1, 'Hoa')
+        task(p2, 'Báo cáo', 3, 'Không có trong nhóm')
+
+        batch = db.get_deadline_reminders()
+        assert list(zip(batch['task_name'], batch['recipient_email'], batch['days_left'])) == [
+            ('Xác định', 'hoa@bv.vn', 1), ('Đo lường', 'lan@bv.vn', 7)
+        ]
+        assert list(batch['project_name']) == ['An toàn thuốc', 'Giảm thời gian chờ']
+        assert len(db.get_deadline_reminders(days=range(0, 8))) == 3
+
+        report = check_deadlines_and_notify(db, dry_run=True)
+        assert report['reminders'] == 2 and report['sent'] == 0 and report['seconds'] >= 0
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING deadline reminders")
+    print("=" * 60)
+
+    test_reminder_batch_matches_windows_and_recipients()
+    print("✅ Test 1: One query builds the 7/3/1-day reminder batch")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
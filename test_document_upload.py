@@ -0,0 +1,126 @@
+"""
+Test script - Verify chunked document uploads: parts written to the blob store,
+resume after a dropped connection, checksums and constant memory use
+Run: python test_document_upload.py  (or: python -m pytest test_document_upload.py)
+"""
+
+import hashlib
+import os
+import random
+import tracemalloc
+from contextlib import contextmanager
+from datetime import timedelta
+
+from test_helpers import temp_database
+
+
+@contextmanager
+def _database():
+    with temp_database(blobs=True) as db:
+        yield db, db.add_project({'project_code': 'P1', 'project_name': 'a'})
+
+
+def _blob_count(directory):
+    return sum(len(names) for _, _, names in os.walk(directory))
+
+
+def _expect_error(action, error=ValueError):
+    try:
+        action()
+        assert False, f"{error.__name__} expected"
+    except error:
+        pass
+
+
+def test_upload_resumes_after_a_dropped_connection():
+    with _database() as (db, project_id):
+        content = random.Random(1).randbytes(250_000)
+        parts = [content[i:i + 100_000] for i in range(0, len(content), 100_000)]
+        upload_id = db.start_document_upload(
+            {'project_id': project_id, 'document_name': 'SOP.pdf', 'mime_type': 'application/pdf'},
+            total_size=len(content), sha256=hashlib.sha256(content).hexdigest(), chunk_size=100_000)
+
+        db.put_document_upload_part(upload_id, 0, parts[0])
+        db.put_document_upload_part(upload_id, 1, parts[1][:50_000] + bytes(50_000))  # corrupted in transit
+        # Connection lost: the client asks where to continue
+        state = db.get_document_upload(upload_id)
+        assert (state['status'], state['parts'], state['next_part'], state['received_bytes']) == \
+            ('open', [0, 1], 2, 200_000)
+
+        db.put_document_upload_part(upload_id, 1, parts[1], sha256=hashlib.sha256(parts[1]).hexdigest())
+        db.put_document_upload_part(upload_id, 2, parts[2])
+        document_id = db.complete_document_upload(upload_id)
+
+        assert b''.join(db.iter_document_content(document_id)) == content
+        document = db.get_document(document_id)
+        assert (document['document_name'], document['file_size']) == ('SOP.pdf', len(content))
+        state = db.get_document_upload(upload_id)
+        assert (state['status'], state['document_id'], state['parts']) == ('completed', document_id, [])
+        db.sweep_blobs(grace=timedelta(0))
+        assert _blob_count(db.blob_store.directory) == 1  # part blobs released, only the file is left
+        _expect_error(lambda: db.put_document_upload_part(upload_id, 0, parts[0]))
+
+
+def test_parts_and_file_are_checked():
+    with _database() as (db, project_id):
+        _expect_error(lambda: db.start_document_upload({'project_id': project_id}))
+        _expect_error(lambda: db.start_document_upload({'project_id': project_id, 'document_name': 'a',
+                                                        'file_content': 'QQ=='}))
+        upload_id = db.start_document_upload({'project_id': project_id, 'document_name': 'a'},
+                                             total_size=25, sha256='0' * 64, chunk_size=10)
+        _expect_error(lambda: db.put_document_upload_part(upload_id, 0, b'x' * 9))    # short part
+        _expect_error(lambda: db.put_document_upload_part(upload_id, 2, b'x' * 10))   # last part is 5 bytes
+        _expect_error(lambda: db.put_document_upload_part(upload_id, 3, b'x' * 5))    # past the end
+        _expect_error(lambda: db.put_document_upload_part(upload_id, 0, b'x' * 10, sha256='0' * 64))
+        _expect_error(lambda: db.put_document_upload_part('missing', 0, b'x'), KeyError)
+
+        db.put_document_upload_part(upload_id, 0, b'x' * 10)
+        db.put_document_upload_part(upload_id, 2, b'x' * 5)
+        _expect_error(lambda: db.complete_document_upload(upload_id))  # part 1 missing
+        db.put_document_upload_part(upload_id, 1, b'y' * 10)
+        _expect_error(lambda: db.complete_document_upload(upload_id))  # file checksum
+        assert db.get_document_upload(upload_id)['status'] == 'open' and db.get_documents(project_id).empty
+
+        assert db.expire_document_uploads(max_age=timedelta(0)) == 1
+        db.sweep_blobs(grace=timedelta(0))
+        assert db.get_document_upload(upload_id) is None and _blob_count(db.blob_store.directory) == 0
+
+
+def test_memory_does_not_grow_with_file_size():
+    with _database() as (db, project_id):
+        chunk_size = 2 * 1024 * 1024
+        rng = random.Random(5)
+
+        def upload(parts):
+            upload_id = db.start_document_upload({'project_id': project_id, 'document_name': 'big.bin'},
+                                                 chunk_size=chunk_size)
+            tracemalloc.start()
+            for number in range(parts):
+                db.put_document_upload_part(upload_id, number, rng.randbytes(chunk_size))
+            document_id = db.complete_document_upload(upload_id)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert db.get_document(document_id)['file_size'] == parts * chunk_size
+            return peak
+
+        small, large = upload(2), upload(16)  # 4 MB vs 32 MB
+        assert large < small + chunk_size and large < 4 * chunk_size
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING document upload")
+    print("=" * 60)
+
+    test_upload_resumes_after_a_dropped_connection()
+    print("✅ Test 1: Uploads resume after a dropped connection")
+
+    test_parts_and_file_are_checked()
+    print("✅ Test 2: Part sizes and checksums are checked")
+
+    test_memory_does_not_grow_with_file_size()
+    print("✅ Test 3: Memory does not grow with the file size")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,112 @@
+"""
+Test script - Verify document version storage: content-defined chunks shared
+between versions, exact reconstruction, storage report and blob clean-up
+Run: python test_document_versions.py  (or: python -m pytest test_document_versions.py)
+"""
+
+import base64
+import os
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from test_helpers import temp_database
+from version_store import CHUNK_MAX_SIZE, CHUNK_MIN_SIZE, content_chunks
+
+
+@contextmanager
+def _database():
+    with temp_database(blobs=True) as db:
+        yield db, db.add_project({'project_code': 'P1', 'project_name': 'a'})
+
+
+def _blob_count(directory):
+    return sum(len(names) for _, _, names in os.walk(directory))
+
+
+def _edit(content, rng):
+    """Replace a few bytes and insert a few bytes somewhere in the file"""
+    at = rng.randrange(len(content) - 100)
+    return content[:at] + rng.randbytes(rng.randrange(1, 50)) + content[at + rng.randrange(1, 50):]
+
+
+def test_chunks_are_content_defined():
+    rng = random.Random(7)
+    content = rng.randbytes(2_000_000)
+    chunks = list(content_chunks(content))
+    assert b''.join(chunks) == content
+    assert all(CHUNK_MIN_SIZE <= len(chunk) <= CHUNK_MAX_SIZE for chunk in chunks[:-1])
+
+    # An insertion near the start shifts every byte after it, but only the chunk around it changes
+    edited = content[:1000] + b'chen them' + content[1000:]
+    new = set(content_chunks(edited)) - set(chunks)
+    assert len(new) == 1 and list(content_chunks(b'')) == []
+
+
+def test_versions_share_unchanged_chunks():
+    with _database() as (db, project_id):
+        rng = random.Random(1)
+        content = rng.randbytes(1_000_000)
+        document_id = db.add_document({'project_id': project_id, 'document_name': 'A3'}, content=content)
+        versions = []
+        for number in range(1, 31):
+            db.add_document_version({'document_id': document_id, 'version_number': number}, content=content)
+            versions.append(content)
+            content = _edit(content, rng)
+
+        for number in (1, 15, 30):
+            assert b''.join(db.iter_document_content(document_id, number)) == versions[number - 1]
+
+        report = db.get_document_storage(document_id)
+        assert report['versions'] == 30 and report['logical_bytes'] == sum(map(len, versions))
+        # 30 full copies would be ~30 MB: each edit only adds the chunk(s) around it
+        assert report['stored_bytes'] < 5 * len(versions[0])
+        assert report['saved_ratio'] > 0.8 and report['reconstruct_ms'] is not None
+        assert report['unique_chunks'] < report['chunks']
+
+        db.delete_document(document_id)
+        db.sweep_blobs(grace=timedelta(0))
+        assert _blob_count(db.blob_store.directory) == 0
+
+
+def test_older_versions_are_migrated_to_chunks():
+    with _database() as (db, project_id):
+        content = random.Random(3).randbytes(300_000)
+        document_id = db.add_document({'project_id': project_id, 'document_name': 'SOP'}, content=content)
+        key, size = db.blob_store.put(content + b'v2')
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO document_versions (document_id, version_number, file_content) VALUES (:d, 1, :c)"
+            ), {'d': document_id, 'c': base64.b64encode(content).decode()})
+            conn.execute(text(
+                "INSERT INTO document_versions (document_id, version_number, content_hash, file_size) "
+                "VALUES (:d, 2, :k, :s)"
+            ), {'d': document_id, 'k': key, 's': size})
+
+        assert db.migrate_document_blobs(batch_size=1) == {'project_documents': 0, 'document_versions': 2}
+        db.sweep_blobs(grace=timedelta(0))
+        assert not db.blob_store.exists(key)  # the whole-file blob was replaced by chunks
+        assert b''.join(db.iter_document_content(document_id, 1)) == content
+        assert b''.join(db.iter_document_content(document_id, 2)) == content + b'v2'
+        assert db.get_document_storage(document_id, measure=False)['stored_bytes'] < 2 * len(content)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING document versions")
+    print("=" * 60)
+
+    test_chunks_are_content_defined()
+    print("✅ Test 1: Chunk boundaries follow the content")
+
+    test_versions_share_unchanged_chunks()
+    print("✅ Test 2: Versions share unchanged chunks")
+
+    test_older_versions_are_migrated_to_chunks()
+    print("✅ Test 3: Older versions are migrated to chunks")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,140 @@
+"""
+Test script - Verify the email outbox: queued emails are sent by the worker
+pool over reused SMTP connections, failures are retried with backoff
+Uses a small local SMTP server as the mail server
+Run: python test_email_outbox.py  (or: python -m pytest test_email_outbox.py)
+"""
+
+import socketserver
+import threading
+import time
+
+from email_outbox import EmailOutbox, SmtpTransport
+from test_helpers import temp_database
+
+
+class LocalSmtpServer(socketserver.ThreadingTCPServer):
+    """Minimal SMTP server keeping received messages (optionally hangs up after N messages)"""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, hang_up_after=None):
+        super().__init__(('127.0.0.1', 0), LocalSmtpHandler)
+        self.messages = []
+        self.connections = 0
+        self.hang_up_after = hang_up_after
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+class LocalSmtpHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connections += 1
+        received = 0
+        self.reply("220 localhost ready")
+        while True:
+            line = self.rfile.readline().decode(errors='replace').strip()
+            command = line[:4].upper()
+            if not line or command == 'QUIT':
+                self.reply("221 bye")
+                return
+            if command == 'EHLO':
+                self.reply("250 localhost")
+            elif command == 'DATA':
+                self.reply("354 end with .")
+                data = []
+                while True:
+                    chunk = self.rfile.readline().decode(errors='replace')
+                    if chunk.rstrip('\r\n') == '.':
+                        break
+                    data.append(chunk)
+                self.server.messages.append(''.join(data))
+                self.reply("250 queued")
+                received += 1
+                if self.server.hang_up_after and received >= self.server.hang_up_after:
+                    return
+            else:
+                self.reply("250 ok")
+
+
+class FlakyTransport:
+    """Transport failing for one recipient"""
+    def __init__(self, failing):
+        self.failing = failing
+        self.sent = []
+
+    def send(self, email):
+        if email['recipient_email'] == self.failing:
+            raise ConnectionError("mailbox unavailable")
+        self.sent.append(email['recipient_email'])
+
+    def close(self):
+        pass
+
+
+def _emails(count):
+    return [{'recipient_email': f'user{i}@bv.vn', 'subject': f'Nhắc nhở {i}', 'body_html': '<p>Xin chào</p>',
+             'body_text': 'Xin chào'} for i in range(count)]
+
+
+def test_workers_send_queued_emails_over_reused_connections():
+    server = LocalSmtpServer(hang_up_after=4)
+    try:
+        with temp_database() as db:
+            transports = []
+
+            def factory():
+                transports.append(SmtpTransport('127.0.0.1', server.port, starttls=False))
+                return transports[-1]
+
+            outbox = EmailOutbox(db, factory, workers=2, batch_size=5, poll_interval=0.05).start()
+            outbox.enqueue_many(_emails(10))
+            deadline = time.time() + 10
+            while outbox.statistics().get('sent', 0) < 10 and time.time() < deadline:
+                time.sleep(0.05)
+            outbox.stop()
+
+            assert outbox.statistics() == {'sent': 10}
+            assert len(server.messages) == 10
+            assert 'Subject: =?utf-8?' in server.messages[0]
+            # One connection per worker, plus reconnects after the server hung up every 4 emails
+            assert sum(t.connections_opened for t in transports) == server.connections <= 2 + 10 // 4
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_failures_are_retried_with_backoff_then_given_up():
+    with temp_database() as db:
+        outbox = EmailOutbox(db, lambda: FlakyTransport('user1@bv.vn'), max_attempts=2, retry_delay=0.2)
+        outbox.enqueue_many(_emails(3))
+
+        assert outbox.drain() == 3
+        assert outbox.statistics() == {'sent': 2, 'pending': 1}
+        assert outbox.drain() == 0  # not due before the backoff delay
+
+        time.sleep(0.25)
+        assert outbox.drain() == 1
+        assert outbox.statistics() == {'sent': 2, 'failed': 1}
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING email outbox")
+    print("=" * 60)
+
+    test_workers_send_queued_emails_over_reused_connections()
+    print("✅ Test 1: Worker pool sends queued emails over reused SMTP connections")
+
+    test_failures_are_retried_with_backoff_then_given_up()
+    print("✅ Test 2: Failures are retried with backoff, then marked failed")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,134 @@
+"""
+Test script - Verify the Gantt charts: one trace per status/phase group,
+hover data aligned with the bars and large-task paging
+Run: python test_gantt_chart.py  (or: python -m pytest test_gantt_chart.py)
+"""
+
+import re
+
+import pandas as pd
+
+from gantt_chart import (
+    GANTT_VISIBLE_ROWS, HOVER_COLUMNS, HOVER_TEMPLATE,
+    create_dmaic_gantt, create_gantt_chart, gantt_page_count
+)
+
+STATUSES = ['Chưa bắt đầu', 'Đang thực hiện', 'Hoàn thành', None]
+PHASES = ['Control', 'Define', 'Measure', 'Analyze', 'Improve']
+
+
+def _tasks(count):
+    start = pd.Timestamp('2024-01-01')
+    return pd.DataFrame([{
+        'task_name': f'Task {i:03d}',
+        'phase': PHASES[i % len(PHASES)],
+        'start_date': (start + pd.Timedelta(days=i)).strftime('%Y-%m-%d'),
+        'end_date': (start + pd.Timedelta(days=i + 1 + i % 3)).strftime('%Y-%m-%d'),
+        'status': STATUSES[i % len(STATUSES)],
+        'progress': (i * 7) % 101,
+        'responsible': None if i % 5 == 0 else f'Người {i % 4}',
+    } for i in range(count)])
+
+
+def _bars(fig):
+    """(trace name, y label, customdata row) of every bar, in trace order"""
+    return [(trace.name, label, list(row))
+            for trace in fig.data for label, row in zip(trace.y, trace.customdata)]
+
+
+def test_one_trace_per_group():
+    tasks = _tasks(40)
+    fig = create_gantt_chart(tasks)
+    assert [trace.name for trace in fig.data] == ['Chưa bắt đầu', 'Đang thực hiện', 'Hoàn thành', 'N/A']
+    assert sum(len(trace.y) for trace in fig.data) == 40
+    for trace in fig.data:
+        assert trace.hovertemplate == HOVER_TEMPLATE and trace.orientation == 'h'
+
+    dmaic = create_dmaic_gantt(tasks)
+    assert [trace.name for trace in dmaic.data] == ['Define', 'Measure', 'Analyze', 'Improve', 'Control']
+
+    # Y axis keeps the task order (first task on top) and shows a window of rows
+    assert list(fig.layout.yaxis.categoryarray) == list(tasks['task_name'])[::-1]
+    assert list(fig.layout.yaxis.range) == [40 - GANTT_VISIBLE_ROWS - 0.5, 39.5]
+    assert create_gantt_chart(_tasks(5)).layout.yaxis.range is None
+    assert create_gantt_chart(tasks.iloc[0:0]) is None
+
+
+def test_hover_data_lines_up_with_the_bars():
+    # The template reads exactly the customdata columns, in order
+    indexes = [int(i) for i in re.findall(r'customdata\[(\d+)\]', HOVER_TEMPLATE)]
+    assert indexes == list(range(len(HOVER_COLUMNS)))
+
+    tasks = _tasks(12).set_index('task_name')
+    fig = create_gantt_chart(_tasks(12))
+    bars = _bars(fig)
+    assert len(bars) == 12
+    for status, label, row in bars:
+        task = tasks.loc[label]
+        assert row[0] == label
+        assert row[1] == task['phase']
+        assert (row[2], row[3]) == (task['start_date'], task['end_date'])
+        assert row[4] == status == (task['status'] or 'N/A')
+        assert row[5] == task['progress']
+        assert row[6] == (task['responsible'] or 'N/A')
+
+    # Bar text, start and length follow the same rows
+    for trace in fig.data:
+        for label, text, base, length in zip(trace.y, trace.text, trace.base, trace.x):
+            task = tasks.loc[label]
+            assert text == f"{task['progress']}%" and base == task['start_date']
+            days = (pd.Timestamp(task['end_date']) - pd.Timestamp(task['start_date'])).days
+            assert length == days * 24 * 3600 * 1000
+
+    dmaic = create_dmaic_gantt(_tasks(12))
+    for phase, label, row in _bars(dmaic):
+        assert label == f'{phase}: {row[0]}' and row[1] == phase
+
+
+def test_pages_slice_tasks_at_boundaries():
+    assert gantt_page_count(_tasks(0)) == 1
+    assert gantt_page_count(_tasks(100)) == 1
+    assert gantt_page_count(_tasks(101)) == 2
+    assert gantt_page_count(_tasks(250), page_size=50) == 5
+
+    tasks = _tasks(25)
+    assert gantt_page_count(tasks, page_size=10) == 3
+    pages = [create_gantt_chart(tasks, page=page, page_size=10) for page in range(3)]
+    labels = [list(fig.layout.yaxis.categoryarray)[::-1] for fig in pages]
+    assert labels == [list(tasks['task_name'][0:10]), list(tasks['task_name'][10:20]),
+                      list(tasks['task_name'][20:25])]
+    for fig, page_labels in zip(pages, labels):
+        assert sorted(label for _, label, _ in _bars(fig)) == sorted(page_labels)
+    assert [trace.name for trace in pages[2].data] == ['Chưa bắt đầu', 'Đang thực hiện', 'Hoàn thành', 'N/A']
+    # Groups absent from a page have no trace on it
+    single = create_gantt_chart(tasks.iloc[[0, 4, 8]], page=0, page_size=10)
+    assert [trace.name for trace in single.data] == ['Chưa bắt đầu']
+
+    # DMAIC pages slice after sorting by phase
+    dmaic_pages = [create_dmaic_gantt(tasks, page=page, page_size=10) for page in range(3)]
+    ordered = [label for fig in dmaic_pages for label in list(fig.layout.yaxis.categoryarray)[::-1]]
+    assert len(ordered) == 25 and len(set(ordered)) == 25
+    assert [label.split(':')[0] for label in ordered] == sorted(
+        (label.split(':')[0] for label in ordered), key=['Define', 'Measure', 'Analyze', 'Improve', 'Control'].index)
+    assert list(dmaic_pages[0].layout.yaxis.categoryarray)[::-1][:5] == [
+        f'Define: Task {i:03d}' for i in (1, 6, 11, 16, 21)]
+    assert create_gantt_chart(tasks, page=3, page_size=10).data == ()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING Gantt charts")
+    print("=" * 60)
+
+    test_one_trace_per_group()
+    print("✅ Test 1: One trace per status/phase group, not per task")
+
+    test_hover_data_lines_up_with_the_bars()
+    print("✅ Test 2: Hover data lines up with the bars")
+
+    test_pages_slice_tasks_at_boundaries()
+    print("✅ Test 3: Pages slice the tasks at page boundaries")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
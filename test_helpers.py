@@ -0,0 +1,50 @@
+"""
+Shared helpers of the test scripts: throwaway SQLite databases (and blob
+directories) removed when the block ends
+Usage: with temp_database() as db: ...
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from blob_store import LocalBlobStore
+from database import ProjectDatabase
+
+
+@contextmanager
+def temp_db_path():
+    """Path of a new empty SQLite file"""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        yield path
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@contextmanager
+def temp_blob_store():
+    """LocalBlobStore in a new directory"""
+    directory = tempfile.mkdtemp()
+    try:
+        yield LocalBlobStore(directory)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@contextmanager
+def temp_database(blobs=False, **kwargs):
+    """
+    ProjectDatabase on a new SQLite file
+    blobs: give it its own LocalBlobStore (db.blob_store.directory)
+    kwargs go to ProjectDatabase (pool_config, init_schema)
+    """
+    with temp_db_path() as path:
+        if not blobs:
+            yield ProjectDatabase(f"sqlite:///{path}", **kwargs)
+            return
+        with temp_blob_store() as store:
+            yield ProjectDatabase(f"sqlite:///{path}", blob_store=store, **kwargs)
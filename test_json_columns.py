@@ -0,0 +1,100 @@
+"""
+Test script - Verify JSON columns (parsed on read, text of older versions
+migrated) and the server-side queries on JSON arrays
+Run: python test_json_columns.py  (or: python -m pytest test_json_columns.py)
+"""
+
+import sqlite3
+
+from database import ProjectDatabase
+from test_helpers import temp_database, temp_db_path
+
+
+def test_json_columns_return_parsed_objects():
+    with temp_database() as db:
+        project_id = db.add_project({'project_code': 'P1', 'project_name': 'Dự án'})
+        db.save_dmaic_define(project_id, {'voc_data': [{'source': 'Khảo sát', 'need': 'Nhanh hơn'}]})
+        db.save_dmaic_analyze(project_id, {'five_whys_data': ['Tại sao 1', 'Tại sao 2']})
+
+        assert db.get_dmaic_define(project_id)['voc_data'] == [{'source': 'Khảo sát', 'need': 'Nhanh hơn'}]
+        bundle = db.get_project_bundle(project_id, sections=('dmaic',))
+        assert bundle.dmaic['analyze']['five_whys_data'] == ['Tại sao 1', 'Tại sao 2']
+
+        # Text that happens to look like JSON stays text
+        db.add_comment({'project_id': project_id, 'author': 'a', 'comment_text': 'x', 'mentions': '2024'})
+        db.add_comment({'project_id': project_id, 'author': 'a', 'comment_text': 'y', 'mentions': ['null', 'true', 7]})
+        document_id = db.add_document({'project_id': project_id, 'document_name': 'SOP', 'tags': 'null'})
+        assert sorted(map(repr, db.get_comments(project_id)['mentions'])) == ["'2024'", "['null', 'true', 7]"]
+        assert db.get_document(document_id)['tags'] == 'null'
+        assert db.get_documents(project_id)['tags'].tolist() == ['null']
+        items = db.find_json_array_items('project_comments', 'mentions', project_id=project_id)
+        assert list(items['item']) == ['null', 'true', 7]
+
+
+def test_json_array_items_are_filtered_in_the_database():
+    with temp_database() as db:
+        p1 = db.add_project({'project_code': 'P1', 'project_name': 'a'})
+        p2 = db.add_project({'project_code': 'P2', 'project_name': 'b'})
+        db.add_meeting({'project_id': p1, 'meeting_title': 'Họp 1', 'decisions': [
+            {'description': 'Đổi quy trình', 'decision_maker': 'BS Lan'},
+            {'description': 'Mua máy', 'decision_maker': 'BS Minh'},
+            {'description': 'Thêm ca trực'},
+            'ghi chú'
+        ]})
+        db.add_meeting({'project_id': p2, 'meeting_title': 'Họp 2',
+                        'decisions': [{'description': 'Đào tạo', 'decision_maker': 'BS Lan'}]})
+        db.add_meeting({'project_id': p2, 'meeting_title': 'Họp 3', 'decisions': {'decision_maker': 'BS Lan'}})
+
+        by_lan = db.find_json_array_items('meeting_minutes', 'decisions', match={'decision_maker': 'BS Lan'})
+        assert [item['description'] for item in by_lan['item']] == ['Đổi quy trình', 'Đào tạo']
+
+        not_minh = db.find_json_array_items('meeting_minutes', 'decisions', exclude={'decision_maker': 'BS Minh'},
+                                            project_id=p1, parent_columns=('id', 'meeting_title'))
+        assert [item if isinstance(item, str) else item['description'] for item in not_minh['item']] == \
+            ['Đổi quy trình', 'Thêm ca trực', 'ghi chú']
+        assert set(not_minh['meeting_title']) == {'Họp 1'}
+
+        try:
+            db.find_json_array_items('meeting_minutes', 'agenda')
+            assert False
+        except ValueError:
+            pass
+
+
+def test_migrates_json_text_of_older_versions():
+    with temp_db_path() as path:
+        legacy = sqlite3.connect(path)
+        legacy.execute(
+            "CREATE TABLE project_comments (id INTEGER PRIMARY KEY, project_id INTEGER NOT NULL, "
+            "author VARCHAR(200) NOT NULL, comment_text TEXT NOT NULL, parent_comment_id INTEGER, "
+            "mentions TEXT, created_at VARCHAR(30), updated_at VARCHAR(30))"
+        )
+        legacy.executemany(
+            "INSERT INTO project_comments (project_id, author, comment_text, mentions) VALUES (1, 'a', 'x', ?)",
+            [('["@lan"]',), ('@minh, @hoa',), ('',)]
+        )
+        legacy.commit()
+        legacy.close()
+
+        db = ProjectDatabase(f"sqlite:///{path}")
+        comments = db.get_comments(1)
+        assert sorted(map(repr, comments['mentions'])) == sorted(map(repr, [['@lan'], '@minh, @hoa', None]))
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING JSON columns")
+    print("=" * 60)
+
+    test_json_columns_return_parsed_objects()
+    print("✅ Test 1: JSON columns accept objects or text and return objects")
+
+    test_json_array_items_are_filtered_in_the_database()
+    print("✅ Test 2: JSON array elements are filtered inside the database")
+
+    test_migrates_json_text_of_older_versions()
+    print("✅ Test 3: JSON text of older versions is migrated")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
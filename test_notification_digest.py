@@ -0,0 +1,104 @@
+"""
+Test script - Verify notification digests: one email per recipient and window,
+duplicates suppressed by the idempotency key, column added to older databases
+Run: python test_notification_digest.py  (or: python -m pytest test_notification_digest.py)
+"""
+
+import sqlite3
+from datetime import date, timedelta
+
+from collaboration import check_deadlines_and_notify
+from database import ProjectDatabase
+from notification_digest import (build_digests, deadline_notifications, notification_key, record_notifications,
+                                 send_digests)
+from test_helpers import temp_database, temp_db_path
+
+
+class RecordingSender:
+    def __init__(self):
+        self.emails = []
+
+    def __call__(self, to_email, subject, body_html, body_text=None):
+        self.emails.append((to_email, subject, body_text))
+        return True
+
+
+def test_many_reminders_become_one_digest_and_reruns_send_nothing():
+    with temp_database() as db:
+        project_id = db.add_project({'project_code': 'P1', 'project_name': 'Giảm thời gian chờ'})
+        db.add_team_member({'project_id': project_id, 'name': 'Lan', 'email': 'lan@bv.vn'})
+        db.add_team_member({'project_id': project_id, 'name': 'Hoa', 'email': 'hoa@bv.vn'})
+        for i in range(40):
+            db.add_task({'project_id': project_id, 'task_name': f'Task {i}', 'responsible': 'Lan',
+                         'end_date': date.today() + timedelta(days=(7, 3, 1)[i % 3]), 'progress': 10})
+        db.add_task({'project_id': project_id, 'task_name': 'Đo', 'responsible': 'Hoa',
+                     'end_date': date.today() + timedelta(days=1)})
+
+        report = check_deadlines_and_notify(db, dry_run=True)
+        assert report['reminders'] == 41 and report['sent'] == 0
+
+        sender = RecordingSender()
+        rows = deadline_notifications(db.get_deadline_reminders())
+        assert record_notifications(db, rows) == {'recorded': 41, 'suppressed': 0}
+        assert send_digests(db, sender=sender) == {'notifications': 41, 'digests': 2, 'sent': 2}
+        assert sorted(email[0] for email in sender.emails) == ['hoa@bv.vn', 'lan@bv.vn']
+        lan = next(email for email in sender.emails if email[0] == 'lan@bv.vn')
+        assert lan[1].startswith('🔔 40 thông báo') and 'Task 39' in lan[2]
+
+        # Same job again (cron retry, second worker): nothing new recorded or sent
+        assert record_notifications(db, rows) == {'recorded': 0, 'suppressed': 41}
+        assert send_digests(db, sender=sender)['sent'] == 0
+        assert len(sender.emails) == 2
+
+
+def test_digests_are_split_per_recipient_and_window():
+    with temp_database() as db:
+        db.add_notifications([
+            {'recipient_email': 'lan@bv.vn', 'title': 'a', 'created_at': '2024-03-01T08:00:00'},
+            {'recipient_email': 'LAN@bv.vn ', 'title': 'b', 'created_at': '2024-03-01T20:00:00'},
+            {'recipient_email': 'lan@bv.vn', 'title': 'c', 'created_at': '2024-03-02T08:00:00'},
+            {'recipient_email': 'lan@bv.vn', 'title': 'd', 'is_sent': True},
+        ])
+        digests = build_digests(db.get_unsent_notifications())
+        assert [len(digest['notification_ids']) for digest in digests] == [2, 1]
+        assert len(build_digests(db.get_unsent_notifications(), window=timedelta(days=7))) == 1
+        assert notification_key('x', ' Lan@bv.vn', 1) == 'x:lan@bv.vn:1'
+        assert len(notification_key('x', 'lan@bv.vn', 'y' * 300)) <= 200
+
+
+def test_adds_idempotency_key_to_older_databases():
+    with temp_db_path() as path:
+        legacy = sqlite3.connect(path)
+        legacy.execute(
+            "CREATE TABLE notifications (id INTEGER PRIMARY KEY, project_id INTEGER, notification_type VARCHAR(50), "
+            "title VARCHAR(500), message TEXT, recipient_email VARCHAR(200), recipient_name VARCHAR(200), "
+            "is_read BOOLEAN, is_sent BOOLEAN, sent_at VARCHAR(30), created_at VARCHAR(30))"
+        )
+        legacy.execute("INSERT INTO notifications (title, recipient_email, is_sent) VALUES ('cũ', 'lan@bv.vn', 1)")
+        legacy.commit()
+        legacy.close()
+
+        db = ProjectDatabase(f"sqlite:///{path}")
+        rows = [{'recipient_email': 'lan@bv.vn', 'title': 'mới', 'idempotency_key': 'k1'}]
+        assert len(db.add_notifications(rows)) == 1
+        assert db.add_notifications(rows) == []
+        assert list(db.get_unsent_notifications()['title']) == ['mới']
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING notification digests")
+    print("=" * 60)
+
+    test_many_reminders_become_one_digest_and_reruns_send_nothing()
+    print("✅ Test 1: 40 reminders for one person -> one email; reruns send nothing")
+
+    test_digests_are_split_per_recipient_and_window()
+    print("✅ Test 2: Digests are grouped per recipient and window")
+
+    test_adds_idempotency_key_to_older_databases()
+    print("✅ Test 3: idempotency_key is added to older databases")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,102 @@
+"""
+Test script - Verify the connection pool settings: precedence of defaults,
+secrets, LSS_DB_* environment variables and arguments, one shared engine
+per pool configuration with the schema created once, and the pool statistics
+Run: python test_pool_config.py  (or: python -m pytest test_pool_config.py)
+"""
+
+import os
+import types
+
+import database
+from database import DEFAULT_POOL_CONFIG, ProjectDatabase, get_engine, get_pool_config, get_pool_statistics
+from test_helpers import temp_db_path
+
+
+def test_pool_config_precedence():
+    streamlit, saved_env = database.st, dict(os.environ)
+    try:
+        for env_var in database.POOL_ENV_VARS.values():
+            os.environ.pop(env_var, None)
+        database.st = types.SimpleNamespace(secrets={})
+        assert get_pool_config() == DEFAULT_POOL_CONFIG
+
+        database.st = types.SimpleNamespace(secrets={'connections': {'postgresql': {
+            'url': 'postgresql://x', 'pool_size': '8', 'max_overflow': 4, 'pool_pre_ping': 'false'}}})
+        assert get_pool_config() == dict(DEFAULT_POOL_CONFIG, pool_size=8, max_overflow=4, pool_pre_ping=False)
+
+        os.environ['LSS_DB_POOL_SIZE'] = '12'
+        os.environ['LSS_DB_POOL_PRE_PING'] = 'yes'
+        config = get_pool_config()
+        assert (config['pool_size'], config['max_overflow'], config['pool_pre_ping']) == (12, 4, True)
+
+        config = get_pool_config({'pool_size': 20, 'pool_timeout': None, 'unknown': 1})
+        assert (config['pool_size'], config['max_overflow'], config['pool_timeout']) == (20, 4, 30)
+        assert 'unknown' not in config
+    finally:
+        database.st = streamlit
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def test_engine_per_pool_config_and_pool_status():
+    with temp_db_path() as path:
+        url = f"sqlite:///{path}"
+        try:
+            small = ProjectDatabase(url, pool_config={'pool_recycle': 60})
+            other = ProjectDatabase(url, pool_config={'pool_recycle': 120})
+            assert small.engine is not other.engine
+            assert small.engine.pool._recycle == 60 and other.engine.pool._recycle == 120
+            assert ProjectDatabase(url, pool_config={'pool_recycle': 60}).engine is small.engine
+            assert get_engine(url) is small.engine  # no settings: the open engine is reused
+
+            with small.get_connection():
+                status = small.get_pool_status()
+                assert status['pool_class'] == 'QueuePool' and status['checkedout'] == 1
+            assert small.get_pool_status()['checkedout'] == 0
+            assert len([name for name in get_pool_statistics() if path in name]) == 2
+        finally:
+            database.dispose_engines()
+
+
+def test_instances_share_one_engine_and_schema_setup():
+    with temp_db_path() as path:
+        url = f"sqlite:///{path}"
+        migrate_schema, runs = database._migrate_schema, []
+        database._migrate_schema = lambda connection_string: (runs.append(connection_string),
+                                                              migrate_schema(connection_string))
+        try:
+            first = ProjectDatabase(url)
+            second = ProjectDatabase(url)
+            assert first.engine is second.engine
+            assert runs == [url]
+
+            project_id = first.add_project({'project_code': 'P1', 'project_name': 'Dự án'})
+            pooled = first.get_pool_status()['checkedin']
+            assert pooled >= 1
+            first.dispose()  # one instance going away keeps the shared pool open
+            assert second.get_pool_status()['checkedin'] == pooled
+            assert second.get_project(project_id)['project_code'] == 'P1'
+            assert ProjectDatabase(url).engine is first.engine and runs == [url]
+        finally:
+            database._migrate_schema = migrate_schema
+            database.dispose_engines()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING connection pool settings")
+    print("=" * 60)
+
+    test_pool_config_precedence()
+    print("✅ Test 1: Defaults < secrets < LSS_DB_* env < arguments")
+
+    test_engine_per_pool_config_and_pool_status()
+    print("✅ Test 2: One engine per pool configuration; pool status")
+
+    test_instances_share_one_engine_and_schema_setup()
+    print("✅ Test 3: Instances share one engine; schema created once")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,174 @@
+"""
+Test script - Verify the portfolio export: every table streamed into Excel
+sheets / CSV files, background job with progress and the cached artifact
+Run: python test_portfolio_export.py  (or: python -m pytest test_portfolio_export.py)
+"""
+
+import csv
+import io
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from contextlib import contextmanager
+
+import openpyxl
+from sqlalchemy import text
+
+import portfolio_export
+from portfolio_export import EXPORT_TABLES, PortfolioExporter, write_portfolio
+from test_helpers import temp_database
+
+
+@contextmanager
+def _database():
+    with temp_database(blobs=True) as db:
+        project_id = db.add_project({'project_code': 'P1', 'project_name': '=HYPERLINK("x")',
+                                     'start_date': '2024-03-01', 'budget': 1500.5})
+        for i in range(5):
+            db.add_task({'project_id': project_id, 'task_name': f'Task {i}', 'end_date': '2024-04-01'})
+        db.add_meeting({'project_id': project_id, 'meeting_title': 'Họp', 'attendees': ['Lan', 'Minh']})
+        db.add_document({'project_id': project_id, 'document_name': 'SOP', 'file_content': 'QkFTRTY0'})
+        yield db
+
+
+def _wait(job):
+    deadline = time.time() + 10
+    while job.status == 'running' and time.time() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+def test_excel_and_csv_zip_contain_every_table():
+    with _database() as db:
+        directory = tempfile.mkdtemp()
+        try:
+            xlsx = os.path.join(directory, 'p.xlsx')
+            assert write_portfolio(db, xlsx, 'xlsx') == 8
+
+            workbook = openpyxl.load_workbook(xlsx, read_only=True)
+            assert workbook.sheetnames == [label for _, label, _ in EXPORT_TABLES]
+            projects = list(workbook['Dự án'].iter_rows(values_only=True))
+            header, row = projects[0], dict(zip(projects[0], projects[1]))
+            assert row['project_name'] == '=HYPERLINK("x")'  # text, not a formula
+            assert row['start_date'].date().isoformat() == '2024-03-01' and row['budget'] == 1500.5
+            assert len(list(workbook['Kế hoạch'].iter_rows())) == 6
+            meeting = list(workbook['Biên bản họp'].iter_rows(values_only=True))
+            assert dict(zip(meeting[0], meeting[1]))['attendees'] == '["Lan", "Minh"]'
+            documents = list(workbook['Tài liệu'].iter_rows(values_only=True))
+            assert 'file_content' not in documents[0]
+            workbook.close()
+
+            archive = os.path.join(directory, 'p.zip')
+            write_portfolio(db, archive, 'zip')
+            with zipfile.ZipFile(archive) as zf:
+                assert len(zf.namelist()) == len(EXPORT_TABLES)
+                rows = list(csv.DictReader(io.TextIOWrapper(zf.open('project_tasks.csv'), encoding='utf-8-sig')))
+            assert [row['end_date'] for row in rows] == ['2024-04-01'] * 5
+        finally:
+            shutil.rmtree(directory)
+
+
+def test_large_tables_continue_on_a_new_sheet():
+    with _database() as db:
+        directory = tempfile.mkdtemp()
+        limit = portfolio_export.EXCEL_MAX_ROWS
+        portfolio_export.EXCEL_MAX_ROWS = 2
+        try:
+            xlsx = os.path.join(directory, 'p.xlsx')
+            write_portfolio(db, xlsx, 'xlsx')
+            workbook = openpyxl.load_workbook(xlsx, read_only=True)
+            parts = [name for name in workbook.sheetnames if name.startswith('Kế hoạch')]
+            assert parts == ['Kế hoạch', 'Kế hoạch (2)', 'Kế hoạch (3)']
+            assert [len(list(workbook[name].iter_rows())) for name in parts] == [3, 3, 2]
+            workbook.close()
+        finally:
+            portfolio_export.EXCEL_MAX_ROWS = limit
+            shutil.rmtree(directory)
+
+
+def test_background_job_is_reused_until_data_changes():
+    with _database() as db:
+        directory = tempfile.mkdtemp()
+        try:
+            exporter = PortfolioExporter(db, directory)
+            job = _wait(exporter.start('xlsx'))
+            assert job.status == 'done' and job.progress == 1.0
+            assert (job.rows_written, job.total_rows) == (8, 8)
+
+            assert exporter.start('xlsx') is job
+            # Another process (or a restart) finds the file on disk
+            cached = PortfolioExporter(db, directory).start('xlsx')
+            assert cached.cached and cached.path == job.path
+
+            db.add_team_member({'project_id': 1, 'name': 'Lan'})
+            fresh = _wait(exporter.start('xlsx'))
+            assert fresh is not job and fresh.rows_written == 9
+            assert os.listdir(directory) == [os.path.basename(fresh.path)]
+
+            # In-place edit of a table without updated_at
+            task_id = int(db.get_tasks(1)['id'].iloc[0])
+            db.update_task(task_id, {'progress': 90})
+            edited = _wait(exporter.start('xlsx'))
+            assert edited is not fresh and not edited.cached and edited.path != fresh.path
+            workbook = openpyxl.load_workbook(edited.path, read_only=True)
+            tasks = list(workbook['Kế hoạch'].iter_rows(values_only=True))
+            assert 90 in [dict(zip(tasks[0], row))['progress'] for row in tasks[1:]]
+            workbook.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+def test_change_counters_only_on_exported_tables():
+    with _database() as db:
+        with db.engine.begin() as conn:
+            # Trigger left by an older version on a queue table
+            conn.execute(text("CREATE TRIGGER notifications_version_insert AFTER INSERT ON notifications "
+                              "BEGIN UPDATE table_versions SET version = version + 1; END"))
+        db.init_database()
+
+        exported = {name for name, _, _ in EXPORT_TABLES}
+        with db.engine.connect() as conn:
+            triggers = set(conn.scalars(text(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%\\_version\\_%' ESCAPE '\\'")))
+            counters = set(conn.scalars(text("SELECT table_name FROM table_versions")))
+        assert triggers == {f'{name}_version_{event}' for name in exported for event in ('update', 'delete')}
+        assert counters == exported
+
+        tables = [name for name, _, _ in EXPORT_TABLES]
+        seen = {db.get_change_fingerprint(tables)}
+        db.create_notification({'project_id': 1, 'notification_type': 'mention', 'title': 'Nhắc tên',
+                                'recipient_email': 'lan@example.com'})
+        assert db.get_change_fingerprint(tables) in seen
+
+        db.add_task({'project_id': 1, 'task_name': 'Task 5'})
+        task_id = int(db.get_tasks(1)['id'].max())
+        for write in (lambda: db.update_task(task_id, {'progress': 10}),
+                      lambda: db.delete_task(task_id),
+                      lambda: db.add_task({'project_id': 1, 'task_name': 'Task 5'})):  # same id again
+            seen.add(db.get_change_fingerprint(tables))
+            write()
+            assert db.get_change_fingerprint(tables) not in seen
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING portfolio export")
+    print("=" * 60)
+
+    test_excel_and_csv_zip_contain_every_table()
+    print("✅ Test 1: Excel and CSV zip contain every table")
+
+    test_large_tables_continue_on_a_new_sheet()
+    print("✅ Test 2: Tables over the sheet limit continue on a new sheet")
+
+    test_background_job_is_reused_until_data_changes()
+    print("✅ Test 3: Finished exports are reused until the data changes")
+
+    test_change_counters_only_on_exported_tables()
+    print("✅ Test 4: Change counters only on exported tables; every write changes the fingerprint")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
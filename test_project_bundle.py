@@ -0,0 +1,177 @@
+"""
+Test script - Verify the project page bundle: every section loaded by one
+query, only the requested sections, matches() and the collaboration/DMAIC
+panels rendered from the bundle without further queries
+Run: python test_project_bundle.py  (or: python -m pytest test_project_bundle.py)
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from collaboration import CollaborationHub, render_collaboration_tab
+from comments_manager import CommentsManager
+from database import BUNDLE_SECTIONS, DMAIC_PHASE_TABLES
+from dmaic_tools import DMAICTools
+from meeting_manager import MeetingManager
+from test_helpers import temp_database
+
+
+VOC = [{'source': 'Khảo sát', 'customer': 'Bệnh nhân', 'date': '2024-01-15',
+        'category': 'Thời gian', 'feedback': 'Chờ quá lâu'}]
+
+
+@contextmanager
+def _database():
+    with temp_database() as db:
+        project_id = db.add_project({'project_code': 'P1', 'project_name': 'Giảm thời gian chờ',
+                                     'methodology': 'DMAIC', 'budget': 1500.0})
+        other_id = db.add_project({'project_code': 'P2', 'project_name': 'Dự án khác'})
+        for pid in (project_id, other_id):
+            db.add_team_member({'project_id': pid, 'name': f'Lan {pid}', 'role': 'Leader'})
+        db.add_stakeholder({'project_id': project_id, 'name': 'Khoa Dược'})
+        db.add_task({'project_id': project_id, 'task_name': 'Đo', 'start_date': '2024-02-01'})
+        db.add_task({'project_id': project_id, 'task_name': 'Xác định', 'start_date': '2024-01-01'})
+        db.add_signoff({'project_id': project_id, 'role': 'Sponsor', 'name': 'Minh'})
+        db.save_dmaic_define(project_id, {'voc_data': VOC})
+        db.add_comment({'project_id': project_id, 'author': 'Lan', 'comment_text': 'Đã họp', 'mentions': ['Minh']})
+        db.log_activity({'project_id': project_id, 'user': 'Lan', 'activity_type': 'updated',
+                         'activity_description': 'Sửa mục tiêu'})
+        meeting_id = db.add_meeting({'project_id': project_id, 'meeting_title': 'Họp khởi động',
+                                     'meeting_date': '2024-03-01', 'attendees': ['Lan', 'Minh']})
+        db.add_action_item({'project_id': project_id, 'meeting_id': meeting_id, 'item_description': 'Đo thời gian',
+                            'status': 'Open', 'due_date': '2024-03-05'})
+        db.add_action_item({'project_id': project_id, 'item_description': 'Báo cáo', 'status': 'Done'})
+        yield db, project_id, other_id
+
+
+@contextmanager
+def _statements(db):
+    """Collect the SQL statements sent to the database inside the block"""
+    statements = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', collect)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', collect)
+
+
+def _column(frame, name):
+    return [None if value != value else value for value in frame[name].tolist()]
+
+
+def test_bundle_loads_every_section_in_one_query():
+    with _database() as (db, project_id, _):
+        with _statements(db) as statements:
+            bundle = db.get_project_bundle(project_id)
+        assert len(statements) == 1
+        assert bundle.sections == tuple(BUNDLE_SECTIONS)
+        assert bundle.project['project_code'] == 'P1' and bundle.project['budget'] == 1500.0
+        assert bundle.methodology == 'DMAIC'
+
+        # Same rows as the per-section queries
+        for section, load in (('team_members', db.get_team_members), ('stakeholders', db.get_stakeholders),
+                              ('tasks', db.get_tasks), ('signoffs', db.get_signoffs),
+                              ('comments', db.get_comments), ('activities', db.get_activities),
+                              ('meetings', db.get_meetings)):
+            expected = load(project_id)
+            frame = getattr(bundle, section)
+            assert _column(frame, 'id') == _column(expected, 'id'), section
+            assert set(expected.columns) <= set(frame.columns), section
+        assert _column(bundle.team_members, 'name') == [f'Lan {project_id}']
+        assert _column(bundle.tasks, 'task_name') == ['Xác định', 'Đo']
+        assert str(bundle.tasks['start_date'].iloc[0].date()) == '2024-01-01'
+        assert bundle.comments['mentions'].iloc[0] == ['Minh']
+        assert bundle.meetings['attendees'].iloc[0] == ['Lan', 'Minh']
+
+        items = db.get_action_items(project_id=project_id)
+        assert _column(bundle.action_items, 'id') == _column(items, 'id')
+        assert _column(bundle.action_items, 'meeting_title') == ['Họp khởi động', None]
+        assert str(bundle.action_items['meeting_date'].iloc[0].date()) == '2024-03-01'
+
+        assert set(bundle.dmaic) == set(DMAIC_PHASE_TABLES)
+        assert bundle.dmaic['define']['voc_data'] == VOC
+        assert bundle.dmaic['measure'] is None
+
+
+def test_only_requested_sections_and_matches():
+    with _database() as (db, project_id, other_id):
+        bundle = db.get_project_bundle(project_id, sections=('tasks', 'dmaic'))
+        assert bundle.sections == ('tasks', 'dmaic')
+        assert len(bundle.tasks) == 2 and bundle.dmaic['define'] is not None
+        assert bundle.team_members.empty and bundle.comments.empty and bundle.action_items.empty
+
+        assert bundle.matches(project_id) and bundle.matches(project_id, 'tasks')
+        assert not bundle.matches(project_id, 'comments')
+        assert not bundle.matches(other_id, 'tasks')
+
+        bare = db.get_project_bundle(project_id, sections=())
+        assert bare.project['id'] == project_id and bare.sections == ()
+        assert _column(db.get_project_bundle(other_id, sections=('team_members',)).team_members,
+                       'name') == [f'Lan {other_id}']
+
+        missing = db.get_project_bundle(999)
+        assert missing.project is None and missing.sections == ()
+        assert not missing.matches(999) and not missing.matches(999, 'tasks')
+
+
+def test_panels_render_from_the_bundle():
+    with _database() as (db, project_id, other_id):
+        # Collaboration panel: one query for the bundle, none while rendering
+        sections = ('comments', 'activities', 'meetings', 'action_items', 'team_members')
+        with _statements(db) as statements:
+            bundle = db.get_project_bundle(project_id, sections=sections)
+            render_collaboration_tab(project_id=project_id, project=bundle.project, database=db,
+                                     current_user='Lan', bundle=bundle)
+        assert len(statements) == 1
+
+        hub = CollaborationHub(db, bundle)
+        with _statements(db) as statements:
+            comments = CommentsManager(db, bundle=bundle).get_comments(project_id)
+            meetings = MeetingManager(db, bundle=bundle)
+            items = meetings.get_action_items(project_id)
+            open_items = meetings.get_action_items(project_id, status='Open')
+            meeting_list = hub.meeting_manager.get_meetings(project_id)
+        assert statements == []
+        assert [comment['comment_text'] for comment in comments] == ['Đã họp']
+        assert [item['description'] for item in items] == ['Đo thời gian', 'Báo cáo']
+        assert [item['description'] for item in open_items] == ['Đo thời gian']
+        assert [meeting['meeting_title'] for meeting in meeting_list] == ['Họp khởi động']
+
+        # DMAIC panel
+        dmaic_bundle = db.get_project_bundle(project_id, sections=('dmaic',))
+        with _statements(db) as statements:
+            tools = DMAICTools(db, dmaic_bundle)
+            tools.render_dmaic_tracker(project_id, dmaic_bundle.project)
+            voc = tools._load_phase('define', project_id)['voc_data']
+        assert statements == []
+        assert voc == VOC
+
+        # Another project, or a section not in the bundle, falls back to the database
+        with _statements(db) as statements:
+            assert MeetingManager(db, bundle=dmaic_bundle).get_action_items(project_id)
+            assert MeetingManager(db, bundle=bundle).get_action_items(other_id) == []
+        assert len(statements) == 2
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING project page bundle")
+    print("=" * 60)
+
+    test_bundle_loads_every_section_in_one_query()
+    print("✅ Test 1: Project and every section loaded by one query")
+
+    test_only_requested_sections_and_matches()
+    print("✅ Test 2: Only the requested sections; matches()")
+
+    test_panels_render_from_the_bundle()
+    print("✅ Test 3: Collaboration and DMAIC panels render without further queries")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
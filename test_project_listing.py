@@ -0,0 +1,76 @@
+"""
+Test script - Verify list_projects() keyset pagination, filters and projection
+Run: python test_project_listing.py  (or: python -m pytest test_project_listing.py)
+"""
+
+from contextlib import contextmanager
+
+from test_helpers import temp_database
+
+STATUSES = ['Đang thực hiện', 'Hoàn thành', None]
+START_DATES = ['2024-01-01', '2024-02-01', None]
+
+
+@contextmanager
+def _database_with_projects(count):
+    with temp_database() as db:
+        for i in range(count):
+            db.add_project({
+                'project_code': f'P{i:04d}', 'project_name': f'Dự án {i}',
+                'status': STATUSES[i % 3], 'start_date': START_DATES[i % 4 % 3],
+                'description': 'x' * 1000
+            })
+        yield db
+
+
+def _all_pages(db, **kwargs):
+    codes, cursor, pages = [], None, 0
+    while True:
+        page, cursor = db.list_projects(columns=['project_code'], cursor=cursor, **kwargs)
+        codes += list(page['project_code'])
+        pages += 1
+        if cursor is None:
+            return codes, pages
+
+
+def test_pages_cover_every_project_once():
+    with _database_with_projects(95) as db:
+        for sort in ('-created_at', 'start_date', '-start_date', 'status', 'project_name'):
+            codes, pages = _all_pages(db, sort=sort, limit=20)
+            assert sorted(codes) == [f'P{i:04d}' for i in range(95)], sort
+            assert pages == 5
+
+
+def test_filters_and_projection():
+    with _database_with_projects(30) as db:
+        filters = {'status': ['Đang thực hiện', 'Hoàn thành'], 'search': 'P001'}
+        expected = [f'P{i:04d}' for i in range(19, 9, -1) if STATUSES[i % 3] is not None]
+        codes, _ = _all_pages(db, filters=filters, limit=3)
+        assert codes == expected
+        assert db.count_projects(filters) == len(expected)
+
+        page, cursor = db.list_projects(limit=5)
+        assert 'description' not in page.columns and cursor is not None
+
+        for bad in ({'columns': ['description']}, {'sort': 'budget'}, {'filters': {'owner': 'x'}}):
+            try:
+                db.list_projects(**bad)
+                assert False, bad
+            except ValueError:
+                pass
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING project listing")
+    print("=" * 60)
+
+    test_pages_cover_every_project_once()
+    print("✅ Test 1: Keyset pages cover every project exactly once")
+
+    test_filters_and_projection()
+    print("✅ Test 2: Filters, search and column projection")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
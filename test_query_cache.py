@@ -0,0 +1,140 @@
+"""
+Test script - Verify the read-through query cache and its invalidation
+Run: python test_query_cache.py  (or: python -m pytest test_query_cache.py)
+"""
+
+from contextlib import contextmanager
+
+from query_cache import CachedProjectDatabase, QueryCache
+from test_helpers import temp_database
+
+
+@contextmanager
+def _cached_db():
+    with temp_database() as db:
+        yield CachedProjectDatabase(db)
+
+
+def _add_project(db, code):
+    return db.add_project({
+        'project_code': code, 'project_name': f"Dự án {code}", 'department': 'Khoa A',
+        'category': 'Khác', 'status': 'Đang thực hiện'
+    })
+
+
+def test_reads_are_cached_and_copied():
+    with _cached_db() as db:
+        project_id = _add_project(db, 'P1')
+        first = db.get_all_projects()
+        first['extra'] = 1  # Callers may mutate their copy
+        second = db.get_all_projects()
+        assert 'extra' not in second.columns
+        stats = db.cache_stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        assert db.get_project_bundle(project_id, sections=()).project['project_code'] == 'P1'
+
+
+def test_writes_invalidate_affected_keys():
+    with _cached_db() as db:
+        p1 = _add_project(db, 'P1')
+        p2 = _add_project(db, 'P2')
+        members = ('team_members',)
+        assert db.get_project_bundle(p1, sections=members).team_members.empty
+        db.get_project_bundle(p2, sections=members)
+
+        db.add_team_member({'project_id': p1, 'name': 'An', 'role': 'Thành viên'})
+        assert len(db.get_project_bundle(p1, sections=members).team_members) == 1
+
+        # The other project's entry survives the write
+        hits = db.cache_stats()['hits']
+        db.get_project_bundle(p2, sections=members)
+        assert db.cache_stats()['hits'] == hits + 1
+
+        bundle = db.get_project_bundle(p1, sections=('tasks',))
+        assert bundle.tasks.empty
+        db.add_task({'project_id': p1, 'task_name': 'Đo lường', 'phase': 'Measure'})
+        assert len(db.get_project_bundle(p1, sections=('tasks',)).tasks) == 1
+
+        db.update_project(p1, {'status': 'Hoàn thành'})
+        assert db.get_project_bundle(p1, sections=()).project['status'] == 'Hoàn thành'
+        assert 'Hoàn thành' in db.get_all_projects()['status'].values
+
+
+class _WriteDuringRead:
+    """ProjectDatabase whose next read lets a write commit before it returns"""
+
+    def __init__(self, database):
+        self._db = database
+        self.during_read = None
+
+    def __getattr__(self, name):
+        attr = getattr(self._db, name)
+        if not name.startswith('get_'):
+            return attr
+
+        def read(*args, **kwargs):
+            value = attr(*args, **kwargs)
+            hook, self.during_read = self.during_read, None
+            if hook:
+                hook()
+            return value
+
+        return read
+
+
+def test_read_overlapping_a_write_is_not_cached():
+    with temp_database() as plain:
+        source = _WriteDuringRead(plain)
+        db = CachedProjectDatabase(source)
+        project_id = _add_project(db, 'P1')
+
+        source.during_read = lambda: db.update_project(project_id, {'project_name': 'Mới'})
+        assert db.get_project(project_id)['project_name'] == 'Dự án P1'  # read before the write
+        assert db.get_project(project_id)['project_name'] == 'Mới'
+
+        source.during_read = lambda: db.add_team_member({'project_id': project_id, 'name': 'An'})
+        assert db.get_project_bundle(project_id, sections=('team_members',)).team_members.empty
+        assert len(db.get_project_bundle(project_id, sections=('team_members',)).team_members) == 1
+        assert db.cache_stats()['stale_puts'] == 2
+
+        # Reads after the write are cached again
+        db.get_project(project_id)
+        hits = db.cache_stats()['hits']
+        db.get_project(project_id)
+        assert db.cache_stats()['hits'] == hits + 1
+
+
+def test_lru_and_ttl():
+    cache = QueryCache(max_entries=2, ttls={'projects': 0})
+    cache.put('a', [('team_members', 1)], 'A')
+    cache.put('b', [('team_members', 2)], 'B')
+    cache.get('a', ('team_members',))
+    cache.put('c', [('team_members', 3)], 'C')
+    assert cache.get('b', ('team_members',)) == (False, None)
+    assert cache.get('a', ('team_members',)) == (True, 'A')
+    assert cache.stats()['evictions'] == 1
+
+    cache.put('d', [('projects', None)], 'D')
+    assert cache.get('d', ('projects',)) == (False, None)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING query cache")
+    print("=" * 60)
+
+    test_reads_are_cached_and_copied()
+    print("✅ Test 1: Reads are cached and callers get copies")
+
+    test_writes_invalidate_affected_keys()
+    print("✅ Test 2: Writes invalidate the affected (table, project_id) keys")
+
+    test_read_overlapping_a_write_is_not_cached()
+    print("✅ Test 3: A read overlapping a write is not cached")
+
+    test_lru_and_ttl()
+    print("✅ Test 4: LRU eviction and TTL expiry")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
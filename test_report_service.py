@@ -0,0 +1,77 @@
+"""
+Test script - Verify the PDF report service: reports rendered in memory by the
+worker pool, cached by the content hash of the project data
+Run: python test_report_service.py  (or: python -m pytest test_report_service.py)
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+import export_pdf
+from report_service import REPORT_SECTIONS, ReportService, report_key
+from test_helpers import temp_database
+
+
+@contextmanager
+def _database():
+    with temp_database() as db:
+        project_id = db.add_project({'project_code': 'P1', 'project_name': 'Giảm thời gian chờ khám',
+                                     'start_date': '2024-03-01'})
+        db.add_team_member({'project_id': project_id, 'name': 'Nguyễn Lan', 'role': 'Trưởng nhóm'})
+        db.add_task({'project_id': project_id, 'phase': 'Define', 'task_name': 'SIPOC', 'end_date': '2024-03-10'})
+        yield db, project_id
+
+
+def test_reports_are_rendered_in_memory_and_cached_by_content():
+    with _database() as (db, project_id):
+        service = ReportService(db, workers=2)
+        job = service.submit(project_id)
+        assert job.wait(30) and job.status == 'done', job.error
+        assert job.pdf.startswith(b'%PDF') and job.file_name == 'Project_P1.pdf'
+        assert export_pdf._font_available is not None  # registered once for the process
+
+        again = service.submit(project_id)
+        assert again.cached and again.pdf is job.pdf and service.job(project_id) is again
+
+        db.add_task({'project_id': project_id, 'phase': 'Measure', 'task_name': 'Đo', 'end_date': '2024-04-01'})
+        changed = service.submit(project_id)
+        assert changed.wait(30) and not changed.cached and changed.pdf != job.pdf
+        assert service.stats == {'rendered': 2, 'cache_hits': 1, 'failed': 0}
+
+
+def test_same_content_is_rendered_once():
+    with _database() as (db, project_id):
+        bundle = db.get_project_bundle(project_id, sections=REPORT_SECTIONS)
+        assert report_key(bundle) == report_key(db.get_project_bundle(project_id, sections=REPORT_SECTIONS))
+
+        service = ReportService(db, workers=1)
+        jobs = [service.submit(project_id, bundle) for _ in range(3)]
+        assert all(job is jobs[0] or job.cached for job in jobs)
+        assert jobs[0].wait(30) and service.stats['rendered'] == 1
+
+        # The file API still writes to disk
+        fd, pdf_path = tempfile.mkstemp(suffix='.pdf')
+        os.close(fd)
+        try:
+            assert export_pdf.create_project_pdf(bundle.project, bundle.team_members, bundle.stakeholders,
+                                                 bundle.tasks, bundle.signoffs, pdf_path) == pdf_path
+            assert os.path.getsize(pdf_path) > 0
+        finally:
+            os.remove(pdf_path)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING report service")
+    print("=" * 60)
+
+    test_reports_are_rendered_in_memory_and_cached_by_content()
+    print("✅ Test 1: Reports are rendered in memory and cached by content")
+
+    test_same_content_is_rendered_once()
+    print("✅ Test 2: Identical requests share one rendering")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
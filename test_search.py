@@ -0,0 +1,155 @@
+"""
+Test script - Verify the full-text search: Vietnamese text found without
+diacritics, ranked results, index kept current by every write, filters and
+the index built for an existing database
+Run: python test_search.py  (or: python -m pytest test_search.py)
+"""
+
+
+from sqlalchemy import event, text
+
+import database
+from database import SEARCH_RESULT_COLUMNS, Project, _bulk_rows, _search_backend, bulk_upsert_rows
+from search_index import fold_text, query_terms, snippet
+from test_helpers import temp_database
+
+
+def _found(db, query, **kwargs):
+    return list(zip(*[db.search(query, **kwargs)[c] for c in ('entity_type', 'entity_id')]))
+
+
+def test_folding_and_ranking():
+    assert fold_text('Giảm THỜI GIAN chờ đợi') == 'giam thoi gian cho doi'
+    assert query_terms('  Đặt lịch, khám-bệnh! ') == ['dat', 'lich', 'kham', 'benh']
+    assert snippet('Rút ngắn thời gian chờ', ['thoi']) == 'Rút ngắn **thời** gian chờ'
+
+    with temp_database(blobs=True) as db:
+        assert _search_backend(db.engine) == 'fts5'
+        in_body = db.add_project({'project_code': 'P1', 'project_name': 'Cải tiến khoa Dược',
+                                  'description': 'Giảm thời gian chờ lấy thuốc'})
+        in_title = db.add_project({'project_code': 'P2', 'project_name': 'Giảm thời gian chờ khám'})
+        db.add_project({'project_code': 'P3', 'project_name': 'Giảm tồn kho'})
+
+        results = db.search('giam thoi gian cho')
+        assert list(results.columns) == SEARCH_RESULT_COLUMNS
+        assert list(results['entity_id']) == [in_title, in_body]
+        assert results.loc[1, 'project_code'] == 'P1'
+        assert '**thời**' in results.loc[1, 'snippet']
+        # Word prefixes match, every word is required
+        assert _found(db, 'Giảm th') == [('project', in_title), ('project', in_body)]
+        assert db.search('!!').empty and db.search('ton kho duoc').empty
+
+
+def test_index_follows_writes_and_filters():
+    with temp_database(blobs=True) as db:
+        p1 = db.add_project({'project_code': 'P1', 'project_name': 'Phòng khám'})
+        p2 = db.add_project({'project_code': 'P2', 'project_name': 'Xét nghiệm'})
+        comment = db.add_comment({'project_id': p1, 'author': 'Lan', 'comment_text': 'Cần thêm quầy tiếp đón'})
+        meeting = db.add_meeting({'project_id': p2, 'meeting_title': 'Họp tiếp đón',
+                                  'attendees': ['Minh'], 'decisions': 'Mở thêm quầy'})
+        document = db.add_document({'project_id': p2, 'document_name': 'SOP', 'tags': ['tiếp đón'],
+                                    'description': 'Quy trình quầy'}, content=b'x')
+        db.log_activity({'project_id': p1, 'user': 'Lan', 'activity_type': 'updated',
+                         'activity_description': 'Sửa quầy tiếp đón'})
+
+        assert len(db.search('quay')) == 4
+        assert _found(db, 'quay', project_id=p1, entity_types=['comment']) == [('comment', comment)]
+        assert {entity for entity, _ in _found(db, 'tiep don', project_id=p2)} == {'meeting', 'document'}
+        try:
+            db.search('quay', entity_types=['task'])
+            assert False, "unknown entity type accepted"
+        except ValueError:
+            pass
+
+        db.update_project(p2, {'project_name': 'Xét nghiệm nhanh'})
+        assert _found(db, 'nhanh') == [('project', p2)]
+        db.update_meeting(meeting, {'meeting_title': 'Họp giao ban'})
+        assert _found(db, 'giao ban') == [('meeting', meeting)]
+        db.delete_meeting(meeting)
+        db.delete_document(document)
+        assert _found(db, 'quay', project_id=p2) == []
+
+        db.bulk_add_projects([{'project_code': 'P3', 'project_name': 'Nhà thuốc'}])
+        assert [code for code in db.search('nha thuoc')['project_code']] == ['P3']
+        db.delete_project(p1)
+        assert _found(db, 'quay') == []
+
+
+def test_backend_lookup_is_cached():
+    with temp_database(blobs=True) as db:
+        db.add_project({'project_code': 'P1', 'project_name': 'Phòng khám'})
+        db.search('phong')
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        assert len(db.search('phong kham')) == 1
+        assert 'search_fts' in statements[0]
+        assert not any('sqlite_master' in statement for statement in statements)
+
+
+def test_bulk_projects_indexed_in_the_same_transaction():
+    with temp_database(blobs=True) as db:
+        db.add_project({'project_code': 'P1', 'project_name': 'Phòng khám'})
+        table = Project.__table__
+        with db.engine.begin() as conn:
+            rows = _bulk_rows(table, [{'project_code': 'P1', 'project_name': 'Phòng khám mới'},
+                                      {'project_code': 'P2', 'project_name': 'Nhà thuốc'},
+                                      {'project_code': 'P2', 'project_name': 'Nhà thuốc nhi'}])
+            report = bulk_upsert_rows(conn, table, rows, return_ids=True)
+        assert report == {'inserted': 1, 'updated': 1, 'skipped': 1, 'ids': [1, 2]}
+        assert _found(db, 'nha thuoc') == [] and _found(db, 'moi') == []  # only bulk_add_projects indexes
+
+        report = db.bulk_add_projects([{'project_code': 'P1', 'project_name': 'Khoa Nội'},
+                                       {'project_code': 'P3', 'project_name': 'Khoa Ngoại'}])
+        assert report == {'inserted': 1, 'updated': 1, 'skipped': 0}
+        assert sorted(_found(db, 'khoa')) == [('project', 1), ('project', 3)]
+
+        # A failed re-index rolls the upsert back too
+        index_search = database._index_search
+        database._index_search = lambda *args: (_ for _ in ()).throw(RuntimeError('index down'))
+        try:
+            db.bulk_add_projects([{'project_code': 'P4', 'project_name': 'Xét nghiệm'}])
+            assert False, "index failure ignored"
+        except RuntimeError:
+            pass
+        finally:
+            database._index_search = index_search
+        assert db.get_all_projects()['project_code'].tolist().count('P4') == 0
+
+
+def test_existing_database_is_indexed_on_startup():
+    with temp_database(blobs=True) as db:
+        project_id = db.add_project({'project_code': 'P1', 'project_name': 'Phòng khám'})
+        with db.engine.begin() as conn:
+            conn.execute(text("DELETE FROM search_documents"))
+            conn.execute(text("INSERT INTO project_comments (project_id, author, comment_text) "
+                              "VALUES (:id, 'Lan', 'Đã họp với khoa Nội')"), {'id': project_id})
+        assert db.search('khoa noi').empty
+
+        db.init_database()  # schema migration run at startup
+        assert _found(db, 'khoa noi') == [('comment', 1)]
+        assert _found(db, 'phong kham') == [('project', project_id)]
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING full-text search")
+    print("=" * 60)
+
+    test_folding_and_ranking()
+    print("✅ Test 1: Search ignores diacritics and ranks title matches first")
+
+    test_index_follows_writes_and_filters()
+    print("✅ Test 2: Index follows every write; project and type filters")
+
+    test_backend_lookup_is_cached()
+    print("✅ Test 3: Full-text backend looked up once per database")
+
+    test_bulk_projects_indexed_in_the_same_transaction()
+    print("✅ Test 4: Bulk project writes are indexed in the same transaction")
+
+    test_existing_database_is_indexed_on_startup()
+    print("✅ Test 5: Existing database is indexed on startup")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,83 @@
+"""
+Test script - Verify get_statistics() and the dashboard rollups against
+per-facet reference queries
+Run: python test_statistics.py  (or: python -m pytest test_statistics.py)
+"""
+
+
+import pandas as pd
+
+from test_helpers import temp_database
+
+
+PROJECTS = [
+    {'project_code': 'P1', 'status': 'Đang thực hiện', 'category': 'A', 'department': 'Khoa 1', 'budget': 10.0},
+    {'project_code': 'P2', 'status': 'Đang thực hiện', 'category': 'B', 'budget': 5.0, 'actual_cost': 2.0},
+    {'project_code': 'P3', 'status': 'Hoàn thành', 'category': 'A', 'department': 'Khoa 1'},
+]
+
+
+def test_statistics_match_reference_queries():
+    with temp_database() as db:
+        empty = db.get_statistics()
+        assert empty['total_projects'] == 0
+        assert empty['budget_stats'].iloc[0]['total_budget'] is None
+
+        for project in PROJECTS:
+            db.add_project(dict(project, project_name=project['project_code']))
+        stats = db.get_statistics()
+        assert stats['total_projects'] == len(PROJECTS)
+
+        conn = db.get_connection()
+        try:
+            for facet in ('status', 'category', 'department'):
+                expected = pd.read_sql_query(
+                    f"SELECT {facet}, COUNT(*) as count FROM projects GROUP BY {facet}", conn
+                )
+                actual = stats[f'by_{facet}']
+                assert list(actual.columns) == [facet, 'count']
+                assert (sorted(zip(actual[facet].fillna(''), actual['count'])) ==
+                        sorted(zip(expected[facet].fillna(''), expected['count'])))
+        finally:
+            conn.close()
+
+        budget = stats['budget_stats'].iloc[0]
+        assert budget['total_budget'] == 15.0 and budget['total_cost'] == 2.0
+
+
+def test_rollups_follow_project_writes():
+    with temp_database() as db:
+        ids = [db.add_project(dict(project, project_name=project['project_code'], start_date='2024-03-15'))
+               for project in PROJECTS]
+        db.update_project(ids[0], {'status': 'Hoàn thành', 'budget': 4.0, 'start_date': '2024-05-01'})
+        db.delete_project(ids[1])
+
+        stats = db.get_rollup_statistics()
+        reference = db.get_statistics()
+        assert stats['total_projects'] == reference['total_projects'] == 2
+        assert dict(zip(stats['by_status']['status'], stats['by_status']['count'])) == {'Hoàn thành': 2}
+        assert stats['budget_stats'].iloc[0]['total_budget'] == 4.0
+        assert stats['by_month'].to_dict('records') == [
+            {'start_month': '2024-03', 'count': 1}, {'start_month': '2024-05', 'count': 1}
+        ]
+
+        # A rebuild from scratch gives the same groups
+        assert db.rebuild_project_rollups() == 2
+        rebuilt = db.get_rollup_statistics()
+        assert rebuilt['by_month'].equals(stats['by_month'])
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TESTING statistics")
+    print("=" * 60)
+
+    test_statistics_match_reference_queries()
+    print("✅ Test 1: Single-query statistics match the per-facet queries")
+
+    test_rollups_follow_project_writes()
+    print("✅ Test 2: Rollups follow add/update/delete and match a rebuild")
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,89 @@
+"""
+Version Store Module
+Chia nội dung phiên bản tài liệu thành các đoạn theo nội dung (content-defined chunking)
+Mỗi đoạn được lưu một lần trong blob store theo mã SHA-256: phiên bản mới của một file
+chỉ tốn dung lượng cho những đoạn thay đổi, và mọi phiên bản được dựng lại trực tiếp
+từ danh sách đoạn của nó (không phải áp chuỗi delta)
+"""
+
+import hashlib
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from blob_store import iter_chunks
+
+# Chunk sizes: a cut is made where the rolling hash matches, never before MIN or after MAX
+CHUNK_MIN_SIZE = 16 * 1024
+CHUNK_AVG_BITS = 16  # average chunk ~ 2^16 = 64 KB
+CHUNK_MAX_SIZE = 256 * 1024
+# Bytes seen by the rolling hash at each position
+CHUNK_WINDOW = 32
+READ_SIZE = 1024 * 1024
+
+# Gear table: one fixed pseudo-random 64-bit value per byte value (derived from SHA-256 so
+# it never changes between versions: it decides where the cuts fall)
+_GEAR = np.array([int.from_bytes(hashlib.sha256(bytes([value])).digest()[:8], 'little')
+                  for value in range(256)], dtype=np.uint64)
+_HASH_SHIFT = np.uint64(64 - CHUNK_AVG_BITS)
+
+
+def _candidate_cuts(data: bytes) -> np.ndarray:
+    """
+    End offsets where the gear hash of the preceding CHUNK_WINDOW bytes has its
+    top CHUNK_AVG_BITS bits at zero (vectorized: one pass per window byte)
+    """
+    values = _GEAR[np.frombuffer(data, dtype=np.uint8)]
+    hashes = values.copy()
+    for shift in range(1, CHUNK_WINDOW):
+        hashes[shift:] += values[:-shift] << np.uint64(shift)
+    return np.flatnonzero((hashes >> _HASH_SHIFT) == 0) + 1
+
+
+def _split(data: bytes, final: bool):
+    """Cut `data` (which starts at a chunk boundary) into chunks; returns (chunks, rest)"""
+    candidates = _candidate_cuts(data)
+    chunks, start = [], 0
+    while True:
+        index = np.searchsorted(candidates, start + CHUNK_MIN_SIZE)
+        if index < len(candidates) and candidates[index] <= start + CHUNK_MAX_SIZE:
+            end = int(candidates[index])
+        elif len(data) - start >= CHUNK_MAX_SIZE:
+            end = start + CHUNK_MAX_SIZE
+        else:
+            break
+        chunks.append(data[start:end])
+        start = end
+    rest = data[start:]
+    if final and rest:
+        chunks.append(rest)
+        rest = b''
+    return chunks, rest
+
+
+def content_chunks(source) -> Iterator[bytes]:
+    """
+    Content-defined chunks of bytes / a file object / an iterable of chunks
+    An edit only changes the chunks around it: the cuts after it fall in the same places
+    """
+    pending = b''
+    for block in iter_chunks(source, READ_SIZE):
+        chunks, pending = _split(pending + block, final=False)
+        yield from chunks
+    chunks, _ = _split(pending, final=True)
+    yield from chunks
+
+
+def store_chunks(store, source) -> Iterator[Tuple[str, int, bool]]:
+    """
+    Put the chunks of `source` in the blob store
+
+    Yields:
+        (sha256, size, True if the chunk was new) for each chunk, in order
+    """
+    for chunk in content_chunks(source):
+        key = hashlib.sha256(chunk).hexdigest()
+        new = not store.touch(key)  # a reused chunk is marked as just used
+        if new:
+            store.put(chunk)
+        yield key, len(chunk), new